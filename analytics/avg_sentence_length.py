@@ -20,12 +20,9 @@ ZASTOSOWANIE:
 - Analiza stylu pisania generatora
 """
 
-from common import (
-    get_tokens,
-    get_sentences,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+from document import get_document
+from registry import Metric
+from runner import run_metrics
 
 
 def calculate_avg_sentence_length(text: str) -> float:
@@ -38,8 +35,9 @@ def calculate_avg_sentence_length(text: str) -> float:
     Returns:
         Średnia liczba słów na zdanie (zaokrąglona do 2 miejsc)
     """
-    tokens = get_tokens(text)
-    sentences = get_sentences(text)
+    doc = get_document(text)
+    tokens = doc.tokens
+    sentences = doc.sentences
     
     if len(sentences) == 0:
         return 0.0
@@ -50,24 +48,24 @@ def calculate_avg_sentence_length(text: str) -> float:
 
 def get_extra_data(content: str) -> dict:
     """Zwraca dodatkowe dane dla avg_sentence_length."""
-    tokens = get_tokens(content)
-    sentences = get_sentences(content)
+    doc = get_document(content)
     return {
-        "word_count": len(tokens),
-        "sentence_count": len(sentences)
+        "word_count": len(doc.tokens),
+        "sentence_count": len(doc.sentences)
     }
 
 
+METRIC = Metric(
+    name="avg_sentence_length",
+    calculate_func=calculate_avg_sentence_length,
+    extra_data_func=get_extra_data,
+    requires=frozenset({"tokens", "sentences"}),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="avg_sentence_length",
-        calculate_func=calculate_avg_sentence_length,
-        extra_data_func=get_extra_data
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("avg_sentence_length", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
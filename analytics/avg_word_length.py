@@ -20,11 +20,9 @@ ZASTOSOWANIE:
 - Uzupełnienie metryki rzadkich słów
 """
 
-from common import (
-    get_tokens,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+from document import get_document
+from registry import Metric
+from runner import run_metrics
 
 
 def calculate_avg_word_length_full(text: str) -> dict:
@@ -37,7 +35,7 @@ def calculate_avg_word_length_full(text: str) -> dict:
     Returns:
         Słownik ze średnią i statystykami
     """
-    tokens = get_tokens(text, lowercase=False)
+    tokens = get_document(text).tokens_original
     
     if len(tokens) == 0:
         return {
@@ -71,16 +69,17 @@ def get_extra_data_avg_word_length(content: str) -> dict:
     }
 
 
+METRIC = Metric(
+    name="avg_word_length",
+    calculate_func=calculate_avg_word_length,
+    extra_data_func=get_extra_data_avg_word_length,
+    requires=frozenset({"tokens"}),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="avg_word_length",
-        calculate_func=calculate_avg_word_length,
-        extra_data_func=get_extra_data_avg_word_length
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("avg_word_length", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
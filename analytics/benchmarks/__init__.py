@@ -0,0 +1,6 @@
+"""
+Benchmarki potoku analitycznego.
+
+Moduły uruchamiane z katalogu analytics/, np.:
+    python -m benchmarks.engines --documents 10000
+"""
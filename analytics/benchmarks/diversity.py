@@ -0,0 +1,120 @@
+"""
+diversity.py - Benchmark wektorowego MTLD (mtld_engine) vs lexical_diversity
+
+Buduje strumienie tokenów o zadanej długości (domyślnie 10k i 1M),
+losując zdania z prawdziwych artykułów, i mierzy czas MTLD,
+MTLD-MA-wrap i HD-D w mtld_engine oraz w bibliotece lexical_diversity.
+Dla każdej miary sprawdzana jest zgodność wyników do 2 miejsc po przecinku.
+
+Referencyjne mtld_ma_wrap z biblioteki ma złożoność kwadratową względem
+długości faktora dla każdej pozycji, więc dla długich strumieni jest
+pomijane (--ma-wrap-reference-limit).
+
+Użycie:
+    python -m benchmarks.diversity
+    python -m benchmarks.diversity --tokens 10000 1000000 --output diversity.json
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from pathlib import Path
+
+from lexical_diversity import lex_div as ld
+
+from benchmarks.synthetic import load_sentence_pools
+import mtld_engine
+
+WORD_PATTERN = re.compile(r"\w+")
+
+MEASURES = {
+    "mtld": (mtld_engine.mtld, ld.mtld),
+    "mtld_ma_wrap": (mtld_engine.mtld_ma_wrap, ld.mtld_ma_wrap),
+    "hdd": (mtld_engine.hdd, ld.hdd),
+}
+
+
+def build_token_stream(n_tokens: int, seed: int = 0) -> list[str]:
+    """Składa strumień n_tokens tokenów z losowych zdań korpusu."""
+    rng = random.Random(seed)
+    sentences = [
+        WORD_PATTERN.findall(sentence.lower())
+        for pool in load_sentence_pools().values()
+        for sentence in pool["sentences"]
+    ]
+    sentences = [s for s in sentences if s]
+
+    tokens = []
+    while len(tokens) < n_tokens:
+        tokens.extend(rng.choice(sentences))
+    return tokens[:n_tokens]
+
+
+def _timed(func, tokens: list[str]) -> tuple[float, float]:
+    start = time.perf_counter()
+    value = func(tokens)
+    return value, time.perf_counter() - start
+
+
+def benchmark_stream(tokens: list[str], ma_wrap_reference_limit: int) -> dict:
+    """Mierzy wszystkie miary dla jednego strumienia tokenów."""
+    result = {"tokens": len(tokens), "measures": {}}
+
+    # Wszystkie miary jednym zakodowaniem (tak liczy metryka mtld.py)
+    _, combined_time = _timed(mtld_engine.lexical_diversity_measures, tokens)
+    result["combined_engine_s"] = round(combined_time, 4)
+
+    for name, (engine_func, reference_func) in MEASURES.items():
+        value, engine_time = _timed(engine_func, tokens)
+        entry = {"engine_value": round(value, 4), "engine_s": round(engine_time, 4)}
+
+        if name == "mtld_ma_wrap" and len(tokens) > ma_wrap_reference_limit:
+            entry["reference_skipped"] = True
+        else:
+            reference, reference_time = _timed(reference_func, tokens)
+            entry.update({
+                "reference_value": round(reference, 4),
+                "reference_s": round(reference_time, 4),
+                "speedup": round(reference_time / engine_time, 1) if engine_time else None,
+                "matches_2dp": bool(round(value, 2) == round(reference, 2)),
+            })
+
+        result["measures"][name] = entry
+        print(
+            f"  {len(tokens):>9} tok. / {name:<13} engine {engine_time:8.3f} s"
+            + (
+                f", lexical_diversity {entry['reference_s']:8.3f} s"
+                f" (x{entry['speedup']}, zgodne: {entry['matches_2dp']})"
+                if "reference_s" in entry else ", lexical_diversity pominięte"
+            )
+        )
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mtld_engine vs lexical_diversity")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[10_000, 1_000_000], help="Długości strumieni tokenów")
+    parser.add_argument("--ma-wrap-reference-limit", type=int, default=10_000, help="Maks. długość dla referencyjnego mtld_ma_wrap")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora")
+    parser.add_argument("--output", type=Path, help="Plik JSON z wynikami")
+    args = parser.parse_args()
+
+    print("Benchmark MTLD / MTLD-MA-wrap / HD-D...")
+    results = [
+        benchmark_stream(build_token_stream(n_tokens, args.seed), args.ma_wrap_reference_limit)
+        for n_tokens in args.tokens
+    ]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nWyniki zapisane w: {args.output}")
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+engines.py - Porównanie przepustowości silników runnera (pool vs pipe)
+
+Uruchamia run_all.py z każdym silnikiem na prawdziwym korpusie
+(data/articles, 48 dokumentów) oraz na syntetycznym korpusie o zadanej
+liczbie dokumentów. Każdy pomiar to osobny proces, z wyłączonym cache
+parsowania i z wynikami zapisywanymi do katalogu tymczasowego, więc
+czas obejmuje ładowanie modelu i pełne parsowanie.
+
+Użycie:
+    python -m benchmarks.engines
+    python -m benchmarks.engines --documents 10000 --n-process 4 --output engines.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import generate_corpus
+from common import ARTICLES_DIR
+
+ANALYTICS_DIR = Path(__file__).parent.parent
+
+ENGINES = ["pool", "pipe"]
+
+
+def count_documents(articles_dir: Path) -> int:
+    """Zlicza dokumenty (pliki wersji) w korpusie."""
+    return sum(1 for _ in Path(articles_dir).glob("*/*.json"))
+
+
+def run_engine(
+    engine: str,
+    articles_dir: Path,
+    run_args: list[str]
+) -> float:
+    """
+    Uruchamia run_all.py z danym silnikiem i zwraca czas ściany w sekundach.
+
+    Args:
+        engine: Nazwa silnika ("pool" lub "pipe")
+        articles_dir: Katalog korpusu
+        run_args: Dodatkowe argumenty run_all.py
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        env = {
+            **os.environ,
+            "ANALYTICS_ARTICLES_DIR": str(articles_dir),
+            "ANALYTICS_OUTPUT_DIR": output_dir,
+            "ANALYTICS_PARSE_CACHE": "0",
+        }
+        cmd = [sys.executable, "run_all.py", "--engine", engine, *run_args]
+
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ANALYTICS_DIR, env=env, stdout=subprocess.DEVNULL, check=True)
+        return time.perf_counter() - start
+
+
+def benchmark_corpus(name: str, articles_dir: Path, run_args: list[str]) -> dict:
+    """Mierzy wszystkie silniki na jednym korpusie."""
+    documents = count_documents(articles_dir)
+    result = {"corpus": name, "documents": documents, "engines": {}}
+
+    for engine in ENGINES:
+        wall_time = run_engine(engine, articles_dir, run_args)
+        result["engines"][engine] = {
+            "wall_time_s": round(wall_time, 3),
+            "docs_per_s": round(documents / wall_time, 2),
+        }
+        print(f"  {name} ({documents} dok.) / {engine}: {wall_time:.2f} s, {documents / wall_time:.1f} dok./s")
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Porównanie silników runnera")
+    parser.add_argument("--documents", type=int, default=10000, help="Rozmiar korpusu syntetycznego (0 = pomiń)")
+    parser.add_argument("--metrics", nargs="+", help="Metryki do policzenia (domyślnie wszystkie)")
+    parser.add_argument("--workers", type=int, help="Liczba procesów silnika pool")
+    parser.add_argument("--batch-size", type=int, help="Rozmiar wsadu silnika pipe")
+    parser.add_argument("--n-process", type=int, help="Liczba procesów nlp.pipe")
+    parser.add_argument("--output", type=Path, help="Plik JSON z wynikami")
+    args = parser.parse_args()
+
+    run_args = []
+    if args.metrics:
+        run_args += ["--metrics", *args.metrics]
+    if args.workers:
+        run_args += ["--workers", str(args.workers)]
+    if args.batch_size:
+        run_args += ["--batch-size", str(args.batch_size)]
+    if args.n_process:
+        run_args += ["--n-process", str(args.n_process)]
+
+    print("Porównanie silników (pool vs pipe)...")
+    results = [benchmark_corpus("real", ARTICLES_DIR, run_args)]
+
+    if args.documents:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            generate_corpus(args.documents, Path(corpus_dir))
+            results.append(benchmark_corpus("synthetic", Path(corpus_dir), run_args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\nWyniki zapisane w: {args.output}")
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
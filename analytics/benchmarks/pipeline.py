@@ -0,0 +1,334 @@
+"""
+pipeline.py - Benchmark całego potoku analitycznego z porównaniem do baseline
+
+Dla każdego rozmiaru korpusu syntetycznego (benchmarks/synthetic.py,
+domyślnie 1k, 10k i 100k dokumentów) mierzy etapy:
+- metric:<nazwa> - run_all.py --metrics <nazwa> (każda metryka osobno)
+- runner - run_all.py ze wszystkimi metrykami
+- charts - charts/run_all_charts.py na wynikach etapu runner
+
+oraz raz, niezależnie od korpusu:
+- ratings - ratings_analysis/run_all.py (dane ankiet z data/ratings)
+
+Każdy etap to osobny proces (cache parsowania wyłączony, wyniki do
+katalogu tymczasowego). Dla etapu mierzone są:
+- czas ściany i czas CPU (user + sys, z os.wait4 - proces i jego
+  zakończeni potomkowie)
+- peak_rss_mb - szczytowe RSS największego pojedynczego procesu drzewa
+  (ru_maxrss z os.wait4 to maksimum, nie suma po procesach)
+- peak_tree_pss_mb - szczytowa suma PSS całego drzewa procesów (etap
+  i procesy robocze), próbkowana z /proc co RSS_SAMPLE_INTERVAL_S;
+  PSS dzieli strony współdzielone między procesy, więc suma nie liczy
+  ich wielokrotnie (None bez /proc)
+- dla etapów korpusowych także dokumenty/s.
+
+Tryb porównania (--baseline) zestawia wyniki z zapisanym plikiem JSON
+i oznacza regresje - wzrost czasu ściany lub pamięci ponad --tolerance.
+Przy regresji skrypt kończy się kodem 1.
+
+Użycie:
+    python -m benchmarks.pipeline --documents 1000 10000 --output bench.json
+    python -m benchmarks.pipeline --documents 1000 --stages runner charts --baseline bench.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.engines import ANALYTICS_DIR, count_documents
+from benchmarks.synthetic import generate_corpus
+from registry import METRIC_MODULES
+
+# Etapy mierzone dla każdego korpusu (poza metric:<nazwa>)
+CORPUS_STAGES = ["metrics", "runner", "charts"]
+
+# Etapy niezależne od korpusu
+GLOBAL_STAGES = ["ratings"]
+
+# Mierzone wielkości porównywane z baseline
+COMPARED_MEASURES = ["wall_time_s", "peak_rss_mb", "peak_tree_pss_mb"]
+
+# Odstęp próbkowania pamięci drzewa procesów (s)
+RSS_SAMPLE_INTERVAL_S = 0.05
+
+# Katalog procfs (próbkowanie drzewa procesów tylko na Linuksie)
+PROC_DIR = Path("/proc")
+
+# Domyślny dopuszczalny wzrost względem baseline
+DEFAULT_TOLERANCE = 0.10
+
+
+def _process_tree(root_pid: int) -> list[int]:
+    """Zwraca PID procesu i wszystkich jego żyjących potomków (z /proc)."""
+    children = {}
+    for entry in PROC_DIR.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_bytes()
+        except OSError:
+            continue
+        # comm (w nawiasach) może zawierać spacje - ppid to drugie pole po ")"
+        ppid = int(stat[stat.rindex(b")") + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    tree = []
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    return tree
+
+
+def _tree_pss_kb(root_pid: int) -> int:
+    """Suma PSS (kB) drzewa procesów - z /proc/<pid>/smaps_rollup."""
+    total = 0
+    for pid in _process_tree(root_pid):
+        try:
+            rollup = (PROC_DIR / str(pid) / "smaps_rollup").read_text()
+        except OSError:
+            continue
+        for line in rollup.splitlines():
+            if line.startswith("Pss:"):
+                total += int(line.split()[1])
+                break
+    return total
+
+
+def _sample_tree_pss(root_pid: int, stop: threading.Event, peak: list[int]) -> None:
+    """Próbkuje PSS drzewa procesów do ustawienia stop; maksimum w peak[0]."""
+    while True:
+        peak[0] = max(peak[0], _tree_pss_kb(root_pid))
+        if stop.wait(RSS_SAMPLE_INTERVAL_S):
+            return
+
+
+def run_stage(cmd: list[str], cwd: Path, env: dict[str, str]) -> dict:
+    """
+    Uruchamia etap jako proces potomny i mierzy jego zasoby.
+
+    Returns:
+        Słownik {"wall_time_s", "cpu_time_s", "peak_rss_mb",
+        "peak_tree_pss_mb", "returncode"}
+    """
+    with tempfile.TemporaryFile() as stderr_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=stderr_file)
+
+        # Suma pamięci procesów roboczych - ru_maxrss jej nie obejmuje
+        peak_pss = [0]
+        stop_sampling = threading.Event()
+        sampler = None
+        if PROC_DIR.is_dir():
+            sampler = threading.Thread(target=_sample_tree_pss, args=(process.pid, stop_sampling, peak_pss), daemon=True)
+            sampler.start()
+
+        # wait4 zamiast wait - rusage procesu i jego zakończonych potomków
+        _, status, usage = os.wait4(process.pid, 0)
+        wall_time = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        stop_sampling.set()
+        if sampler is not None:
+            sampler.join()
+
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode("utf-8", errors="replace")
+
+    result = {
+        "wall_time_s": round(wall_time, 3),
+        "cpu_time_s": round(usage.ru_utime + usage.ru_stime, 3),
+        # ru_maxrss w kilobajtach (Linux) - maksimum po procesach, nie suma
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "peak_tree_pss_mb": round(peak_pss[0] / 1024, 1) if sampler is not None else None,
+        "returncode": process.returncode,
+    }
+    if process.returncode != 0:
+        result["error"] = stderr.strip().splitlines()[-1] if stderr.strip() else "?"
+
+    return result
+
+
+def _report(corpus: str, stage: str, result: dict, documents: int | None = None) -> None:
+    if documents:
+        result["docs_per_s"] = round(documents / result["wall_time_s"], 2) if result["wall_time_s"] else None
+
+    status = "" if result["returncode"] == 0 else f"  BŁĄD: {result.get('error')}"
+    throughput = f", {result['docs_per_s']:.1f} dok./s" if result.get("docs_per_s") else ""
+    tree_memory = f", drzewo {result['peak_tree_pss_mb']:8.1f} MB PSS" if result.get("peak_tree_pss_mb") is not None else ""
+    print(
+        f"  {corpus:<12} {stage:<28} {result['wall_time_s']:9.2f} s ściany, "
+        f"{result['cpu_time_s']:9.2f} s CPU, {result['peak_rss_mb']:8.1f} MB maks. proces{tree_memory}{throughput}{status}"
+    )
+
+
+def benchmark_corpus(
+    name: str,
+    articles_dir: Path,
+    stages: list[str],
+    metrics: list[str]
+) -> dict:
+    """Mierzy etapy korpusowe na jednym korpusie."""
+    documents = count_documents(articles_dir)
+    result = {"corpus": name, "documents": documents, "stages": {}}
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        env = {
+            **os.environ,
+            "ANALYTICS_ARTICLES_DIR": str(articles_dir),
+            "ANALYTICS_PARSE_CACHE": "0",
+        }
+
+        if "metrics" in stages:
+            for metric_name in metrics:
+                with tempfile.TemporaryDirectory() as output_dir:
+                    stage = f"metric:{metric_name}"
+                    result["stages"][stage] = run_stage(
+                        [sys.executable, "run_all.py", "--metrics", metric_name],
+                        ANALYTICS_DIR,
+                        {**env, "ANALYTICS_OUTPUT_DIR": output_dir}
+                    )
+                    _report(name, stage, result["stages"][stage], documents)
+
+        # Wyniki runnera zostają w work_dir dla etapu wykresów
+        output_dir = Path(work_dir) / "output"
+        env["ANALYTICS_OUTPUT_DIR"] = str(output_dir)
+
+        if "runner" in stages or "charts" in stages:
+            result["stages"]["runner"] = run_stage(
+                [sys.executable, "run_all.py", "--metrics", *metrics],
+                ANALYTICS_DIR,
+                env
+            )
+            _report(name, "runner", result["stages"]["runner"], documents)
+
+        if "charts" in stages:
+            result["stages"]["charts"] = run_stage(
+                [sys.executable, "charts/run_all_charts.py"],
+                ANALYTICS_DIR,
+                {**env, "ANALYTICS_CHARTS_OUTPUT_DIR": str(Path(work_dir) / "charts")}
+            )
+            _report(name, "charts", result["stages"]["charts"], documents)
+
+    return result
+
+
+def benchmark_global(stages: list[str]) -> dict:
+    """Mierzy etapy niezależne od korpusu."""
+    result = {"corpus": "global", "documents": None, "stages": {}}
+
+    if "ratings" in stages:
+        with tempfile.TemporaryDirectory() as output_dir:
+            result["stages"]["ratings"] = run_stage(
+                [sys.executable, "ratings_analysis/run_all.py"],
+                ANALYTICS_DIR,
+                {**os.environ, "ANALYTICS_RATINGS_OUTPUT_DIR": output_dir}
+            )
+            _report("global", "ratings", result["stages"]["ratings"])
+
+    return result
+
+
+def compare_with_baseline(results: list[dict], baseline: list[dict], tolerance: float) -> list[dict]:
+    """
+    Porównuje wyniki z baseline.
+
+    Etapy są dopasowywane po (korpus, liczba dokumentów, etap). Regresja
+    to wzrost wielkości z COMPARED_MEASURES o więcej niż tolerance.
+
+    Returns:
+        Lista porównań {"corpus", "documents", "stage", "measure",
+        "baseline", "current", "change", "regression"}
+    """
+    baseline_stages = {
+        (entry["corpus"], entry["documents"], stage): values
+        for entry in baseline
+        for stage, values in entry["stages"].items()
+    }
+
+    comparisons = []
+    for entry in results:
+        for stage, values in entry["stages"].items():
+            reference = baseline_stages.get((entry["corpus"], entry["documents"], stage))
+            if reference is None:
+                continue
+
+            for measure in COMPARED_MEASURES:
+                if not reference.get(measure) or values.get(measure) is None:
+                    continue
+
+                change = values[measure] / reference[measure] - 1
+                comparisons.append({
+                    "corpus": entry["corpus"],
+                    "documents": entry["documents"],
+                    "stage": stage,
+                    "measure": measure,
+                    "baseline": reference[measure],
+                    "current": values[measure],
+                    "change": round(change, 4),
+                    "regression": change > tolerance,
+                })
+
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark potoku analitycznego")
+    parser.add_argument("--documents", type=int, nargs="+", default=[1000, 10000, 100000], help="Rozmiary korpusów syntetycznych")
+    parser.add_argument("--stages", nargs="+", choices=CORPUS_STAGES + GLOBAL_STAGES, default=CORPUS_STAGES + GLOBAL_STAGES, help="Mierzone etapy")
+    parser.add_argument("--metrics", nargs="+", default=METRIC_MODULES, help="Metryki (etapy metric:<nazwa> i runner)")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora korpusu")
+    parser.add_argument("--output", type=Path, help="Plik JSON z wynikami")
+    parser.add_argument("--baseline", type=Path, help="Plik JSON z wynikami bazowymi do porównania")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Dopuszczalny wzrost (np. 0.1 = 10%%)")
+    args = parser.parse_args()
+
+    print("Benchmark potoku analitycznego...")
+    results = []
+
+    for n_documents in args.documents:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            generate_corpus(n_documents, Path(corpus_dir), args.seed)
+            results.append(benchmark_corpus("synthetic", Path(corpus_dir), args.stages, args.metrics))
+
+    if any(stage in GLOBAL_STAGES for stage in args.stages):
+        results.append(benchmark_global(args.stages))
+
+    report = {"results": results}
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+        report["comparison"] = compare_with_baseline(results, baseline, args.tolerance)
+        regressions = [c for c in report["comparison"] if c["regression"]]
+
+        print(f"\nPorównanie z {args.baseline} (tolerancja {args.tolerance:.0%}):")
+        for comparison in report["comparison"]:
+            flag = "REGRESJA" if comparison["regression"] else "ok"
+            print(
+                f"  {comparison['documents'] or '-':>7} {comparison['stage']:<28} {comparison['measure']:<12} "
+                f"{comparison['baseline']:>10} -> {comparison['current']:>10} ({comparison['change']:+.1%}) {flag}"
+            )
+        report["regressions"] = len(regressions)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nWyniki zapisane w: {args.output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
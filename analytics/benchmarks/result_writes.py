@@ -0,0 +1,150 @@
+"""
+result_writes.py - Benchmark zapisu wyników: pliki per wynik vs JSON Lines
+
+Dla zadanej liczby wyników (domyślnie 1k, 10k i 100k) mierzy zapis:
+- per_file - dotychczasowy save_metric_result (mkdir, plik z wcięciami
+  na każdy wynik)
+- jsonl:<enkoder> - jeden shard BulkResultWriter dla każdego enkodera
+  z result_writer.ENCODERS (json, orjson jeśli zainstalowany)
+- jsonl_gz:<enkoder> - to samo z kompresją gzip
+
+Wyniki mają kształt wyników readability_pl (słownik wskaźników
+i rozkład zdań w extra), z losowymi wartościami. Każdy wariant zapisuje
+do osobnego katalogu tymczasowego; podawany jest czas, wyniki/s,
+liczba plików i rozmiar na dysku.
+
+Użycie:
+    python -m benchmarks.result_writes
+    python -m benchmarks.result_writes --results 1000 100000 --output writes.json
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from common import save_metric_result, VERSIONS
+from result_writer import BulkResultWriter, ENCODERS, shard_path
+
+# Nazwa metryki w zapisywanych wynikach
+METRIC_NAME = "readability_pl"
+
+
+def build_results(n_results: int, seed: int = 0) -> list[dict]:
+    """Buduje n_results rekordów o kształcie wyników readability_pl."""
+    rng = random.Random(seed)
+    results = []
+
+    for index in range(n_results):
+        pisarek = rng.uniform(4, 18)
+        results.append({
+            "metric": METRIC_NAME,
+            "article": f"artykul_{index // len(VERSIONS):06d}",
+            "version": VERSIONS[index % len(VERSIONS)],
+            "value": {
+                "pisarek": round(pisarek, 2),
+                "pisarek_linear": round(rng.uniform(4, 18), 2),
+                "fog_pl": round(rng.uniform(4, 20), 2),
+                "flesch_reading_ease": round(rng.uniform(-20, 60), 2),
+                "fog_index": round(rng.uniform(8, 25), 2),
+                "smog": round(rng.uniform(8, 20), 2),
+                "pisarek_level": "średni",
+            },
+            "extra": {
+                "sentences": rng.randint(5, 80),
+                "pisarek_p50": round(pisarek * 0.9, 2),
+                "pisarek_p90": round(pisarek * 1.4, 2),
+                "pisarek_max": round(pisarek * 2, 2),
+                "hard_sentences_percent": round(rng.uniform(0, 60), 2),
+                "levels": {"bardzo_łatwy": 3, "łatwy": 7, "średni": 9, "trudny": 4, "bardzo_trudny": 1},
+            },
+            "computed_at": "2026-01-01T00:00:00",
+        })
+
+    return results
+
+
+def _directory_stats(directory: Path) -> tuple[int, int]:
+    """Liczba plików i ich łączny rozmiar w bajtach."""
+    files = [path for path in directory.rglob("*") if path.is_file()]
+    return len(files), sum(path.stat().st_size for path in files)
+
+
+def write_per_file(results: list[dict], output_dir: Path) -> None:
+    """Zapis dotychczasowy - save_metric_result dla każdego wyniku."""
+    for result in results:
+        save_metric_result(
+            metric_name=result["metric"],
+            article_name=result["article"],
+            version=result["version"],
+            value=result["value"],
+            extra_data=result["extra"],
+            output_dir=output_dir
+        )
+
+
+def write_bulk(results: list[dict], output_dir: Path, encoder: str, compress: bool) -> None:
+    """Zapis zbiorczy - jeden shard JSON Lines."""
+    with BulkResultWriter(shard_path(output_dir, METRIC_NAME, compress), encoder=encoder) as writer:
+        writer.write_many(results)
+
+
+def benchmark_size(n_results: int) -> dict:
+    """Mierzy wszystkie warianty zapisu dla n_results wyników."""
+    results = build_results(n_results)
+
+    variants = {"per_file": lambda output_dir: write_per_file(results, output_dir)}
+    for encoder in ENCODERS:
+        for compress, prefix in [(False, "jsonl"), (True, "jsonl_gz")]:
+            variants[f"{prefix}:{encoder}"] = (
+                lambda output_dir, encoder=encoder, compress=compress: write_bulk(results, output_dir, encoder, compress)
+            )
+
+    entry = {"results": n_results, "variants": {}}
+    for name, write in variants.items():
+        with tempfile.TemporaryDirectory() as output_dir:
+            start = time.perf_counter()
+            write(Path(output_dir))
+            wall_time = time.perf_counter() - start
+
+            files, size = _directory_stats(Path(output_dir))
+
+        entry["variants"][name] = {
+            "wall_time_s": round(wall_time, 3),
+            "results_per_s": round(n_results / wall_time, 1) if wall_time else None,
+            "files": files,
+            "size_mb": round(size / 2**20, 2),
+        }
+        print(
+            f"  {n_results:>7} {name:<18} {wall_time:8.3f} s, {n_results / wall_time:>10.0f} wyników/s, "
+            f"{files:>7} plików, {size / 2**20:8.2f} MB"
+        )
+
+    baseline = entry["variants"]["per_file"]["wall_time_s"]
+    for values in entry["variants"].values():
+        values["speedup"] = round(baseline / values["wall_time_s"], 1) if values["wall_time_s"] else None
+
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark zapisu wyników (per plik vs JSON Lines)")
+    parser.add_argument("--results", type=int, nargs="+", default=[1000, 10000, 100000], help="Liczby wyników")
+    parser.add_argument("--output", type=Path, help="Plik JSON z wynikami")
+    args = parser.parse_args()
+
+    print("Benchmark zapisu wyników...")
+    entries = [benchmark_size(n_results) for n_results in args.results]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        print(f"\nWyniki zapisane w: {args.output}")
+    else:
+        print(json.dumps(entries, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+shared_tokens.py - Benchmark przesyłania tablic tokenów do procesów roboczych
+
+Porównuje dwa sposoby przekazania widoków tokenowych dokumentów (tokens,
+tokens_original, lemmas, pos) procesom roboczym:
+- pickle - listy napisów każdego dokumentu serializowane w zadaniu puli
+  (tak trafiają do procesów wyniki parsowania w procesie nadrzędnym)
+- shared - blok wspólnej pamięci (shared_tokens.py); w zadaniu jest
+  tylko TokenStoreHandle i klucze dokumentów
+
+Dokumenty budowane są z losowych zdań prawdziwych artykułów (bez modelu
+spaCy: lematy to tokeny małymi literami, znaczniki POS losowe). Dla
+każdej liczby dokumentów (domyślnie 10k) podawane są:
+- bajty serializowane do procesów i czas dumps + loads
+- czas budowy bloku (z kodowaniem słownikiem) i jego rozmiar
+- czas dołączenia bloku i odczytu wszystkich dokumentów (widoki numpy
+  oraz dekodowanie do napisów)
+- czas przebiegu przez pulę procesów (zadanie zwraca liczbę tokenów)
+
+Użycie:
+    python -m benchmarks.shared_tokens
+    python -m benchmarks.shared_tokens --documents 10000 100000 --workers 4 --output shared.json
+"""
+
+import argparse
+import json
+import pickle
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.synthetic import load_sentence_pools
+from shared_tokens import attach, FIELD_IDS, FIELDS, TokenStoreBuilder, TokenStoreHandle
+from vocabulary import Vocabulary
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Znaczniki POS losowane dla tokenów
+POS_TAGS = ["NOUN", "VERB", "ADJ", "ADV", "ADP", "PRON", "CCONJ", "PROPN", "NUM", "PART"]
+
+# Zakres długości dokumentu (tokeny)
+DOCUMENT_TOKENS = (100, 800)
+
+# Liczba dokumentów w jednym zadaniu puli
+TASK_SIZE = 100
+
+
+def build_documents(n_documents: int, seed: int = 0) -> list[tuple[str, SimpleNamespace]]:
+    """Buduje n_documents dokumentów (klucz, widoki) z losowych zdań korpusu."""
+    rng = random.Random(seed)
+    sentences = [
+        WORD_PATTERN.findall(sentence)
+        for pool in load_sentence_pools().values()
+        for sentence in pool["sentences"]
+    ]
+    sentences = [s for s in sentences if s]
+
+    documents = []
+    for index in range(n_documents):
+        length = rng.randint(*DOCUMENT_TOKENS)
+        tokens_original = []
+        while len(tokens_original) < length:
+            tokens_original.extend(rng.choice(sentences))
+        tokens_original = tokens_original[:length]
+        tokens = [token.lower() for token in tokens_original]
+
+        documents.append((f"artykul_{index:06d}/adult_full", SimpleNamespace(
+            tokens=tokens,
+            tokens_original=tokens_original,
+            lemmas=list(tokens),
+            pos=[rng.choice(POS_TAGS) for _ in tokens],
+        )))
+
+    return documents
+
+
+def _count_pickled(payload: list[dict]) -> int:
+    """Zadanie puli: dokumenty przesłane jako listy napisów."""
+    return sum(len(fields["tokens"]) for fields in payload)
+
+
+def _count_shared(handle: TokenStoreHandle, keys: list[str]) -> int:
+    """Zadanie puli: dokumenty czytane z bloku wspólnej pamięci."""
+    view = attach(handle)
+    return sum(len(view.decode(view.document_ids(key, "tokens"))) for key in keys)
+
+
+def _run_pool(workers: int, submit) -> tuple[int, float]:
+    """Czas przebiegu zadań przez pulę (bez startu procesów)."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Rozgrzanie - procesy startują przed pomiarem
+        list(executor.map(int, range(workers)))
+
+        start = time.perf_counter()
+        total = sum(future.result() for future in submit(executor))
+        return total, time.perf_counter() - start
+
+
+def benchmark_size(n_documents: int, workers: int) -> dict:
+    """Mierzy oba sposoby przesyłania dla n_documents dokumentów."""
+    documents = build_documents(n_documents)
+    n_tokens = sum(len(document.tokens) for _, document in documents)
+    payloads = [{field: getattr(document, field) for field in FIELDS} for _, document in documents]
+
+    # pickle - listy napisów
+    start = time.perf_counter()
+    pickled = [pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL) for payload in payloads]
+    dumps_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for data in pickled:
+        pickle.loads(data)
+    loads_time = time.perf_counter() - start
+    pickle_bytes = sum(len(data) for data in pickled)
+
+    tasks = [payloads[i:i + TASK_SIZE] for i in range(0, len(payloads), TASK_SIZE)]
+    _, pickle_pool_time = _run_pool(
+        workers, lambda executor: [executor.submit(_count_pickled, task) for task in tasks]
+    )
+
+    # shared - blok wspólnej pamięci
+    start = time.perf_counter()
+    vocabulary = Vocabulary()
+    builder = TokenStoreBuilder(FIELDS, vocabulary)
+    for key, document in documents:
+        builder.add(key, SimpleNamespace(**{
+            FIELD_IDS[field]: vocabulary.encode(getattr(document, field), len(document.tokens))
+            for field in FIELDS
+        }))
+    store = builder.build()
+    build_time = time.perf_counter() - start
+
+    with store:
+        handle = store.handle
+        keys = [key for key, _ in documents]
+        key_tasks = [keys[i:i + TASK_SIZE] for i in range(0, len(keys), TASK_SIZE)]
+        handle_bytes = len(pickle.dumps(handle, protocol=pickle.HIGHEST_PROTOCOL))
+        task_bytes = sum(
+            len(pickle.dumps((handle, task), protocol=pickle.HIGHEST_PROTOCOL)) for task in key_tasks
+        )
+
+        start = time.perf_counter()
+        view = attach(handle)
+        for key in keys:
+            for field in FIELDS:
+                view.document_ids(key, field)
+        views_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in keys:
+            for field in FIELDS:
+                view.decode(view.document_ids(key, field))
+        decode_time = time.perf_counter() - start
+
+        _, shared_pool_time = _run_pool(
+            workers, lambda executor: [executor.submit(_count_shared, handle, task) for task in key_tasks]
+        )
+        store_bytes = store.nbytes
+
+    entry = {
+        "documents": n_documents,
+        "tokens": n_tokens,
+        "pickle": {
+            "bytes_mb": round(pickle_bytes / 2**20, 2),
+            "dumps_s": round(dumps_time, 3),
+            "loads_s": round(loads_time, 3),
+            "pool_s": round(pickle_pool_time, 3),
+        },
+        "shared": {
+            "vocab": handle.n_vocab,
+            "store_mb": round(store_bytes / 2**20, 2),
+            "handle_bytes": handle_bytes,
+            "task_bytes_kb": round(task_bytes / 1024, 1),
+            "build_s": round(build_time, 3),
+            "attach_views_s": round(views_time, 3),
+            "decode_s": round(decode_time, 3),
+            "pool_s": round(shared_pool_time, 3),
+        },
+    }
+
+    print(f"  {n_documents} dokumentów, {n_tokens} tokenów, słownik {handle.n_vocab}")
+    print(
+        f"    pickle: {pickle_bytes / 2**20:8.2f} MB do procesów, dumps {dumps_time:.3f} s, "
+        f"loads {loads_time:.3f} s, pula {pickle_pool_time:.3f} s"
+    )
+    print(
+        f"    shared: blok {store_bytes / 2**20:.2f} MB (budowa {build_time:.3f} s), "
+        f"do procesów {task_bytes / 1024:.1f} KB (handle {handle_bytes} B), "
+        f"widoki {views_time:.3f} s, dekodowanie {decode_time:.3f} s, pula {shared_pool_time:.3f} s"
+    )
+
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark przesyłania tablic tokenów (pickle vs wspólna pamięć)")
+    parser.add_argument("--documents", type=int, nargs="+", default=[10000], help="Liczby dokumentów")
+    parser.add_argument("--workers", type=int, default=2, help="Liczba procesów puli")
+    parser.add_argument("--output", type=Path, help="Plik JSON z wynikami")
+    args = parser.parse_args()
+
+    print("Benchmark przesyłania tablic tokenów...")
+    entries = [benchmark_size(n_documents, args.workers) for n_documents in args.documents]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        print(f"\nWyniki zapisane w: {args.output}")
+    else:
+        print(json.dumps(entries, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
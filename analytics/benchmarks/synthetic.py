@@ -0,0 +1,146 @@
+"""
+synthetic.py - Generator syntetycznego korpusu do benchmarków
+
+Tworzy korpus o zadanej liczbie dokumentów w układzie data/articles/
+(<artykuł>/<wersja>.json), losując ze zwracaniem zdania i nagłówki
+z prawdziwych artykułów. Dla każdej wersji zachowywany jest rozkład
+liczby akapitów i zdań w akapicie, więc syntetyczne dokumenty mają
+długość zbliżoną do prawdziwych (adult_full dłuższe niż child_short).
+
+Użycie:
+    python -m benchmarks.synthetic --documents 10000 --output /tmp/corpus_10k
+"""
+
+import argparse
+import json
+import random
+import re
+from pathlib import Path
+
+from common import ARTICLES_DIR, VERSIONS, list_articles, load_article
+
+# Podział na zdania po znaku końca zdania i białym znaku
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_paragraph(paragraph: str) -> tuple[list[str], list[str]]:
+    """Dzieli akapit na nagłówki (linie markdown #) i zdania."""
+    headings = []
+    sentences = []
+
+    for line in paragraph.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            headings.append(line)
+        else:
+            sentences.extend(s for s in SENTENCE_SPLIT.split(line) if s)
+
+    return headings, sentences
+
+
+def load_sentence_pools() -> dict[str, dict]:
+    """
+    Zbiera z prawdziwego korpusu zdania, nagłówki i rozkłady długości.
+
+    Returns:
+        Słownik {wersja: {"sentences", "headings", "paragraph_counts",
+        "paragraph_lengths"}}
+    """
+    pools = {
+        version: {
+            "sentences": [],
+            "headings": [],
+            "paragraph_counts": [],
+            "paragraph_lengths": [],
+        }
+        for version in VERSIONS
+    }
+
+    for article_name in list_articles():
+        for version in VERSIONS:
+            try:
+                content = load_article(article_name, version).get("content", "")
+            except FileNotFoundError:
+                continue
+
+            pool = pools[version]
+            paragraphs = [p for p in content.split("\n\n") if p.strip()]
+            pool["paragraph_counts"].append(len(paragraphs))
+
+            for paragraph in paragraphs:
+                headings, sentences = _split_paragraph(paragraph)
+                pool["headings"].extend(headings)
+                pool["sentences"].extend(sentences)
+                if sentences:
+                    pool["paragraph_lengths"].append(len(sentences))
+
+    return pools
+
+
+def _generate_content(pool: dict, rng: random.Random) -> str:
+    """Składa treść dokumentu z wylosowanych akapitów."""
+    paragraphs = []
+
+    for _ in range(rng.choice(pool["paragraph_counts"])):
+        sentences = rng.choices(pool["sentences"], k=rng.choice(pool["paragraph_lengths"]))
+        paragraph = " ".join(sentences)
+
+        if pool["headings"] and rng.random() < 0.3:
+            paragraph = f"{rng.choice(pool['headings'])}\n{paragraph}"
+
+        paragraphs.append(paragraph)
+
+    return "\n\n".join(paragraphs)
+
+
+def generate_corpus(n_documents: int, output_dir: Path, seed: int = 0) -> Path:
+    """
+    Generuje syntetyczny korpus.
+
+    Args:
+        n_documents: Liczba dokumentów (par artykuł/wersja)
+        output_dir: Katalog docelowy (układ jak data/articles/)
+        seed: Ziarno generatora losowego
+
+    Returns:
+        Ścieżka do katalogu korpusu
+    """
+    rng = random.Random(seed)
+    pools = load_sentence_pools()
+    output_dir = Path(output_dir)
+
+    for index in range(n_documents):
+        article_name = f"synthetic_{index // len(VERSIONS):06d}"
+        version = VERSIONS[index % len(VERSIONS)]
+        age_target, volume = version.split("_")
+
+        article_dir = output_dir / article_name
+        article_dir.mkdir(parents=True, exist_ok=True)
+
+        data = {
+            "placeId": article_name,
+            "style": version,
+            "ageTarget": age_target,
+            "volume": volume,
+            "title": article_name,
+            "content": _generate_content(pools[version], rng),
+        }
+
+        with open(article_dir / f"{version}.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    return output_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generuje syntetyczny korpus")
+    parser.add_argument("--documents", type=int, required=True, help="Liczba dokumentów")
+    parser.add_argument("--output", type=Path, required=True, help="Katalog docelowy")
+    parser.add_argument("--seed", type=int, default=0, help="Ziarno generatora")
+    args = parser.parse_args()
+
+    generate_corpus(args.documents, args.output, args.seed)
+    print(f"Wygenerowano {args.documents} dokumentów na podstawie {ARTICLES_DIR}")
+    print(f"Korpus: {args.output}")
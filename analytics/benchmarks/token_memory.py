@@ -0,0 +1,203 @@
+"""
+token_memory.py - Pamięć i czas: listy napisów vs identyfikatory słownika
+
+Porównuje dwie reprezentacje widoków tokenowych dokumentów:
+- lists - dotychczasowe listy napisów (tokens, lemmas, pos), w których
+  każde wystąpienie słowa jest osobnym obiektem str (tak tworzy je
+  spaCy), plus tablica sylab
+- arrays - CompactDocument (vocabulary.py): identyfikatory int32 słów,
+  lematów i POS, granice zdań i sylaby, plus wspólny słownik procesu
+  (liczony raz dla całego korpusu)
+
+Pamięć mierzona jest przez tracemalloc (przyrost przy budowie
+reprezentacji) i podawana w MB na 1M tokenów. Dla obu reprezentacji
+mierzony jest też czas TTR (set vs count_unique) i Jaccarda lematów
+kolejnych par dokumentów (zbiory vs jaccard_ids); wyniki obu
+wariantów są sprawdzane pod kątem zgodności.
+
+Dokumenty budowane są z losowych zdań prawdziwych artykułów (bez modelu
+spaCy: lematy to tokeny małymi literami, znaczniki POS wg długości słowa).
+
+Użycie:
+    python -m benchmarks.token_memory
+    python -m benchmarks.token_memory --tokens 1000000 10000000 --output memory.json
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.synthetic import load_sentence_pools
+from common import count_syllables_batch
+from vocabulary import CompactDocument, count_unique, jaccard_ids, Vocabulary
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Znaczniki POS losowane dla tokenów
+POS_TAGS = ["NOUN", "VERB", "ADJ", "ADV", "ADP", "PRON", "CCONJ", "PROPN", "NUM", "PART"]
+
+# Zakres liczby zdań dokumentu
+DOCUMENT_SENTENCES = (5, 60)
+
+
+def build_corpus(n_tokens: int, seed: int = 0) -> list[list[list[str]]]:
+    """Buduje dokumenty (listy zdań jako listy słów) o łącznie n_tokens tokenach."""
+    rng = random.Random(seed)
+    sentences = [
+        WORD_PATTERN.findall(sentence)
+        for pool in load_sentence_pools().values()
+        for sentence in pool["sentences"]
+    ]
+    sentences = [s for s in sentences if s]
+
+    documents = []
+    total = 0
+    while total < n_tokens:
+        document = [rng.choice(sentences) for _ in range(rng.randint(*DOCUMENT_SENTENCES))]
+        documents.append(document)
+        total += sum(map(len, document))
+
+    return documents
+
+
+def _fresh(string: str) -> str:
+    """Kopia napisu jako nowy obiekt (jak napisy tworzone przez spaCy)."""
+    return (string + " ")[:-1]
+
+
+def _pos_tags(words: list[str]) -> list[str]:
+    """Deterministyczne znaczniki POS słów."""
+    return [POS_TAGS[len(word) % len(POS_TAGS)] for word in words]
+
+
+def build_lists(corpus: list[list[list[str]]]) -> list[dict]:
+    """Reprezentacja dotychczasowa - listy napisów i tablica sylab."""
+    documents = []
+    for sentences in corpus:
+        words = [word for sentence in sentences for word in sentence]
+        tokens = [_fresh(word.lower()) for word in words]
+        documents.append({
+            "tokens": tokens,
+            "lemmas": [_fresh(word.lower()) for word in words],
+            "pos": [_fresh(tag) for tag in _pos_tags(words)],
+            "syllables": count_syllables_batch(tokens),
+        })
+    return documents
+
+
+def build_arrays(corpus: list[list[list[str]]], vocabulary: Vocabulary) -> list[CompactDocument]:
+    """Reprezentacja tablicowa - CompactDocument na wspólnym słowniku."""
+    documents = []
+    for sentences in corpus:
+        words = [word for sentence in sentences for word in sentence]
+        token_ids = vocabulary.encode((_fresh(word.lower()) for word in words), len(words))
+        lengths = np.fromiter(map(len, sentences), dtype=np.int32, count=len(sentences))
+        documents.append(CompactDocument(
+            token_ids=token_ids,
+            lemma_ids=vocabulary.encode((_fresh(word.lower()) for word in words), len(words)),
+            pos_ids=vocabulary.encode(map(_fresh, _pos_tags(words)), len(words)),
+            sentence_offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int32),
+            syllables=vocabulary.syllables(token_ids),
+        ))
+    return documents
+
+
+def _traced(build) -> tuple[object, int, float]:
+    """Buduje reprezentację, zwraca (wynik, przyrost pamięci w bajtach, czas)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    build_time = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, build_time
+
+
+def _timed(func) -> tuple[object, float]:
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def benchmark_size(n_tokens: int) -> dict:
+    """Mierzy obie reprezentacje dla korpusu o n_tokens tokenach."""
+    corpus = build_corpus(n_tokens)
+    total_tokens = sum(len(sentence) for sentences in corpus for sentence in sentences)
+    per_million = 1_000_000 / total_tokens
+
+    lists, lists_bytes, lists_time = _traced(lambda: build_lists(corpus))
+    vocabulary = Vocabulary()
+    arrays, arrays_bytes, arrays_time = _traced(lambda: build_arrays(corpus, vocabulary))
+    arrays_only = sum(document.nbytes for document in arrays)
+
+    ttr_sets, ttr_sets_time = _timed(lambda: [
+        len(set(document["tokens"])) / len(document["tokens"]) for document in lists
+    ])
+    ttr_ids, ttr_ids_time = _timed(lambda: [
+        count_unique(document.token_ids) / len(document.token_ids) for document in arrays
+    ])
+
+    def _jaccard_sets():
+        sets = [set(document["lemmas"]) for document in lists]
+        return [len(a & b) / len(a | b) for a, b in zip(sets, sets[1:])]
+
+    jaccard_sets, jaccard_sets_time = _timed(_jaccard_sets)
+    jaccard_arrays, jaccard_ids_time = _timed(lambda: [
+        jaccard_ids(a.lemma_ids, b.lemma_ids) for a, b in zip(arrays, arrays[1:])
+    ])
+
+    entry = {
+        "tokens": total_tokens,
+        "documents": len(corpus),
+        "vocabulary": len(vocabulary),
+        "lists_mb_per_1m": round(lists_bytes * per_million / 2**20, 2),
+        "arrays_mb_per_1m": round(arrays_bytes * per_million / 2**20, 2),
+        "arrays_without_vocabulary_mb_per_1m": round(arrays_only * per_million / 2**20, 2),
+        "lists_build_s": round(lists_time, 3),
+        "arrays_build_s": round(arrays_time, 3),
+        "ttr_sets_s": round(ttr_sets_time, 3),
+        "ttr_ids_s": round(ttr_ids_time, 3),
+        "jaccard_sets_s": round(jaccard_sets_time, 3),
+        "jaccard_ids_s": round(jaccard_ids_time, 3),
+        "results_match": bool(np.allclose(ttr_sets, ttr_ids) and np.allclose(jaccard_sets, jaccard_arrays)),
+    }
+
+    print(f"  {total_tokens} tokenów, {len(corpus)} dokumentów, słownik {len(vocabulary)}")
+    print(
+        f"    pamięć na 1M tokenów: listy {entry['lists_mb_per_1m']:.1f} MB, "
+        f"tablice {entry['arrays_mb_per_1m']:.1f} MB (bez słownika {entry['arrays_without_vocabulary_mb_per_1m']:.1f} MB)"
+    )
+    print(
+        f"    TTR: set {ttr_sets_time:.3f} s, count_unique {ttr_ids_time:.3f} s; "
+        f"Jaccard: zbiory {jaccard_sets_time:.3f} s, tablice {jaccard_ids_time:.3f} s; "
+        f"zgodne: {entry['results_match']}"
+    )
+
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pamięć i czas: listy napisów vs identyfikatory słownika")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1_000_000], help="Liczby tokenów korpusu")
+    parser.add_argument("--output", type=Path, help="Plik JSON z wynikami")
+    args = parser.parse_args()
+
+    print("Benchmark reprezentacji tokenów...")
+    entries = [benchmark_size(n_tokens) for n_tokens in args.tokens]
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        print(f"\nWyniki zapisane w: {args.output}")
+    else:
+        print(json.dumps(entries, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+blob_store.py - Magazyn tekstów adresowanych treścią (hash -> tekst)
+
+Te same teksty źródłowe są zapisane w każdym z trzech logów generowania
+miejsca (source_contents) i dodatkowo w data/source-articles. Magazyn
+przechowuje każdy tekst raz, pod nazwą równą jego hashowi SHA-256:
+
+    data/blobs/<2 pierwsze znaki hasha>/<hash>      (tekst UTF-8)
+    data/blobs/<2 pierwsze znaki hasha>/<hash>.gz   (tekst skompresowany)
+
+a logi zamiast tekstu trzymają referencję "blob:sha256:<hash>"
+(napis, więc typ source_contents: string[] pozostaje bez zmian).
+
+Moduł nie importuje common.py - korzysta z niego common i czytniki
+logów. Migrację logów wykonuje migrate_logs.py.
+
+Użycie:
+    reference = put_blob(text, compress=True)   # "blob:sha256:..."
+    text = resolve(reference)                   # tekst (inne wartości bez zmian)
+"""
+
+import gzip
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+BLOB_DIR = Path(os.environ.get("ANALYTICS_BLOB_DIR", Path(__file__).parent.parent / "data" / "blobs"))
+
+# Prefiks referencji do tekstu w magazynie
+REFERENCE_PREFIX = "blob:sha256:"
+
+# Rozszerzenie skompresowanych blobów
+COMPRESSED_SUFFIX = ".gz"
+
+# Liczba odczytanych tekstów trzymanych w pamięci procesu
+BLOB_CACHE_SIZE = 256
+
+
+def blob_hash(text: str) -> str:
+    """Zwraca hash SHA-256 tekstu (nazwa bloba)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def blob_path(digest: str, blob_dir: Path = BLOB_DIR, compressed: bool = False) -> Path:
+    """Zwraca ścieżkę pliku bloba."""
+    name = digest + (COMPRESSED_SUFFIX if compressed else "")
+    return Path(blob_dir) / digest[:2] / name
+
+
+def is_reference(value: Any) -> bool:
+    """Czy wartość jest referencją do bloba."""
+    return isinstance(value, str) and value.startswith(REFERENCE_PREFIX)
+
+
+def put_blob(text: str, blob_dir: Path = BLOB_DIR, compress: bool = False) -> str:
+    """
+    Zapisuje tekst w magazynie (jeśli jeszcze go tam nie ma).
+
+    Args:
+        text: Tekst do zapisania
+        blob_dir: Katalog magazynu
+        compress: Czy zapisać tekst skompresowany (gzip)
+
+    Returns:
+        Referencja "blob:sha256:<hash>"
+    """
+    digest = blob_hash(text)
+
+    if not (blob_path(digest, blob_dir).exists() or blob_path(digest, blob_dir, compressed=True).exists()):
+        path = blob_path(digest, blob_dir, compressed=compress)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        data = text.encode("utf-8")
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(gzip.compress(data, mtime=0) if compress else data)
+        os.replace(tmp_path, path)
+
+    return REFERENCE_PREFIX + digest
+
+
+@lru_cache(maxsize=BLOB_CACHE_SIZE)
+def _read_blob(digest: str, blob_dir: Path) -> str:
+    path = blob_path(digest, blob_dir)
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+
+    compressed_path = blob_path(digest, blob_dir, compressed=True)
+    if compressed_path.exists():
+        return gzip.decompress(compressed_path.read_bytes()).decode("utf-8")
+
+    raise FileNotFoundError(f"Brak bloba {digest} w {blob_dir}")
+
+
+def get_blob(reference: str, blob_dir: Path = BLOB_DIR) -> str:
+    """
+    Odczytuje tekst wskazywany przez referencję.
+
+    Raises:
+        FileNotFoundError: Gdy bloba nie ma w magazynie
+    """
+    return _read_blob(reference[len(REFERENCE_PREFIX):], Path(blob_dir))
+
+
+def resolve(value: Any, blob_dir: Path = BLOB_DIR) -> Any:
+    """Zamienia referencję na tekst; inne wartości zwraca bez zmian."""
+    return get_blob(value, blob_dir) if is_reference(value) else value
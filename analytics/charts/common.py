@@ -5,14 +5,25 @@ Używane do wczytywania danych i tworzenia spójnych wizualizacji.
 
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 import numpy as np
 
-# Konfiguracja ścieżek
+# Konfiguracja ścieżek (można nadpisać zmiennymi środowiskowymi, np. w benchmarkach)
 BASE_DIR = Path(__file__).parent.parent
-OUTPUT_DIR = BASE_DIR / "output"
-CHARTS_OUTPUT_DIR = Path(__file__).parent / "output"
+OUTPUT_DIR = Path(os.environ.get("ANALYTICS_OUTPUT_DIR", BASE_DIR / "output"))
+CHARTS_OUTPUT_DIR = Path(os.environ.get("ANALYTICS_CHARTS_OUTPUT_DIR", Path(__file__).parent / "output"))
+
+# results_store z katalogu analytics/ (na końcu ścieżki, żeby nie przesłonić
+# tego modułu analytics/common.py)
+sys.path.append(str(BASE_DIR))
+from results_store import RESULTS_FILENAME, read_results, to_aggregated
+
+RESULTS_PATH = OUTPUT_DIR / RESULTS_FILENAME
+
+# Kolumny tabeli wyników potrzebne do odtworzenia danych wykresów
+RESULT_COLUMNS = ["article", "version", "metric", "field", "value", "label", "computed_at"]
 
 # Nazwy wersji tekstów (do wyświetlania)
 VERSION_LABELS = {
@@ -42,11 +53,44 @@ PAIR_LABELS = {
 }
 
 
+def load_metrics_data(metric_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Wczytuje zagregowane dane kilku metryk jednym odczytem tabeli wyników
+    (output/results.parquet, tylko potrzebne kolumny i metryki).
+    Gdy tabeli nie ma, czyta aggregated.json każdej metryki.
+    
+    Returns:
+        Słownik {metryka: {"metric", "aggregated_at", "data"}}
+    """
+    if not RESULTS_PATH.exists():
+        result = {}
+        for metric_name in metric_names:
+            filepath = OUTPUT_DIR / metric_name / "aggregated.json"
+            with open(filepath, 'r', encoding='utf-8') as f:
+                result[metric_name] = json.load(f)
+        return result
+    
+    rows = read_results(RESULTS_PATH, metrics=metric_names, columns=RESULT_COLUMNS).to_pylist()
+    
+    result = {}
+    for metric_name in metric_names:
+        metric_rows = [row for row in rows if row["metric"] == metric_name]
+        if not metric_rows:
+            raise FileNotFoundError(f"Brak wyników metryki {metric_name} w {RESULTS_PATH}")
+        
+        computed_at = [row["computed_at"] for row in metric_rows if row["computed_at"]]
+        result[metric_name] = {
+            "metric": metric_name,
+            "aggregated_at": max(computed_at).isoformat() if computed_at else None,
+            "data": to_aggregated(metric_rows)
+        }
+    
+    return result
+
+
 def load_aggregated_data(metric_name: str) -> Dict[str, Any]:
     """Wczytuje zagregowane dane dla danej metryki."""
-    filepath = OUTPUT_DIR / metric_name / "aggregated.json"
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_metrics_data([metric_name])[metric_name]
 
 
 def aggregate_by_version(data: Dict[str, Any], value_key: str = None) -> Dict[str, List[float]]:
@@ -21,7 +21,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from common import (
-    load_aggregated_data, aggregate_by_version, calculate_stats,
+    load_metrics_data, aggregate_by_version, calculate_stats,
     setup_polish_matplotlib, save_chart, get_ordered_versions,
     VERSION_LABELS, VERSION_COLORS
 )
@@ -33,8 +33,9 @@ def create_complexity_charts():
     import seaborn as sns
     
     # Wczytaj dane
-    word_length_data = load_aggregated_data("avg_word_length")["data"]
-    sentence_length_data = load_aggregated_data("avg_sentence_length")["data"]
+    metrics_data = load_metrics_data(["avg_word_length", "avg_sentence_length"])
+    word_length_data = metrics_data["avg_word_length"]["data"]
+    sentence_length_data = metrics_data["avg_sentence_length"]["data"]
     
     # Agreguj według wersji
     word_len_by_version = aggregate_by_version(word_length_data)
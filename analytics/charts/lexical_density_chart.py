@@ -21,7 +21,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from common import (
-    load_aggregated_data, aggregate_by_version, calculate_stats,
+    load_metrics_data, aggregate_by_version, calculate_stats,
     setup_polish_matplotlib, save_chart, get_ordered_versions,
     VERSION_LABELS, VERSION_COLORS
 )
@@ -32,8 +32,9 @@ def create_lexical_density_charts():
     plt = setup_polish_matplotlib()
     import seaborn as sns
     
-    # Wczytaj dane
-    raw_data = load_aggregated_data("lexical_density")["data"]
+    # Wczytaj dane (gęstość leksykalna i avg_word_length jednym odczytem)
+    metrics_data = load_metrics_data(["lexical_density", "avg_word_length"])
+    raw_data = metrics_data["lexical_density"]["data"]
     
     # Agreguj według wersji
     by_version = aggregate_by_version(raw_data)
@@ -139,8 +140,8 @@ def create_lexical_density_charts():
     # ===== WYKRES 4: Porównanie z innymi metrykami =====
     fig4, ax4 = plt.subplots(figsize=(10, 8))
     
-    # Wczytaj avg_word_length dla korelacji
-    word_length_data = load_aggregated_data("avg_word_length")["data"]
+    # avg_word_length dla korelacji (z tego samego odczytu)
+    word_length_data = metrics_data["avg_word_length"]["data"]
     
     for version in versions:
         ld_values = []
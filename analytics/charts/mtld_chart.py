@@ -25,7 +25,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from common import (
-    load_aggregated_data, aggregate_by_version, calculate_stats,
+    load_metrics_data, aggregate_by_version, calculate_stats,
     setup_polish_matplotlib, save_chart, get_ordered_versions,
     VERSION_LABELS, VERSION_COLORS
 )
@@ -36,8 +36,9 @@ def create_mtld_charts():
     plt = setup_polish_matplotlib()
     import seaborn as sns
     
-    # Wczytaj dane
-    raw_data = load_aggregated_data("mtld")["data"]
+    # Wczytaj dane (MTLD i word_count jednym odczytem)
+    metrics_data = load_metrics_data(["mtld", "word_count"])
+    raw_data = metrics_data["mtld"]["data"]
     
     # Agreguj według wersji
     mtld_tokens_by_version = aggregate_by_version(raw_data, "mtld_tokens")
@@ -210,8 +211,8 @@ def create_mtld_charts():
     # ===== WYKRES 5: MTLD vs długość tekstu (z word_count) =====
     fig5, ax5 = plt.subplots(figsize=(10, 8))
     
-    # Wczytaj też word_count
-    word_count_data = load_aggregated_data("word_count")["data"]
+    # word_count z tego samego odczytu
+    word_count_data = metrics_data["word_count"]["data"]
     
     for version in versions:
         mtld_values = []
@@ -21,7 +21,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from common import (
-    load_aggregated_data, aggregate_by_version, calculate_stats,
+    load_metrics_data, aggregate_by_version, calculate_stats,
     setup_polish_matplotlib, save_chart, get_ordered_versions,
     VERSION_LABELS, VERSION_COLORS
 )
@@ -33,8 +33,9 @@ def create_structure_charts():
     import seaborn as sns
     
     # Wczytaj dane
-    sentence_data = load_aggregated_data("sentence_count")["data"]
-    paragraph_data = load_aggregated_data("paragraph_count")["data"]
+    metrics_data = load_metrics_data(["sentence_count", "paragraph_count"])
+    sentence_data = metrics_data["sentence_count"]["data"]
+    paragraph_data = metrics_data["paragraph_count"]["data"]
     
     # Agreguj według wersji
     sentences_by_version = aggregate_by_version(sentence_data)
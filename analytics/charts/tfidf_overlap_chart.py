@@ -25,7 +25,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from common import (
-    load_aggregated_data, aggregate_pairs, calculate_stats,
+    load_metrics_data, aggregate_pairs, calculate_stats,
     setup_polish_matplotlib, save_chart, get_ordered_pairs,
     PAIR_LABELS, PAIR_COLORS
 )
@@ -36,8 +36,9 @@ def create_tfidf_charts():
     plt = setup_polish_matplotlib()
     import seaborn as sns
     
-    # Wczytaj dane
-    raw_data = load_aggregated_data("tfidf_overlap")["data"]
+    # Wczytaj dane (TF-IDF i Jaccard jednym odczytem)
+    metrics_data = load_metrics_data(["tfidf_overlap", "jaccard_similarity"])
+    raw_data = metrics_data["tfidf_overlap"]["data"]
     
     # Agreguj według par
     by_pair = aggregate_pairs(raw_data)
@@ -167,8 +168,8 @@ def create_tfidf_charts():
     # ===== WYKRES 4: Porównanie z Jaccarda =====
     fig4, ax4 = plt.subplots(figsize=(12, 6))
     
-    # Wczytaj też Jaccard
-    jaccard_data = load_aggregated_data("jaccard_similarity")["data"]
+    # Jaccard z tego samego odczytu
+    jaccard_data = metrics_data["jaccard_similarity"]["data"]
     jaccard_by_pair = aggregate_pairs(jaccard_data)
     
     x = np.arange(len(pairs))
@@ -2,59 +2,210 @@
 common.py - Wspólne narzędzia do analizy NLP artykułów
 
 Ten moduł zawiera:
-- Funkcje do wczytywania artykułów z data/articles/
+- Funkcje do wczytywania artykułów z data/articles/ (lub ze spakowanego
+  korpusu wskazanego przez ANALYTICS_CORPUS_PACK, corpus_pack.py)
 - Funkcje do zapisywania wyników do output/
-- Helpery do tokenizacji i przetwarzania tekstu polskiego
+- Helpery do przetwarzania tekstu polskiego (liczenie sylab)
 - Ładowanie modelu spaCy dla języka polskiego
 """
 
+import atexit
 import json
+import multiprocessing
 import os
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from functools import partial
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Generator
+from typing import Any, Generator, Sequence
 
+import numpy as np
 import spacy
 
-# Ścieżki bazowe
+from corpus_pack import PackedCorpus
+
+# Ścieżki bazowe (można nadpisać zmiennymi środowiskowymi, np. w benchmarkach)
 BASE_DIR = Path(__file__).parent.parent
-ARTICLES_DIR = BASE_DIR / "data" / "articles"
-OUTPUT_DIR = Path(__file__).parent / "output"
+ARTICLES_DIR = Path(os.environ.get("ANALYTICS_ARTICLES_DIR", BASE_DIR / "data" / "articles"))
+OUTPUT_DIR = Path(os.environ.get("ANALYTICS_OUTPUT_DIR", Path(__file__).parent / "output"))
+SOURCE_ARTICLES_DIR = Path(os.environ.get("ANALYTICS_SOURCE_ARTICLES_DIR", BASE_DIR / "data" / "source-articles"))
+GENERATION_LOGS_DIR = Path(os.environ.get("ANALYTICS_GENERATION_LOGS_DIR", BASE_DIR / "data" / "generation-logs"))
+
+# Spakowany korpus artykułów (pack_corpus.py); gdy ustawiony, artykuły
+# są czytane z niego zamiast z ARTICLES_DIR
+CORPUS_PACK_PATH = Path(os.environ["ANALYTICS_CORPUS_PACK"]) if os.environ.get("ANALYTICS_CORPUS_PACK") else None
 
 # Wersje artykułów
 VERSIONS = ["adult_full", "adult_short", "child_short"]
 
+# Samogłoski polskie (podstawa przybliżonego liczenia sylab)
+POLISH_VOWELS = frozenset("aąeęioóuy")
+
+# Kody Unicode samogłosek (wsadowe liczenie sylab)
+_VOWEL_CODES = np.array(sorted(ord(char) for char in POLISH_VOWELS), dtype=np.uint32)
+
+# Liczba słów zapamiętywanych przez count_syllables_polish
+SYLLABLE_CACHE_SIZE = 65536
+
+# Modele spaCy w kolejności preferencji
+SPACY_MODELS = ["pl_core_news_sm", "pl_core_news_lg"]
+
+# Komponenty potoku spaCy potrzebne dla poszczególnych widoków dokumentu
+# (tokenizer działa zawsze, więc "tokens" nie wymaga żadnego komponentu)
+PIPELINE_REQUIREMENTS = {
+    "tokens": [],
+    "sentences": ["tok2vec", "parser"],
+    "pos": ["tok2vec", "morphologizer", "tagger", "attribute_ruler"],
+    "lemmas": ["tok2vec", "morphologizer", "tagger", "attribute_ruler", "lemmatizer"],
+}
+
 # Cache dla modelu spaCy
 _nlp_model = None
 
+# Otwarty spakowany korpus (dziedziczony przez procesy robocze przy fork)
+_packed_corpus: PackedCorpus | None = None
+
+# Komponenty włączone w modelu zaraz po załadowaniu
+_default_pipes: list[str] = []
+
+# Wymagane widoki dokumentu (None = pełny potok modelu)
+_pipeline_requirements: frozenset[str] | None = None
+
 
 def get_nlp():
     """
     Zwraca załadowany model spaCy dla języka polskiego.
     Model jest cache'owany dla wydajności.
+    
+    Jeśli ustawiono wymagania (set_pipeline_requirements), komponenty
+    niepotrzebne do wymaganych widoków są wyłączone i nie są uruchamiane.
     """
-    global _nlp_model
+    global _nlp_model, _default_pipes
     if _nlp_model is None:
-        try:
-            _nlp_model = spacy.load("pl_core_news_sm")
-        except OSError:
-            print("Model pl_core_news_sm nie znaleziony, próbuję pl_core_news_lg...")
+        for model_name in SPACY_MODELS:
             try:
-                _nlp_model = spacy.load("pl_core_news_lg")
+                _nlp_model = spacy.load(model_name)
+                break
             except OSError:
-                raise RuntimeError(
-                    "Brak modelu spaCy dla polskiego. Zainstaluj: "
-                    "python -m spacy download pl_core_news_sm"
-                )
+                print(f"Model {model_name} nie znaleziony...")
+        else:
+            raise RuntimeError(
+                "Brak modelu spaCy dla polskiego. Zainstaluj: "
+                "python -m spacy download pl_core_news_sm"
+            )
+        _default_pipes = list(_nlp_model.pipe_names)
+        _apply_pipeline_requirements(_nlp_model)
     return _nlp_model
 
 
+def get_pipeline_components() -> list[str] | None:
+    """
+    Zwraca nazwy komponentów spaCy potrzebnych dla ustawionych wymagań.
+    
+    Returns:
+        Posortowana lista komponentów lub None (pełny potok modelu)
+    """
+    if _pipeline_requirements is None:
+        return None
+    
+    return sorted({
+        component
+        for requirement in _pipeline_requirements
+        for component in PIPELINE_REQUIREMENTS[requirement]
+    })
+
+
+def get_pipeline_requirements() -> frozenset[str] | None:
+    """Zwraca aktualnie wymagane widoki dokumentu (None = pełny potok)."""
+    return _pipeline_requirements
+
+
+def set_pipeline_requirements(requirements: set[str] | frozenset[str] | None) -> None:
+    """
+    Ustawia widoki dokumentu wymagane przez liczone metryki.
+    
+    Model uruchamia wtedy tylko komponenty potrzebne do tych widoków
+    (np. dla samego "tokens" - sam tokenizer, bez taggera, parsera i NER).
+    
+    Args:
+        requirements: Podzbiór kluczy PIPELINE_REQUIREMENTS
+            lub None (pełny potok modelu)
+    """
+    global _pipeline_requirements
+    
+    if requirements is not None:
+        unknown = set(requirements) - set(PIPELINE_REQUIREMENTS)
+        if unknown:
+            raise ValueError(f"Nieznane wymagania potoku: {', '.join(sorted(unknown))}")
+        requirements = frozenset(requirements)
+    
+    _pipeline_requirements = requirements
+    
+    if _nlp_model is not None:
+        _apply_pipeline_requirements(_nlp_model)
+
+
+def _apply_pipeline_requirements(nlp) -> None:
+    """Włącza/wyłącza komponenty modelu zgodnie z wymaganiami."""
+    components = get_pipeline_components()
+    
+    for name in _default_pipes:
+        enabled = components is None or name in components
+        if enabled and name in nlp.disabled:
+            nlp.enable_pipe(name)
+        elif not enabled and name not in nlp.disabled:
+            nlp.disable_pipe(name)
+
+
+def get_model_info() -> tuple[str, str]:
+    """
+    Zwraca nazwę i wersję modelu spaCy, którego użyłby get_nlp().
+    
+    Jeśli model nie jest jeszcze załadowany, informacje są odczytywane
+    z metadanych zainstalowanego pakietu - bez ładowania modelu.
+    
+    Returns:
+        Tuple (nazwa_modelu, wersja_modelu)
+    """
+    if _nlp_model is not None:
+        meta = _nlp_model.meta
+        return f"{meta['lang']}_{meta['name']}", meta["version"]
+    
+    for model_name in SPACY_MODELS:
+        if spacy.util.is_package(model_name):
+            return model_name, spacy.util.get_package_version(model_name)
+    
+    raise RuntimeError(
+        "Brak modelu spaCy dla polskiego. Zainstaluj: "
+        "python -m spacy download pl_core_news_sm"
+    )
+
+
+def get_packed_corpus() -> PackedCorpus | None:
+    """
+    Zwraca spakowany korpus z CORPUS_PACK_PATH (otwierany raz na proces)
+    albo None, gdy artykuły są czytane z katalogów.
+    """
+    global _packed_corpus
+    
+    if CORPUS_PACK_PATH is None:
+        return None
+    
+    if _packed_corpus is None:
+        _packed_corpus = PackedCorpus(CORPUS_PACK_PATH)
+    
+    return _packed_corpus
+
+
 def list_articles() -> list[str]:
     """
-    Zwraca listę nazw artykułów (nazwy folderów w data/articles/).
+    Zwraca listę nazw artykułów (nazwy folderów w data/articles/
+    albo artykuły spakowanego korpusu).
     """
+    corpus = get_packed_corpus()
+    if corpus is not None:
+        return list(corpus.articles)
+    
     if not ARTICLES_DIR.exists():
         raise FileNotFoundError(f"Folder artykułów nie istnieje: {ARTICLES_DIR}")
     
@@ -75,6 +226,10 @@ def load_article(article_name: str, version: str) -> dict:
     Returns:
         Słownik z danymi artykułu (placeId, style, ageTarget, volume, title, content)
     """
+    corpus = get_packed_corpus()
+    if corpus is not None:
+        return corpus.load(article_name, version)
+    
     file_path = ARTICLES_DIR / article_name / f"{version}.json"
     
     if not file_path.exists():
@@ -100,12 +255,25 @@ def load_all_articles() -> Generator[tuple[str, str, dict], None, None]:
                 print(f"Pominięto brakujący plik: {article_name}/{version}.json")
 
 
-def get_article_content(article_name: str, version: str) -> str:
+def load_source_contents(article_name: str) -> list[str]:
     """
-    Zwraca samą treść artykułu (pole content).
+    Wczytuje treści artykułów źródłowych miejsca (data/source-articles/<artykuł>.json).
+    
+    Args:
+        article_name: Nazwa artykułu (placeId)
+    
+    Returns:
+        Lista treści źródeł (pusta, jeśli brak pliku)
     """
-    data = load_article(article_name, version)
-    return data.get("content", "")
+    file_path = SOURCE_ARTICLES_DIR / f"{article_name}.json"
+    
+    if not file_path.exists():
+        return []
+    
+    with open(file_path, "r", encoding="utf-8") as f:
+        sources = json.load(f)
+    
+    return [source.get("content", "") for source in sources if source.get("content")]
 
 
 def save_metric_result(
@@ -113,7 +281,8 @@ def save_metric_result(
     article_name: str,
     version: str,
     value: Any,
-    extra_data: dict | None = None
+    extra_data: dict | None = None,
+    output_dir: Path | None = None
 ) -> Path:
     """
     Zapisuje wynik metryki do pliku JSON.
@@ -124,11 +293,12 @@ def save_metric_result(
         version: Wersja artykułu
         value: Wartość metryki
         extra_data: Dodatkowe dane do zapisania
+        output_dir: Katalog wyników (None = OUTPUT_DIR)
     
     Returns:
         Ścieżka do zapisanego pliku
     """
-    output_dir = OUTPUT_DIR / metric_name
+    output_dir = (output_dir or OUTPUT_DIR) / metric_name
     output_dir.mkdir(parents=True, exist_ok=True)
     
     result = {
@@ -271,83 +441,12 @@ def save_aggregated_comparison_metric(
     return file_path
 
 
-def get_tokens(text: str, lowercase: bool = True) -> list[str]:
-    """
-    Tokenizuje tekst używając spaCy.
-    Zwraca tylko tokeny alfabetyczne (bez cyfr, interpunkcji).
-    
-    Args:
-        text: Tekst do tokenizacji
-        lowercase: Czy zamienić na małe litery
-    
-    Returns:
-        Lista tokenów
-    """
-    nlp = get_nlp()
-    doc = nlp(text)
-    
-    tokens = [
-        token.text.lower() if lowercase else token.text
-        for token in doc
-        if token.is_alpha
-    ]
-    
-    return tokens
-
-
-def get_lemmas(text: str, lowercase: bool = True) -> list[str]:
-    """
-    Zwraca lematy (formy podstawowe) słów z tekstu.
-    
-    Args:
-        text: Tekst do przetworzenia
-        lowercase: Czy zamienić na małe litery
-    
-    Returns:
-        Lista lematów
-    """
-    nlp = get_nlp()
-    doc = nlp(text)
-    
-    lemmas = [
-        token.lemma_.lower() if lowercase else token.lemma_
-        for token in doc
-        if token.is_alpha
-    ]
-    
-    return lemmas
-
-
-def get_sentences(text: str) -> list[str]:
-    """
-    Dzieli tekst na zdania używając spaCy.
-    
-    Args:
-        text: Tekst do podziału
-    
-    Returns:
-        Lista zdań
-    """
-    nlp = get_nlp()
-    doc = nlp(text)
-    
-    return [sent.text.strip() for sent in doc.sents if sent.text.strip()]
-
-
-def get_words_in_sentence(sentence: str) -> list[str]:
-    """
-    Zwraca słowa (tokeny alfabetyczne) z pojedynczego zdania.
-    """
-    nlp = get_nlp()
-    doc = nlp(sentence)
-    
-    return [token.text for token in doc if token.is_alpha]
-
-
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
 def count_syllables_polish(word: str) -> int:
     """
     Przybliżone liczenie sylab w słowie polskim.
     Bazuje na liczbie samogłosek (a, ą, e, ę, i, o, ó, u, y).
+    Wyniki są zapamiętywane dla ostatnio liczonych słów.
     
     Args:
         word: Słowo do analizy
@@ -355,242 +454,115 @@ def count_syllables_polish(word: str) -> int:
     Returns:
         Przybliżona liczba sylab
     """
-    vowels = set("aąeęioóuy")
-    word_lower = word.lower()
-    
-    count = sum(1 for char in word_lower if char in vowels)
+    count = sum(1 for char in word.lower() if char in POLISH_VOWELS)
     
     # Minimum 1 sylaba dla każdego słowa
     return max(1, count)
 
 
-def get_content_words(text: str) -> list[str]:
+def count_syllables_batch(words: Sequence[str]) -> np.ndarray:
     """
-    Zwraca słowa treściowe (rzeczowniki, czasowniki, przymiotniki, przysłówki).
-    Używane do obliczania lexical density.
+    Liczy sylaby wielu słów naraz (wynik jak count_syllables_polish).
+    
+    Słowa są łączone w jeden napis, a samogłoski wyznaczane na tablicy
+    kodów znaków (UTF-32) - liczba sylab słowa to różnica sum
+    skumulowanych na jego granicach.
     
     Args:
-        text: Tekst do analizy
+        words: Słowa do analizy
     
     Returns:
-        Lista słów treściowych
+        Tablica int32 liczby sylab (minimum 1 dla każdego słowa)
     """
-    nlp = get_nlp()
-    doc = nlp(text)
+    if not words:
+        return np.zeros(0, dtype=np.int32)
     
-    # POS tags dla słów treściowych
-    content_pos = {"NOUN", "VERB", "ADJ", "ADV"}
+    lowered = [word.lower() for word in words]
+    ends = np.cumsum(np.fromiter(map(len, lowered), dtype=np.int64, count=len(lowered)))
     
-    return [
-        token.text.lower()
-        for token in doc
-        if token.is_alpha and token.pos_ in content_pos
-    ]
+    codes = np.frombuffer("".join(lowered).encode("utf-32-le"), dtype=np.uint32)
+    vowel_counts = np.concatenate([[0], np.cumsum(np.isin(codes, _VOWEL_CODES))])
+    counts = vowel_counts[ends] - vowel_counts[np.concatenate([[0], ends[:-1]])]
+    
+    # Minimum 1 sylaba dla każdego słowa
+    return np.maximum(counts, 1).astype(np.int32)
 
 
-def _process_single_article(
-    article_name: str,
-    version: str,
-    metric_name: str,
-    calculate_func: Callable[[str], Any],
-    extra_data_func: Callable[[str], dict] | None = None
-) -> tuple[str, str, Any, dict | None]:
+# Współdzielona pula procesów (jedna na proces nadrzędny)
+_executor = None
+_executor_config = None
+
+
+def _init_worker(
+    preload_model: bool,
+    requirements: frozenset[str] | None = None
+) -> None:
     """
-    Funkcja pomocnicza do przetwarzania pojedynczego artykułu.
-    Używana w równoległym przetwarzaniu - musi być na poziomie modułu.
-    
-    Args:
-        article_name: Nazwa artykułu
-        version: Wersja artykułu
-        metric_name: Nazwa metryki
-        calculate_func: Funkcja obliczająca metrykę (tekst -> wartość)
-        extra_data_func: Opcjonalna funkcja zwracająca dodatkowe dane
-    
-    Returns:
-        Tuple (article_name, version, value, extra_data)
+    Inicjalizuje proces roboczy puli.
+    Ustawia wymagania potoku i ładuje model spaCy raz na proces, zanim
+    trafi do niego pierwsze zadanie. Przy starcie przez fork model
+    odziedziczony z procesu nadrzędnego jest już załadowany
+    i get_nlp() nic nie robi.
     """
-    try:
-        data = load_article(article_name, version)
-        content = data.get("content", "")
-        
-        value = calculate_func(content)
-        
-        extra_data = None
-        if extra_data_func:
-            extra_data = extra_data_func(content)
-        
-        save_metric_result(
-            metric_name=metric_name,
-            article_name=article_name,
-            version=version,
-            value=value,
-            extra_data=extra_data
-        )
-        
-        return (article_name, version, value, extra_data)
-    except FileNotFoundError:
-        return (article_name, version, None, None)
+    set_pipeline_requirements(requirements)
+    if preload_model:
+        get_nlp()
 
 
-def process_articles_parallel(
-    metric_name: str,
-    calculate_func: Callable[[str], Any],
-    extra_data_func: Callable[[str], dict] | None = None,
-    max_workers: int | None = None
-) -> dict[str, dict[str, Any]]:
+def get_executor(
+    max_workers: int | None = None,
+    preload_model: bool = True
+) -> ProcessPoolExecutor:
     """
-    Przetwarza wszystkie artykuły równolegle używając wielu procesów.
+    Zwraca długo żyjącą pulę procesów współdzieloną przez wszystkie metryki.
+    
+    Pula jest tworzona przy pierwszym wywołaniu i używana ponownie przez
+    kolejne metryki, więc model spaCy ładowany jest raz na proces roboczy,
+    a nie raz na metrykę. Przy starcie przez fork model ładowany jest
+    w procesie nadrzędnym przed utworzeniem puli, a procesy robocze
+    dziedziczą go (copy-on-write). Zmiana liczby procesów lub wymagań
+    potoku (set_pipeline_requirements) tworzy pulę od nowa.
     
     Args:
-        metric_name: Nazwa metryki (np. "word_count")
-        calculate_func: Funkcja obliczająca metrykę dla tekstu (tekst -> wartość)
-        extra_data_func: Opcjonalna funkcja zwracająca dodatkowe dane dla każdego artykułu
         max_workers: Liczba procesów (None = liczba CPU)
+        preload_model: Czy załadować model spaCy przed pierwszym zadaniem
+            (False, gdy metryki go nie potrzebują lub parsowania są w cache)
     
     Returns:
-        Słownik {article_name: {version: value}} z wynikami
+        Współdzielona pula procesów
     """
-    articles = list_articles()
+    global _executor, _executor_config
     
-    print(f"Przetwarzanie {len(articles)} artykułów (równolegle, {max_workers or 'auto'} procesów)...")
+    config = (max_workers, _pipeline_requirements)
     
-    # Przygotuj listę zadań
-    tasks = []
-    for article_name in articles:
-        for version in VERSIONS:
-            tasks.append((article_name, version))
-    
-    aggregated = {article_name: {} for article_name in articles}
-    
-    # Przetwarzaj równolegle
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Utwórz funkcję częściową z parametrami
-        process_func = partial(
-            _process_single_article,
-            metric_name=metric_name,
-            calculate_func=calculate_func,
-            extra_data_func=extra_data_func
-        )
-        
-        # Wyślij wszystkie zadania
-        future_to_task = {
-            executor.submit(process_func, article_name, version): (article_name, version)
-            for article_name, version in tasks
-        }
-        
-        # Zbierz wyniki
-        completed = 0
-        for future in as_completed(future_to_task):
-            article_name, version = future_to_task[future]
-            try:
-                result_article, result_version, value, extra_data = future.result()
-                
-                if value is not None:
-                    aggregated[result_article][result_version] = value
-                    # Formatuj wartość dla wyświetlenia
-                    if isinstance(value, dict):
-                        value_str = ", ".join(f"{k}={v}" for k, v in value.items())
-                        print(f"  {result_article}/{result_version}: {value_str}")
-                    else:
-                        print(f"  {result_article}/{result_version}: {value}")
-                else:
-                    print(f"  POMINIĘTO: {article_name}/{version} (brak pliku)")
-                
-                completed += 1
-            except Exception as e:
-                print(f"  BŁĄD: {article_name}/{version}: {e}")
-                completed += 1
-    
-    return aggregated
-
-
-def _process_comparison_article(
-    article_name: str,
-    metric_name: str,
-    process_func: Callable[[str], dict]
-) -> tuple[str, dict | None]:
-    """
-    Funkcja pomocnicza do przetwarzania pojedynczego artykułu dla metryk porównawczych.
-    Używana w równoległym przetwarzaniu - musi być na poziomie modułu.
+    if _executor is not None and _executor_config != config:
+        shutdown_executor()
     
-    Args:
-        article_name: Nazwa artykułu
-        metric_name: Nazwa metryki
-        process_func: Funkcja przetwarzająca artykuł (article_name -> comparisons dict)
+    if _executor is None:
+        if preload_model and multiprocessing.get_start_method() == "fork":
+            get_nlp()
+        
+        _executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(preload_model, _pipeline_requirements)
+        )
+        _executor_config = config
     
-    Returns:
-        Tuple (article_name, comparisons dict lub None)
-    """
-    try:
-        comparisons = process_func(article_name)
-        if comparisons:
-            # Funkcja process_func powinna sama zapisać wyniki
-            return (article_name, comparisons)
-        return (article_name, None)
-    except Exception as e:
-        print(f"  BŁĄD w {article_name}: {e}")
-        return (article_name, None)
+    return _executor
 
 
-def process_comparison_articles_parallel(
-    metric_name: str,
-    process_article_func: Callable[[str], dict],
-    max_workers: int | None = None
-) -> dict[str, dict[str, Any]]:
-    """
-    Przetwarza wszystkie artykuły równolegle dla metryk porównawczych.
-    
-    Args:
-        metric_name: Nazwa metryki (np. "jaccard_similarity")
-        process_article_func: Funkcja przetwarzająca pojedynczy artykuł
-            (article_name -> comparisons dict)
-        max_workers: Liczba procesów (None = liczba CPU)
+def shutdown_executor() -> None:
+    """Zamyka współdzieloną pulę procesów."""
+    global _executor, _executor_config
     
-    Returns:
-        Słownik {article_name: comparisons} z wynikami
-    """
-    articles = list_articles()
-    
-    print(f"Przetwarzanie {len(articles)} artykułów (równolegle, {max_workers or 'auto'} procesów)...")
-    
-    aggregated = {}
-    
-    # Przetwarzaj równolegle
-    with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Utwórz funkcję częściową z parametrami
-        process_func = partial(
-            _process_comparison_article,
-            metric_name=metric_name,
-            process_func=process_article_func
-        )
-        
-        # Wyślij wszystkie zadania
-        future_to_article = {
-            executor.submit(process_func, article_name): article_name
-            for article_name in articles
-        }
-        
-        # Zbierz wyniki
-        for future in as_completed(future_to_article):
-            article_name = future_to_article[future]
-            try:
-                result_article, comparisons = future.result()
-                
-                if comparisons is not None:
-                    aggregated[result_article] = comparisons
-                    print(f"  {result_article}:")
-                    for key, val in comparisons.items():
-                        if isinstance(val, float):
-                            print(f"    {key}: {val}")
-                        else:
-                            print(f"    {key}: {val}")
-                else:
-                    print(f"  POMINIĘTO: {article_name}")
-                    
-            except Exception as e:
-                print(f"  BŁĄD: {article_name}: {e}")
-    
-    return aggregated
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+        _executor_config = None
+
+
+atexit.register(shutdown_executor)
 
 
 if __name__ == "__main__":
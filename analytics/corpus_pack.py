@@ -0,0 +1,233 @@
+"""
+corpus_pack.py - Korpus artykułów w jednym indeksowanym pliku (mmap)
+
+Zamiast iterdir + osobnego open/json.load dla każdej pary (artykuł,
+wersja) korpus data/articles/** można spakować (pack_corpus.py) do
+jednego pliku binarnego:
+
+    magic "ANCORP01" (8 B)
+    długość nagłówka (uint64 LE)
+    nagłówek JSON (UTF-8): wersje, artykuły, metadane dokumentów
+        (wszystkie pola JSON artykułu poza content)
+    wyrównanie do 8 B
+    tablica offsetów: uint64 LE [artykuł][wersja][offset, długość]
+        (brak dokumentu = długość MISSING)
+    treści content (UTF-8, jedna za drugą)
+
+PackedCorpus mapuje plik w pamięć (mmap): tablica offsetów jest
+widokiem numpy na mapowanie, a dostęp do treści (artykuł, wersja) to
+odczyt jednego wiersza tablicy - O(1), bez listowania katalogów
+i parsowania JSON. content_view() zwraca memoryview na bajty treści
+(bez kopiowania); content() dekoduje je do napisu.
+
+Obiekt PackedCorpus jest serializowany (pickle) jako sama ścieżka, więc
+procesy robocze otwierają ten sam plik (strony dzielone przez cache
+systemu), zamiast dostawać kopie treści.
+
+Moduł nie importuje common.py - korzysta z niego common (zmienna
+ANALYTICS_CORPUS_PACK). Plik trzeba zbudować ponownie po zmianie
+artykułów (python pack_corpus.py).
+
+Użycie:
+    corpus = PackedCorpus(path)
+    corpus.articles                                 # lista artykułów
+    corpus.content("palac_trybunalski_w_kaliszu", "adult_full")
+    corpus.load("palac_trybunalski_w_kaliszu", "child_short")   # jak load_article
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+# Sygnatura formatu (zmiana formatu = nowa sygnatura)
+MAGIC = b"ANCORP01"
+
+# Format długości nagłówka
+HEADER_LENGTH_FORMAT = "<Q"
+
+# Długość oznaczająca brak dokumentu w tablicy offsetów
+MISSING = np.iinfo(np.uint64).max
+
+# Typ elementów tablicy offsetów
+OFFSET_DTYPE = np.dtype("<u8")
+
+
+def _aligned(position: int, alignment: int = 8) -> int:
+    return (position + alignment - 1) // alignment * alignment
+
+
+def write_pack(
+    path: Path,
+    articles: list[str],
+    versions: list[str],
+    documents: Iterable[tuple[str, str, dict]]
+) -> dict:
+    """
+    Zapisuje korpus do pliku (przez plik tymczasowy i rename).
+
+    Args:
+        path: Ścieżka pliku korpusu
+        articles: Nazwy artykułów (kolejność w pliku)
+        versions: Wersje artykułów
+        documents: Dokumenty (artykuł, wersja, dane JSON artykułu)
+
+    Returns:
+        Statystyki {"articles", "documents", "content_bytes", "file_bytes"}
+    """
+    article_index = {name: index for index, name in enumerate(articles)}
+    version_index = {version: index for index, version in enumerate(versions)}
+
+    offsets = np.zeros((len(articles), len(versions), 2), dtype=OFFSET_DTYPE)
+    offsets[:, :, 1] = MISSING
+    metadata = {}
+    contents = []
+    content_bytes = 0
+
+    for article_name, version, data in documents:
+        data = dict(data)
+        encoded = data.pop("content", "").encode("utf-8")
+
+        offsets[article_index[article_name], version_index[version]] = (content_bytes, len(encoded))
+        metadata.setdefault(article_name, {})[version] = data
+        contents.append(encoded)
+        content_bytes += len(encoded)
+
+    header = json.dumps(
+        {"versions": versions, "articles": articles, "metadata": metadata},
+        ensure_ascii=False
+    ).encode("utf-8")
+
+    # Offsety treści są względne - przesunięcie o początek sekcji treści
+    table_start = _aligned(len(MAGIC) + struct.calcsize(HEADER_LENGTH_FORMAT) + len(header))
+    data_start = table_start + offsets.nbytes
+    present = offsets[:, :, 1] != MISSING
+    offsets[:, :, 0][present] += np.uint64(data_start)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack(HEADER_LENGTH_FORMAT, len(header)))
+        f.write(header)
+        f.write(b"\0" * (table_start - f.tell()))
+        f.write(offsets.tobytes())
+        for encoded in contents:
+            f.write(encoded)
+        file_bytes = f.tell()
+
+    os.replace(tmp_path, path)
+
+    return {
+        "articles": len(articles),
+        "documents": len(contents),
+        "content_bytes": content_bytes,
+        "file_bytes": file_bytes,
+    }
+
+
+class PackedCorpus:
+    """
+    Korpus z pliku zapisanego przez write_pack, mapowany w pamięć.
+
+    Attributes:
+        path: Ścieżka pliku
+        articles: Nazwy artykułów (kolejność z pliku)
+        versions: Wersje artykułów
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Nieprawidłowy plik korpusu: {self.path}")
+
+        position = len(MAGIC)
+        (header_length,) = struct.unpack_from(HEADER_LENGTH_FORMAT, self._mmap, position)
+        position += struct.calcsize(HEADER_LENGTH_FORMAT)
+        header = json.loads(self._mmap[position:position + header_length])
+
+        self.articles = header["articles"]
+        self.versions = header["versions"]
+        self._metadata = header["metadata"]
+        self._article_index = {name: index for index, name in enumerate(self.articles)}
+        self._version_index = {version: index for index, version in enumerate(self.versions)}
+
+        # Widok na mapowanie - tablica nie jest kopiowana do pamięci procesu
+        self._offsets = np.frombuffer(
+            self._mmap,
+            dtype=OFFSET_DTYPE,
+            count=len(self.articles) * len(self.versions) * 2,
+            offset=_aligned(position + header_length)
+        ).reshape(len(self.articles), len(self.versions), 2)
+
+    def __reduce__(self):
+        # Procesy robocze otwierają plik ponownie zamiast kopiować mapowanie
+        return (PackedCorpus, (self.path,))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._offsets[:, :, 1] != MISSING))
+
+    def _locate(self, article_name: str, version: str) -> tuple[int, int]:
+        article = self._article_index.get(article_name)
+        version_position = self._version_index.get(version)
+
+        if article is not None and version_position is not None:
+            offset, length = self._offsets[article, version_position]
+            if length != MISSING:
+                return int(offset), int(length)
+
+        raise FileNotFoundError(f"Artykuł nie istnieje w korpusie {self.path}: {article_name}/{version}")
+
+    def has(self, article_name: str, version: str) -> bool:
+        """Czy korpus zawiera dokument."""
+        try:
+            self._locate(article_name, version)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def content_length(self, article_name: str, version: str) -> int:
+        """Długość treści w bajtach (0, gdy dokumentu nie ma w korpusie)."""
+        try:
+            return self._locate(article_name, version)[1]
+        except FileNotFoundError:
+            return 0
+
+    def content_view(self, article_name: str, version: str) -> memoryview:
+        """
+        Bajty treści (UTF-8) jako widok na mapowanie, bez kopiowania.
+
+        Raises:
+            FileNotFoundError: Gdy dokumentu nie ma w korpusie
+        """
+        offset, length = self._locate(article_name, version)
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def content(self, article_name: str, version: str) -> str:
+        """Treść dokumentu (pole content)."""
+        return str(self.content_view(article_name, version), "utf-8")
+
+    def load(self, article_name: str, version: str) -> dict:
+        """
+        Dane dokumentu w kształcie pliku JSON artykułu (jak load_article).
+
+        Raises:
+            FileNotFoundError: Gdy dokumentu nie ma w korpusie
+        """
+        content = self.content(article_name, version)
+        return {**self._metadata[article_name][version], "content": content}
+
+    def close(self) -> None:
+        """Zamyka mapowanie (widoki treści przestają być ważne)."""
+        self._offsets = None
+        self._mmap.close()
@@ -0,0 +1,217 @@
+"""
+document.py - Współdzielona warstwa sparsowanych dokumentów
+
+Ten moduł zawiera:
+- Klasę ParsedDocument - jeden wynik nlp() na artykuł/wersję, z leniwie
+  liczonymi widokami (tokeny, lematy, zdania, POS, sylaby)
+  przechowywanymi jako identyfikatory wspólnego słownika (vocabulary.py)
+- Funkcję get_document() cache'ującą dokumenty w obrębie procesu
+- Funkcję register_document() do wstawiania dokumentów sparsowanych
+  wsadowo (nlp.pipe) do cache procesu
+
+Wszystkie metryki korzystają z get_document(), dzięki czemu ten sam tekst
+jest parsowany przez spaCy tylko raz, niezależnie od tego ile metryk
+(i ile wywołań w ramach jednej metryki) z niego korzysta. Sparsowane
+dokumenty trafiają też do trwałego cache (parse_cache.py), więc między
+uruchomieniami parsowane są tylko zmienione treści.
+"""
+
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+
+from common import get_nlp
+from parse_cache import load_cached_doc, store_cached_doc
+from vocabulary import CompactDocument, get_vocabulary
+
+# Liczba dokumentów trzymanych w cache procesu
+DOCUMENT_CACHE_SIZE = 64
+
+# POS tags dla słów treściowych
+CONTENT_POS = {"NOUN", "VERB", "ADJ", "ADV"}
+
+
+class ParsedDocument:
+    """
+    Tekst sparsowany jednokrotnie przez spaCy.
+
+    Widoki (tokens, lemmas, sentences, ...) są liczone przy pierwszym
+    dostępie i zapamiętywane. Wszystkie widoki tokenowe dotyczą wyłącznie
+    tokenów alfabetycznych (bez cyfr, interpunkcji) i są wyrównane
+    względem siebie - i-ty element tokens, lemmas, pos i syllables
+    opisuje to samo słowo.
+
+    Widoki tokenowe są przechowywane jako identyfikatory słownika procesu
+    (token_ids, lemma_ids, ...); listy napisów są z nich dekodowane.
+    Dokument zapamiętuje słownik z chwili utworzenia, więc wymiana
+    słownika procesu (reset_vocabulary) nie psuje istniejących dokumentów.
+    """
+
+    def __init__(self, text: str, doc=None):
+        self.text = text
+        self._doc = doc
+        self.vocabulary = get_vocabulary()
+
+    @property
+    def doc(self):
+        """
+        Obiekt Doc spaCy (parsowany przy pierwszym dostępie).
+
+        Najpierw sprawdzany jest trwały cache parsowania - przy trafieniu
+        model spaCy nie jest ładowany.
+        """
+        if self._doc is None:
+            self._doc = load_cached_doc(self.text)
+        if self._doc is None:
+            nlp = get_nlp()
+            self._doc = nlp(self.text)
+            store_cached_doc(self.text, self._doc)
+        return self._doc
+
+    @cached_property
+    def words(self) -> list:
+        """Tokeny spaCy będące słowami (is_alpha)."""
+        return [token for token in self.doc if token.is_alpha]
+
+    @cached_property
+    def token_ids(self) -> np.ndarray:
+        """Identyfikatory słów zamienionych na małe litery (int32)."""
+        return self.vocabulary.encode((token.text.lower() for token in self.words), len(self.words))
+
+    @cached_property
+    def original_token_ids(self) -> np.ndarray:
+        """Identyfikatory słów w oryginalnej pisowni (int32)."""
+        return self.vocabulary.encode((token.text for token in self.words), len(self.words))
+
+    @cached_property
+    def lemma_ids(self) -> np.ndarray:
+        """Identyfikatory lematów zamienionych na małe litery (int32)."""
+        return self.vocabulary.encode((token.lemma_.lower() for token in self.words), len(self.words))
+
+    @cached_property
+    def pos_ids(self) -> np.ndarray:
+        """Identyfikatory części mowy (UPOS) słów (int32)."""
+        return self.vocabulary.encode((token.pos_ for token in self.words), len(self.words))
+
+    @cached_property
+    def tokens(self) -> list[str]:
+        """Słowa zamienione na małe litery."""
+        return self.vocabulary.decode(self.token_ids)
+
+    @cached_property
+    def tokens_original(self) -> list[str]:
+        """Słowa w oryginalnej pisowni."""
+        return self.vocabulary.decode(self.original_token_ids)
+
+    @cached_property
+    def lemmas(self) -> list[str]:
+        """Lematy słów zamienione na małe litery."""
+        return self.vocabulary.decode(self.lemma_ids)
+
+    @cached_property
+    def pos(self) -> list[str]:
+        """Części mowy (UPOS) słów."""
+        return self.vocabulary.decode(self.pos_ids)
+
+    @cached_property
+    def content_words(self) -> list[str]:
+        """Słowa treściowe (rzeczowniki, czasowniki, przymiotniki, przysłówki)."""
+        return [
+            token
+            for token, pos in zip(self.tokens, self.pos)
+            if pos in CONTENT_POS
+        ]
+
+    @cached_property
+    def sentences(self) -> list[str]:
+        """Niepuste zdania tekstu."""
+        return [self.text[start:end].strip() for start, end in self.sentence_spans.tolist()]
+
+    @cached_property
+    def sentence_spans(self) -> np.ndarray:
+        """
+        Zakresy znaków niepustych zdań w tekście: tablica int64 [zdanie][2]
+        (początek, koniec wyłącznie - jak start_char i end_char spaCy).
+        """
+        spans = [(sent.start_char, sent.end_char) for sent in self.doc.sents if sent.text.strip()]
+        return np.array(spans, dtype=np.int64).reshape(len(spans), 2)
+
+    @cached_property
+    def sentence_offsets(self) -> np.ndarray:
+        """
+        Granice niepustych zdań w indeksach słów: indeks pierwszego słowa
+        każdego zdania i liczba słów na końcu (tablica int32). Słowa przed
+        pierwszym niepustym zdaniem należą do pierwszego zdania.
+        """
+        starts = [sent.start for sent in self.doc.sents if sent.text.strip()]
+        token_indices = np.fromiter((token.i for token in self.words), dtype=np.int64, count=len(self.words))
+
+        offsets = np.searchsorted(token_indices, np.array(starts, dtype=np.int64)).astype(np.int32)
+        if len(offsets):
+            offsets[0] = 0
+        return np.append(offsets, np.int32(len(self.words)))
+
+    @cached_property
+    def syllables(self) -> np.ndarray:
+        """
+        Przybliżona liczba sylab każdego słowa (tablica int32, liczona raz
+        na słowo słownika i współdzielona przez wszystkie wzory czytelności).
+        """
+        return self.vocabulary.syllables(self.token_ids)
+
+    def compact(self) -> CompactDocument:
+        """Widoki tokenowe dokumentu jako tablice NumPy (bez kopiowania)."""
+        return CompactDocument(
+            token_ids=self.token_ids,
+            lemma_ids=self.lemma_ids,
+            pos_ids=self.pos_ids,
+            sentence_offsets=self.sentence_offsets,
+            syllables=self.syllables,
+        )
+
+
+# Cache dokumentów procesu (tekst -> ParsedDocument), najstarsze usuwane pierwsze
+_documents: OrderedDict[str, ParsedDocument] = OrderedDict()
+
+
+def register_document(document: ParsedDocument) -> None:
+    """
+    Wstawia dokument do cache procesu.
+
+    Używane przez silnik wsadowy, który parsuje teksty przez nlp.pipe
+    i przekazuje gotowe dokumenty metrykom.
+
+    Args:
+        document: Sparsowany dokument
+    """
+    _documents[document.text] = document
+    _documents.move_to_end(document.text)
+
+    while len(_documents) > DOCUMENT_CACHE_SIZE:
+        _documents.popitem(last=False)
+
+
+def get_document(text: str) -> ParsedDocument:
+    """
+    Zwraca sparsowany dokument dla tekstu.
+
+    Dokumenty są cache'owane w obrębie procesu, więc kolejne wywołania
+    z tym samym tekstem (np. calculate_func i extra_data_func tej samej
+    metryki albo kilka metryk w jednym przebiegu) nie parsują go ponownie.
+
+    Args:
+        text: Tekst do sparsowania
+
+    Returns:
+        ParsedDocument
+    """
+    document = _documents.get(text)
+
+    if document is None:
+        document = ParsedDocument(text)
+        register_document(document)
+    else:
+        _documents.move_to_end(text)
+
+    return document
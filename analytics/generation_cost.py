@@ -0,0 +1,256 @@
+"""
+generation_cost.py - Koszt i czas generowania artykułów
+
+OPIS METRYKI:
+Analizuje logi generowania (data/generation-logs/<artykuł>/<wersja>.json)
+zapisywane przez scripts/process-articles.ts. Każdy artykuł powstaje
+w sekwencji kroków (generate_outline -> generate_content ->
+format_markdown_and_title), a log zawiera tokeny i czasy całości oraz
+każdego kroku.
+
+MIARY (dla każdej wersji):
+- total_duration_ms, total_input_tokens, total_output_tokens, total_tokens
+- output_tokens_per_s: przepustowość (tokeny wyjściowe / czas całkowity)
+- wall_clock_ms: od startu pierwszego do końca ostatniego kroku
+- steps_duration_ms: suma czasów kroków (ścieżka krytyczna - kroki są
+  zależne, więc wykonują się sekwencyjnie)
+- overhead_ms: czas poza krokami (total_duration_ms - steps_duration_ms)
+- critical_step: krok o najdłuższym czasie
+- <krok>.duration_ms, <krok>.input_tokens, <krok>.output_tokens,
+  <krok>.output_tokens_per_s, <krok>.share (udział w ścieżce krytycznej)
+- model: model użyty do generowania
+
+Metryka jest liczona przez ten sam runner co metryki tekstowe (bez spaCy),
+a wyniki trafiają do manifestu i output/results.parquet. Zmiana logów
+unieważnia wyniki (source_func).
+
+PODSUMOWANIE:
+summarize_results() czyta wyniki z results.parquet i liczy percentyle
+p50/p95/p99 czasu i przepustowości w podziale na krok, styl (wersję)
+i model, zapisując output/generation_cost/summary.json.
+
+Użycie:
+    python generation_cost.py
+"""
+
+import json
+from collections import defaultdict
+
+import numpy as np
+
+from common import OUTPUT_DIR
+from generation_logs import read_article_logs
+from registry import Metric
+from results_store import read_results
+from runner import run_metrics
+from sinks import RESULTS_PATH
+
+# Percentyle w podsumowaniu
+PERCENTILES = (50, 95, 99)
+
+# Miary kroków uwzględniane w podsumowaniu
+STEP_SUMMARY_FIELDS = ["duration_ms", "output_tokens_per_s", "share"]
+
+# Miary całego generowania uwzględniane w podsumowaniu stylów i modeli
+RUN_SUMMARY_FIELDS = ["total_duration_ms", "wall_clock_ms", "overhead_ms", "output_tokens_per_s", "total_tokens"]
+
+
+def _tokens_per_second(tokens: int | None, duration_ms: int | None) -> float:
+    """Tokeny na sekundę (0.0 dla brakującego lub zerowego czasu)."""
+    if not tokens or not duration_ms:
+        return 0.0
+    return round(tokens / (duration_ms / 1000), 2)
+
+
+def _timestamp_ms(value: str) -> float:
+    """Znacznik czasu ISO 8601 (z "Z") w milisekundach."""
+    return np.datetime64(value.rstrip("Z"), "ms").astype(np.int64).item()
+
+
+def calculate_generation_cost(log: dict) -> dict:
+    """
+    Oblicza miary kosztu i czasu jednego generowania.
+
+    Args:
+        log: Pola logu (generation_logs.read_log_fields)
+
+    Returns:
+        Słownik miar
+    """
+    steps = log.get("steps", [])
+    steps_duration = sum(step.get("duration_ms", 0) for step in steps)
+
+    result = {
+        "model": log.get("model"),
+        "total_duration_ms": log.get("total_duration_ms", 0),
+        "total_input_tokens": log.get("total_input_tokens", 0),
+        "total_output_tokens": log.get("total_output_tokens", 0),
+        "total_tokens": log.get("total_tokens", 0),
+        "output_tokens_per_s": _tokens_per_second(log.get("total_output_tokens"), log.get("total_duration_ms")),
+        "steps_duration_ms": steps_duration,
+        "overhead_ms": log.get("total_duration_ms", 0) - steps_duration,
+    }
+
+    timed_steps = [step for step in steps if step.get("started_at") and step.get("finished_at")]
+    if timed_steps:
+        result["wall_clock_ms"] = (
+            max(_timestamp_ms(step["finished_at"]) for step in timed_steps)
+            - min(_timestamp_ms(step["started_at"]) for step in timed_steps)
+        )
+
+    if steps:
+        result["critical_step"] = max(steps, key=lambda step: step.get("duration_ms", 0)).get("name")
+
+    for step in steps:
+        name = step.get("name")
+        duration = step.get("duration_ms", 0)
+        result[f"{name}.duration_ms"] = duration
+        result[f"{name}.input_tokens"] = step.get("input_tokens", 0)
+        result[f"{name}.output_tokens"] = step.get("output_tokens", 0)
+        result[f"{name}.output_tokens_per_s"] = _tokens_per_second(step.get("output_tokens"), duration)
+        result[f"{name}.share"] = round(duration / steps_duration, 4) if steps_duration else 0.0
+
+    return result
+
+
+def _log_records(article_name: str) -> list[str]:
+    """Pola logów artykułu jako JSON (do hasha wejścia w manifeście)."""
+    return [
+        json.dumps({"version": version, **log}, sort_keys=True)
+        for version, log in read_article_logs(article_name).items()
+    ]
+
+
+def compare_corpus(contents_by_article: dict[str, dict[str, str]]) -> dict[str, dict]:
+    """
+    Oblicza miary kosztu i czasu generowania wszystkich artykułów.
+
+    Args:
+        contents_by_article: Słownik {artykuł: {wersja: treść}} (używane
+            tylko nazwy artykułów - dane pochodzą z logów)
+
+    Returns:
+        Słownik {artykuł: {wersja: {miara: wartość}}}
+    """
+    return {
+        article_name: {
+            version: calculate_generation_cost(log)
+            for version, log in read_article_logs(article_name).items()
+        }
+        for article_name in contents_by_article
+    }
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """Percentyle PERCENTILES, średnia i liczba obserwacji."""
+    array = np.asarray(values, dtype=float)
+    summary = {
+        f"p{q}": round(float(value), 2)
+        for q, value in zip(PERCENTILES, np.percentile(array, PERCENTILES))
+    }
+    summary["mean"] = round(float(array.mean()), 2)
+    summary["count"] = int(array.size)
+    return summary
+
+
+def summarize_results(path=RESULTS_PATH) -> dict:
+    """
+    Liczy percentyle czasu i przepustowości z tabeli wyników.
+
+    Args:
+        path: Ścieżka results.parquet
+
+    Returns:
+        Słownik {"by_step", "by_style", "by_model", "dominant_step"}
+    """
+    rows = read_results(
+        path,
+        metrics=[METRIC.name],
+        columns=["article", "version", "field", "value", "label"]
+    ).to_pylist()
+
+    runs = defaultdict(dict)
+    for row in rows:
+        runs[(row["article"], row["version"])][row["field"]] = (
+            row["value"] if row["value"] is not None else row["label"]
+        )
+
+    by_step = defaultdict(lambda: defaultdict(list))
+    by_style = defaultdict(lambda: defaultdict(list))
+    by_model = defaultdict(lambda: defaultdict(list))
+
+    for (_, version), fields in runs.items():
+        for field, value in fields.items():
+            step, _, measure = field.rpartition(".")
+            if step and measure in STEP_SUMMARY_FIELDS:
+                by_step[step][measure].append(value)
+
+        for measure in RUN_SUMMARY_FIELDS:
+            if measure in fields:
+                by_style[version][measure].append(fields[measure])
+                by_model[fields.get("model")][measure].append(fields[measure])
+
+    # Grupy w kolejności wystąpienia (kroki w kolejności potoku)
+    def _summarize(groups: dict) -> dict:
+        return {
+            group: {measure: _percentiles(values) for measure, values in measures.items()}
+            for group, measures in groups.items()
+        }
+
+    summary = {
+        "by_step": _summarize(by_step),
+        "by_style": _summarize(by_style),
+        "by_model": _summarize(by_model),
+    }
+    summary["dominant_step"] = max(
+        summary["by_step"],
+        key=lambda step: summary["by_step"][step]["duration_ms"]["mean"],
+        default=None
+    )
+
+    return summary
+
+
+def print_summary(summary: dict) -> None:
+    """Wypisuje tabelę czasów kroków."""
+    print(f"\n{'Krok':<28} {'p50 [s]':>9} {'p95 [s]':>9} {'p99 [s]':>9} {'udział':>8} {'tok/s':>8}")
+    for step, measures in summary["by_step"].items():
+        duration = measures["duration_ms"]
+        print(
+            f"{step:<28} {duration['p50'] / 1000:>9.1f} {duration['p95'] / 1000:>9.1f} "
+            f"{duration['p99'] / 1000:>9.1f} {measures['share']['mean']:>8.1%} "
+            f"{measures['output_tokens_per_s']['p50']:>8.1f}"
+        )
+    print(f"\nDominujący krok: {summary['dominant_step']}")
+
+
+METRIC = Metric(
+    name="generation_cost",
+    corpus_func=compare_corpus,
+    source_func=_log_records,
+    requires=frozenset(),
+)
+
+
+def process_all_articles():
+    """Liczy miary przez runner i zapisuje podsumowanie percentyli."""
+    run_metrics([METRIC.name])
+
+    if not RESULTS_PATH.exists():
+        print(f"\nBrak tabeli wyników: {RESULTS_PATH}")
+        return
+
+    summary = summarize_results()
+    print_summary(summary)
+
+    file_path = OUTPUT_DIR / METRIC.name / "summary.json"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    print(f"Podsumowanie zapisane w: {file_path}")
+    print("\nZakończono!")
+
+
+if __name__ == "__main__":
+    process_all_articles()
@@ -0,0 +1,232 @@
+"""
+generation_logs.py - Strumieniowe czytanie logów generowania artykułów
+
+Logi w data/generation-logs/<artykuł>/<wersja>.json zawierają pełne
+source_contents, prompty i odpowiedzi każdego kroku oraz final_markdown,
+a do analiz kosztu i czasu generowania potrzebne są tylko liczby
+(tokeny, czasy) i kilka krótkich pól (model, nazwy kroków).
+
+Moduł parsuje plik przyrostowo (ijson, bufor BUFFER_SIZE bajtów) i
+zatrzymuje tylko zdarzenia wybranych pól - długie napisy są odrzucane
+zaraz po sparsowaniu, a nie budowane w jednym dużym słowniku. Czytanie
+kończy się, gdy wszystkie wybrane pola zostały znalezione, więc dalsza
+część pliku (np. final_markdown) nie jest w ogóle czytana. Pamięć
+zależy od bufora i liczby wybranych pól, a nie od rozmiaru logów.
+
+Ścieżki pól (wskazują wartości skalarne):
+- "model", "total_tokens" - pola najwyższego poziomu
+- "steps[].input_tokens" - pole każdego elementu tablicy obiektów;
+  wynik trafia do record["steps"][i]["input_tokens"]
+- "source_contents[]" - wszystkie elementy tablicy wartości
+
+Logi po migracji (migrate_logs.py) trzymają w source_contents referencje
+do magazynu blob_store.py zamiast tekstów - czytniki zamieniają je
+z powrotem na teksty, więc wywołujący nie widzą różnicy.
+
+Użycie:
+    for record in iter_generation_logs(["model", "steps[].duration_ms"]):
+        record["article"], record["version"], record["model"], record["steps"]
+
+    python generation_logs.py --fields model total_tokens steps[].name
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Generator, Iterable
+
+import ijson
+
+from blob_store import resolve
+from common import GENERATION_LOGS_DIR
+
+# Rozmiar bufora czytania pliku (bajty)
+BUFFER_SIZE = 64 * 1024
+
+# Znacznik pola elementów tablicy w ścieżce
+ARRAY_MARKER = "[]."
+
+# Sufiks ścieżki tablicy wartości
+VALUES_MARKER = "[]"
+
+# Pola z tekstami przenoszonymi do magazynu blobów
+BLOB_FIELDS = ["source_contents"]
+
+# Pola potrzebne w analizach kosztu i czasu generowania
+DEFAULT_FIELDS = [
+    "generated_at",
+    "model",
+    "source_count",
+    "total_duration_ms",
+    "total_input_tokens",
+    "total_output_tokens",
+    "total_tokens",
+    "steps[].name",
+    "steps[].input_tokens",
+    "steps[].output_tokens",
+    "steps[].total_tokens",
+    "steps[].duration_ms",
+    "steps[].started_at",
+    "steps[].finished_at",
+]
+
+# Zdarzenia ijson niosące wartość skalarną
+SCALAR_EVENTS = {"string", "number", "boolean", "null"}
+
+
+def _compile_fields(
+    fields: Iterable[str]
+) -> tuple[dict[str, str], dict[str, dict[str, str]], dict[str, str]]:
+    """
+    Zamienia ścieżki pól na prefiksy ijson.
+
+    Returns:
+        Tuple ({prefiks: pole} dla pól skalarnych,
+               {tablica: {prefiks: pole elementu}} dla pól tablic obiektów,
+               {prefiks elementu: tablica} dla tablic wartości)
+    """
+    scalars = {}
+    arrays = {}
+    value_arrays = {}
+
+    for field in fields:
+        if ARRAY_MARKER in field:
+            array, item_field = field.split(ARRAY_MARKER, 1)
+            arrays.setdefault(array, {})[f"{array}.item.{item_field}"] = item_field
+        elif field.endswith(VALUES_MARKER):
+            array = field[:-len(VALUES_MARKER)]
+            value_arrays[f"{array}.item"] = array
+        else:
+            scalars[field] = field
+
+    return scalars, arrays, value_arrays
+
+
+def read_log_fields(path: Path, fields: Iterable[str] = DEFAULT_FIELDS) -> dict[str, Any]:
+    """
+    Czyta wybrane pola jednego logu generowania bez wczytywania całego pliku.
+
+    Args:
+        path: Ścieżka pliku logu
+        fields: Ścieżki pól (np. "model", "steps[].input_tokens", "source_contents[]")
+
+    Returns:
+        Słownik {pole: wartość}; pola tablic obiektów jako
+        {tablica: [{pole: wartość}, ...]}, tablic wartości jako
+        {tablica: [wartość, ...]} (brakujące pola są pomijane,
+        referencje do blobów zamieniane na teksty)
+    """
+    scalars, arrays, value_arrays = _compile_fields(fields)
+    item_prefixes = {f"{array}.item": array for array in arrays}
+    pending = set(scalars) | set(arrays) | set(value_arrays.values())
+    record = {array: [] for array in [*arrays, *value_arrays.values()]}
+
+    with open(path, "rb") as f:
+        for prefix, event, value in ijson.parse(f, buf_size=BUFFER_SIZE, use_float=True):
+            if event in SCALAR_EVENTS:
+                if prefix in scalars:
+                    record[scalars[prefix]] = resolve(value)
+                    pending.discard(prefix)
+                elif prefix in value_arrays:
+                    record[value_arrays[prefix]].append(resolve(value))
+                else:
+                    array = prefix.rsplit(".item.", 1)[0]
+                    if prefix in arrays.get(array, ()) and record[array]:
+                        record[array][-1][arrays[array][prefix]] = resolve(value)
+            elif event == "start_map" and prefix in item_prefixes:
+                record[item_prefixes[prefix]].append({})
+            elif event == "end_array" and prefix in pending:
+                pending.discard(prefix)
+
+            if not pending:
+                break
+
+    return record
+
+
+def load_log(path: Path) -> dict[str, Any]:
+    """
+    Wczytuje cały log (json.load) z tekstami BLOB_FIELDS odczytanymi
+    z magazynu blobów.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        log = json.load(f)
+
+    for field in BLOB_FIELDS:
+        if field in log:
+            log[field] = [resolve(value) for value in log[field]]
+
+    return log
+
+
+def list_log_files(logs_dir: Path = GENERATION_LOGS_DIR) -> list[Path]:
+    """Zwraca posortowane ścieżki logów (<artykuł>/<wersja>.json)."""
+    return sorted(logs_dir.glob("*/*.json"))
+
+
+def iter_generation_logs(
+    fields: Iterable[str] = DEFAULT_FIELDS,
+    logs_dir: Path = GENERATION_LOGS_DIR
+) -> Generator[dict[str, Any], None, None]:
+    """
+    Generator rekordów logów generowania (po jednym pliku naraz).
+
+    Args:
+        fields: Ścieżki pól do odczytania
+        logs_dir: Katalog logów
+
+    Yields:
+        Słownik {"article", "version", **pola}
+    """
+    fields = list(fields)
+
+    for path in list_log_files(logs_dir):
+        yield {
+            "article": path.parent.name,
+            "version": path.stem,
+            **read_log_fields(path, fields),
+        }
+
+
+def read_article_logs(
+    article_name: str,
+    fields: Iterable[str] = DEFAULT_FIELDS,
+    logs_dir: Path = GENERATION_LOGS_DIR
+) -> dict[str, dict[str, Any]]:
+    """
+    Czyta wybrane pola logów wszystkich wersji jednego artykułu.
+
+    Returns:
+        Słownik {wersja: pola} (pusty, jeśli artykuł nie ma logów)
+    """
+    fields = list(fields)
+
+    return {
+        path.stem: read_log_fields(path, fields)
+        for path in sorted((logs_dir / article_name).glob("*.json"))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Strumieniowe czytanie logów generowania")
+    parser.add_argument("--fields", nargs="+", default=DEFAULT_FIELDS, help="Ścieżki pól (np. model steps[].duration_ms)")
+    parser.add_argument("--logs-dir", type=Path, default=GENERATION_LOGS_DIR, help="Katalog logów")
+    parser.add_argument("--output", type=Path, help="Plik JSONL z rekordami (domyślnie stdout)")
+    args = parser.parse_args()
+
+    records = iter_generation_logs(args.fields, args.logs_dir)
+
+    if args.output:
+        count = 0
+        with open(args.output, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        print(f"Zapisano {count} rekordów w: {args.output}")
+    else:
+        for record in records:
+            print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,93 +22,212 @@ PORÓWNANIA:
 ZASTOSOWANIE:
 - Ocena jak bardzo różnią się wersje artykułu pod względem użytego słownictwa
 - Sprawdzenie czy wersja dla dzieci używa podobnego słownictwa co dorosła
+
+Pary wersji liczone są na identyfikatorach lematów (vocabulary.py):
+część wspólna i suma wyznaczane są z posortowanych tablic unikalnych
+identyfikatorów, bez zbiorów napisów.
+
+TRYB KORPUSOWY (minhash_engine.py):
+Podobieństwo wszystkich par dokumentów (lub akapitów) z całego korpusu,
+wszystkich miejsc i wersji - MinHash + LSH wyznacza kandydatów, a dokładny
+Jaccard ich weryfikuje. Wynik: pary powyżej progu i top-k sąsiadów.
+
+Użycie:
+    python jaccard_similarity.py                      # pary wersji (runner)
+    python jaccard_similarity.py --mode corpus --threshold 0.4 --top-k 5
+    python jaccard_similarity.py --mode corpus --unit paragraph
 """
 
+import argparse
+import json
+from bisect import bisect_right
 from itertools import combinations
 
 from common import (
-    get_lemmas,
-    load_article,
-    process_comparison_articles_parallel,
-    save_aggregated_comparison_metric,
-    save_comparison_result,
+    OUTPUT_DIR,
+    list_articles,
     VERSIONS,
 )
+from document import get_document
+from minhash_engine import DEFAULT_NUM_PERM, DEFAULT_THRESHOLD, build_index
+from pipe_engine import load_versions
+from registry import Metric
+from runner import run_metrics
+from vocabulary import jaccard_ids
 
+# Minimalna liczba różnych lematów akapitu w trybie --unit paragraph
+MIN_PARAGRAPH_LEMMAS = 5
 
-def calculate_jaccard(set_a: set, set_b: set) -> float:
+# Liczba sąsiadów zapisywanych dla każdego dokumentu
+DEFAULT_TOP_K = 5
+
+
+def compare_versions(contents: dict[str, str]) -> dict:
     """
-    Oblicza indeks Jaccarda między dwoma zbiorami.
+    Oblicza podobieństwo Jaccarda dla każdej pary wersji artykułu.
     
     Args:
-        set_a: Pierwszy zbiór
-        set_b: Drugi zbiór
+        contents: Słownik {wersja: treść} (brakujące wersje są pomijane)
     
     Returns:
-        Indeks Jaccarda (0-1)
+        Słownik {"wersja1__wersja2": indeks Jaccarda}
     """
-    if len(set_a) == 0 and len(set_b) == 0:
-        return 1.0
-    
-    intersection = len(set_a & set_b)
-    union = len(set_a | set_b)
-    
-    if union == 0:
-        return 0.0
-    
-    return round(intersection / union, 4)
-
-
-def process_single_article(article_name: str) -> dict:
-    """Przetwarza pojedynczy artykuł i zwraca porównania."""
     # Pary do porównania
     version_pairs = list(combinations(VERSIONS, 2))
     
-    # Wczytaj wszystkie wersje
-    version_lemmas = {}
-    
-    for version in VERSIONS:
-        try:
-            data = load_article(article_name, version)
-            content = data.get("content", "")
-            lemmas = set(get_lemmas(content, lowercase=True))
-            version_lemmas[version] = lemmas
-        except FileNotFoundError:
-            pass  # Pominąć brakujące wersje
+    version_lemmas = {
+        version: get_document(content).lemma_ids
+        for version, content in contents.items()
+    }
     
     # Oblicz podobieństwo dla każdej pary
     comparisons = {}
     
     for v1, v2 in version_pairs:
         if v1 in version_lemmas and v2 in version_lemmas:
-            jaccard = calculate_jaccard(version_lemmas[v1], version_lemmas[v2])
+            similarity = round(jaccard_ids(version_lemmas[v1], version_lemmas[v2]), 4)
             key = f"{v1}__{v2}"
-            comparisons[key] = jaccard
-    
-    if comparisons:
-        save_comparison_result(
-            metric_name="jaccard_similarity",
-            article_name=article_name,
-            comparisons=comparisons
-        )
+            comparisons[key] = similarity
     
     return comparisons
 
 
+METRIC = Metric(
+    name="jaccard_similarity",
+    compare_func=compare_versions,
+    requires=frozenset({"lemmas"}),
+)
+
+
+def _paragraph_lemma_sets(content: str) -> list[set[str]]:
+    """Zbiory lematów akapitów (bloki rozdzielone pustą linią) z jednego parsowania."""
+    paragraph_starts = []
+    offset = 0
+    for block in content.split("\n\n"):
+        paragraph_starts.append(offset)
+        offset += len(block) + 2
+    
+    lemma_sets = [set() for _ in paragraph_starts]
+    for token in get_document(content).words:
+        paragraph = bisect_right(paragraph_starts, token.idx) - 1
+        lemma_sets[paragraph].add(token.lemma_.lower())
+    
+    return lemma_sets
+
+
+def collect_lemma_sets(
+    contents_by_article: dict[str, dict[str, str]],
+    unit: str = "document"
+) -> dict[str, set[str]]:
+    """
+    Zbiera zbiory lematów jednostek korpusu.
+    
+    Args:
+        contents_by_article: Słownik {artykuł: {wersja: treść}}
+        unit: "document" (artykuł/wersja) lub "paragraph" (akapit)
+    
+    Returns:
+        Słownik {"artykuł/wersja" lub "artykuł/wersja/pN": zbiór lematów}
+    """
+    lemma_sets = {}
+    
+    for article_name, contents in contents_by_article.items():
+        for version, content in contents.items():
+            if unit == "document":
+                lemma_sets[f"{article_name}/{version}"] = set(get_document(content).lemmas)
+                continue
+            
+            for index, lemmas in enumerate(_paragraph_lemma_sets(content)):
+                if len(lemmas) >= MIN_PARAGRAPH_LEMMAS:
+                    lemma_sets[f"{article_name}/{version}/p{index}"] = lemmas
+    
+    return lemma_sets
+
+
+def find_corpus_similarities(
+    contents_by_article: dict[str, dict[str, str]],
+    unit: str = "document",
+    threshold: float = DEFAULT_THRESHOLD,
+    top_k: int = DEFAULT_TOP_K,
+    num_perm: int = DEFAULT_NUM_PERM
+) -> dict:
+    """
+    Wyszukuje podobne dokumenty/akapity w całym korpusie (MinHash + LSH,
+    weryfikacja dokładnym Jaccardem).
+    
+    Returns:
+        Słownik z parametrami indeksu, parami powyżej progu i sąsiadami
+    """
+    index = build_index(collect_lemma_sets(contents_by_article, unit), threshold, num_perm)
+    
+    return {
+        "unit": unit,
+        "threshold": threshold,
+        "num_perm": num_perm,
+        "bands": index.bands,
+        "rows": index.rows,
+        "items": len(index.keys),
+        "candidate_pairs": len(index.candidate_pairs()),
+        "pairs": [
+            {"a": a, "b": b, "jaccard": round(similarity, 4)}
+            for a, b, similarity in index.similar_pairs(threshold)
+        ],
+        "neighbors": {
+            key: [{"key": other, "jaccard": round(similarity, 4)} for other, similarity in neighbors]
+            for key, neighbors in index.top_k_neighbors(top_k).items()
+            if neighbors
+        },
+    }
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_comparison_articles_parallel(
-        metric_name="jaccard_similarity",
-        process_article_func=process_single_article
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
+    
+    print("\nZakończono!")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Podobieństwo Jaccarda")
+    parser.add_argument(
+        "--mode",
+        choices=["runner", "corpus"],
+        default="runner",
+        help="runner: pary wersji przez runner; corpus: MinHash/LSH w całym korpusie"
     )
+    parser.add_argument("--unit", choices=["document", "paragraph"], default="document", help="Jednostka porównania (tryb corpus)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Próg podobieństwa par (tryb corpus)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Liczba sąsiadów (tryb corpus)")
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM, help="Długość sygnatury MinHash (tryb corpus)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
     
-    # Zapisz agregowany JSON
-    if aggregated:
-        save_aggregated_comparison_metric("jaccard_similarity", aggregated)
+    if args.mode == "runner":
+        process_all_articles()
+        return
     
-    print("\nZakończono!")
+    contents_by_article = {article_name: load_versions(article_name) for article_name in list_articles()}
+    
+    result = find_corpus_similarities(
+        contents_by_article,
+        unit=args.unit,
+        threshold=args.threshold,
+        top_k=args.top_k,
+        num_perm=args.num_perm
+    )
+    file_path = OUTPUT_DIR / METRIC.name / f"corpus_similarity_{args.unit}.json"
+    print(f"Jednostek: {result['items']}, kandydatów LSH: {result['candidate_pairs']}, par >= {args.threshold}: {len(result['pairs'])}")
+    
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    
+    print(f"Wyniki zapisane w: {file_path}")
 
 
 if __name__ == "__main__":
-    process_all_articles()
+    main()
 
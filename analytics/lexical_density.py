@@ -31,12 +31,10 @@ ZASTOSOWANIE:
 - Teksty dla dzieci mogą mieć niższą gęstość (więcej słów funkcyjnych)
 """
 
-from common import (
-    get_nlp,
-    get_tokens,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+from document import CONTENT_POS, get_document
+from registry import Metric
+from runner import run_metrics
+from vocabulary import unique_counts
 
 
 def calculate_lexical_density(text: str) -> dict:
@@ -49,30 +47,20 @@ def calculate_lexical_density(text: str) -> dict:
     Returns:
         Słownik z gęstością i statystykami
     """
-    nlp = get_nlp()
-    doc = nlp(text)
-    
-    # POS tags dla słów treściowych
-    content_pos = {"NOUN", "VERB", "ADJ", "ADV"}
+    doc = get_document(text)
     
-    # Zlicz tylko tokeny alfabetyczne
-    all_words = [token for token in doc if token.is_alpha]
-    content_words = [token for token in all_words if token.pos_ in content_pos]
+    # Zlicz tylko tokeny alfabetyczne (częstości identyfikatorów POS)
+    pos_ids, counts = unique_counts(doc.pos_ids)
+    pos_counts = dict(zip(doc.vocabulary.decode(pos_ids), counts.tolist()))
     
-    total_count = len(all_words)
-    content_count = len(content_words)
+    total_count = len(doc.pos_ids)
+    content_count = sum(pos_counts.get(pos, 0) for pos in CONTENT_POS)
     
     if total_count == 0:
         density = 0.0
     else:
         density = (content_count / total_count) * 100
     
-    # Zlicz poszczególne kategorie
-    pos_counts = {}
-    for token in all_words:
-        pos = token.pos_
-        pos_counts[pos] = pos_counts.get(pos, 0) + 1
-    
     return {
         "lexical_density": round(density, 2),
         "content_words_count": content_count,
@@ -122,16 +110,17 @@ def format_lexical_density_output(value: float) -> str:
     return f"{value}% ({get_density_interpretation(value)})"
 
 
+METRIC = Metric(
+    name="lexical_density",
+    calculate_func=calculate_lexical_density_value,
+    extra_data_func=get_extra_data_lexical_density,
+    requires=frozenset({"pos"}),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="lexical_density",
-        calculate_func=calculate_lexical_density_value,
-        extra_data_func=get_extra_data_lexical_density
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("lexical_density", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
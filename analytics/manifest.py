@@ -0,0 +1,227 @@
+"""
+manifest.py - Manifest wyników metryk do przyrostowych uruchomień
+
+Manifest (output/manifest.json) zapamiętuje dla każdej pary
+(metryka, artykuł/wersja) hash treści wejściowej, wersję kodu metryki
+i wynik. Runner przelicza tylko wpisy, których treść w data/articles/
+lub implementacja metryki się zmieniła, a aggregated.json buduje
+z manifestu. Wersja kodu obejmuje moduł metryki, moduły analytics/,
+które importuje (silniki, document.py, vocabulary.py, common.py, ...),
+oraz model spaCy i komponenty potoku, z których metryka korzysta.
+
+Struktura:
+{
+  "metrics": {
+    "word_count": {
+      "zamek_w_kaliszu/adult_full": {
+        "input_hash": "...",
+        "code_version": "...",
+        "value": 791,
+        "extra": null,
+        "computed_at": "2025-12-07T21:20:02.680845"
+      },
+      ...
+    },
+    "jaccard_similarity": {
+      "zamek_w_kaliszu": {...}
+    }
+  }
+}
+
+Klucz wpisu to "artykuł/wersja" dla metryk per wersja i "artykuł" dla
+metryk porównawczych.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from common import get_model_info, OUTPUT_DIR, PIPELINE_REQUIREMENTS
+from registry import Metric
+
+MANIFEST_PATH = OUTPUT_DIR / "manifest.json"
+
+# Katalog modułów analytics/ (źródła wersji kodu metryk)
+ANALYTICS_DIR = Path(__file__).parent
+
+# Moduły orkiestracji - nie wpływają na wartości metryk, więc ich zmiany
+# nie unieważniają wpisów (i ich importy nie są śledzone dalej)
+CODE_VERSION_IGNORED_MODULES = frozenset({
+    "manifest",
+    "pipe_engine",
+    "profiling",
+    "registry",
+    "result_writer",
+    "results_store",
+    "runner",
+    "scheduling",
+    "shared_tokens",
+    "sinks",
+})
+
+
+def hash_content(text: str) -> str:
+    """Zwraca hash SHA-256 treści."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_contents(content_hashes: dict[str, str]) -> str:
+    """Zwraca łączny hash wszystkich wersji artykułu (dla metryk porównawczych)."""
+    hasher = hashlib.sha256()
+    for version in sorted(content_hashes):
+        hasher.update(f"{version}\0{content_hashes[version]}\0".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _local_imports(path: Path) -> set[str]:
+    """Nazwy modułów analytics/ importowanych w pliku (także wewnątrz funkcji)."""
+    names = set()
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+
+    return {name for name in names if (ANALYTICS_DIR / f"{name}.py").is_file()}
+
+
+@lru_cache(maxsize=None)
+def get_source_files(module_name: str) -> tuple[Path, ...]:
+    """
+    Zwraca pliki źródłowe modułu i modułów analytics/, od których zależy
+    (domknięcie importów bez CODE_VERSION_IGNORED_MODULES).
+
+    Args:
+        module_name: Nazwa modułu w analytics/ (np. "mtld")
+
+    Returns:
+        Posortowane ścieżki plików .py
+    """
+    seen = set()
+    pending = [module_name]
+
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        pending.extend(_local_imports(ANALYTICS_DIR / f"{name}.py") - CODE_VERSION_IGNORED_MODULES)
+
+    return tuple(sorted(ANALYTICS_DIR / f"{name}.py" for name in seen))
+
+
+def get_code_version(metric: Metric) -> str:
+    """
+    Zwraca wersję kodu metryki - hash źródeł jej modułu i modułów, od
+    których zależy (get_source_files), oraz modelu spaCy.
+
+    Każda zmiana w pliku metryki lub w silnikach i warstwie dokumentu,
+    których używa, unieważnia jej wpisy w manifeście. Dla metryk
+    korzystających z modelu (requires) wersja obejmuje też nazwę
+    i wersję modelu oraz komponenty potoku potrzebne metryce.
+    """
+    func = metric.corpus_func or metric.compare_func or metric.calculate_func
+    module_name = Path(inspect.getsourcefile(func)).stem
+
+    hasher = hashlib.sha256()
+    for path in get_source_files(module_name):
+        hasher.update(f"{path.name}\0".encode("utf-8"))
+        hasher.update(path.read_bytes())
+        hasher.update(b"\0")
+
+    if metric.requires:
+        model_name, model_version = get_model_info()
+        components = sorted({
+            component
+            for requirement in metric.requires
+            for component in PIPELINE_REQUIREMENTS[requirement]
+        })
+        hasher.update(f"{model_name}\0{model_version}\0{','.join(components)}".encode("utf-8"))
+
+    return hasher.hexdigest()[:16]
+
+
+def entry_key(article_name: str, version: str | None = None) -> str:
+    """Zwraca klucz wpisu manifestu."""
+    return article_name if version is None else f"{article_name}/{version}"
+
+
+class Manifest:
+    """Wyniki metryk wraz z hashami wejścia i wersjami kodu."""
+
+    def __init__(self, data: dict | None = None):
+        self.data = data or {"metrics": {}}
+
+    @classmethod
+    def load(cls, path: Path = MANIFEST_PATH) -> "Manifest":
+        """Wczytuje manifest (pusty, jeśli plik nie istnieje)."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, path: Path = MANIFEST_PATH) -> Path:
+        """Zapisuje manifest atomowo (plik tymczasowy + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".json.tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+
+        os.replace(tmp_path, path)
+        return path
+
+    def entries(self, metric_name: str) -> dict[str, dict]:
+        """Zwraca wpisy metryki {klucz: wpis}."""
+        return self.data["metrics"].setdefault(metric_name, {})
+
+    def get(self, metric_name: str, key: str) -> dict | None:
+        """Zwraca wpis lub None."""
+        return self.entries(metric_name).get(key)
+
+    def is_fresh(
+        self,
+        metric_name: str,
+        key: str,
+        input_hash: str,
+        code_version: str
+    ) -> bool:
+        """Czy wpis istnieje i odpowiada bieżącej treści oraz wersji kodu."""
+        entry = self.get(metric_name, key)
+        return (
+            entry is not None
+            and entry["input_hash"] == input_hash
+            and entry["code_version"] == code_version
+        )
+
+    def update(
+        self,
+        metric_name: str,
+        key: str,
+        input_hash: str,
+        code_version: str,
+        value: Any,
+        extra: dict | None = None,
+        computed_at: datetime | None = None
+    ) -> None:
+        """Zapisuje (nadpisuje) wpis."""
+        self.entries(metric_name)[key] = {
+            "input_hash": input_hash,
+            "code_version": code_version,
+            "value": value,
+            "extra": extra,
+            "computed_at": (computed_at or datetime.now()).isoformat(),
+        }
+
+    def prune(self, metric_name: str, keys: set[str]) -> None:
+        """Usuwa wpisy metryki spoza podanego zbioru kluczy (np. usunięte artykuły)."""
+        entries = self.entries(metric_name)
+        for key in set(entries) - keys:
+            del entries[key]
@@ -0,0 +1,652 @@
+"""
+metrics_service.py - Lokalny serwis HTTP liczący metryki dla dowolnego tekstu
+
+Metryki z registry.py liczone są dotąd tylko wsadowo (run_all.py) dla
+artykułów z data/articles. Serwis pozwala policzyć dowolną metrykę
+tekstu (per wersja - bez porównawczych i korpusowych) dla tekstu
+przesłanego przez HTTP, np. na bieżąco w trakcie edycji artykułu
+(frontend: app/api/metrics/route.ts).
+
+DZIAŁANIE:
+- model spaCy ładowany jest raz przy starcie i rozgrzewany
+- serwer jest asynchroniczny (asyncio); równoczesne żądania czekają
+  na parsowanie we wspólnej kolejce, z której ParseBatcher zbiera wsad
+  (do MAX_BATCH_SIZE tekstów lub BATCH_WINDOW_MS od pierwszego) i parsuje
+  go jednym wywołaniem nlp.pipe
+- parsowanie i metryki wykonuje jeden wątek modelu (spaCy i słownik
+  procesu nie są współbieżne), pętla asyncio obsługuje tylko sieć
+- wyniki są cache'owane po hashu treści (SHA-256) i nazwie metryki -
+  ponowne zapytanie o ten sam tekst nie parsuje go ponownie; równoczesne
+  żądania o ten sam tekst czekają na jedno obliczenie metryki
+- słownik procesu (vocabulary.py) jest zastępowany pustym, gdy
+  przekroczy MAX_VOCABULARY_SIZE słów - nowe słowa (i literówki)
+  z edytowanych tekstów nie zostają w pamięci na zawsze
+- dla każdego etapu (kolejka, parsowanie, metryka, całe żądanie)
+  zbierany jest histogram opóźnień
+
+ENDPOINTY:
+    GET  /health              - stan serwisu (model, rozmiar cache)
+    GET  /metrics             - metryki dostępne w serwisie
+    POST /metrics             - {"text": "...", "metrics": ["readability_pl", ...]}
+                                -> {"hash", "results", "errors", "timings_ms"}
+    POST /metrics?stream=1    - wyniki strumieniowo (NDJSON): linia na metrykę,
+                                gdy tylko jest policzona, na końcu linia "done"
+    GET  /stats               - histogramy opóźnień, trafienia cache, rozmiary wsadów
+
+Brak pola "metrics" = wszystkie dostępne metryki.
+
+Użycie:
+    python metrics_service.py
+    python metrics_service.py --host 0.0.0.0 --port 8765 --max-batch-size 16
+    curl -X POST localhost:8765/metrics -d '{"text": "Ala ma kota.", "metrics": ["lexical_density"]}'
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from common import get_nlp, set_pipeline_requirements
+from document import ParsedDocument, register_document
+from manifest import hash_content
+from registry import Metric, get_metrics, get_requirements
+from vocabulary import get_vocabulary, reset_vocabulary
+
+# Domyślny adres serwisu (tylko lokalnie - frontend odpytuje go po stronie serwera)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Maksymalna liczba tekstów w jednym wywołaniu nlp.pipe
+MAX_BATCH_SIZE = 32
+
+# Czas zbierania wsadu od pierwszego tekstu w kolejce (ms)
+BATCH_WINDOW_MS = 5.0
+
+# Liczba wyników (tekst, metryka) trzymanych w cache
+RESULT_CACHE_SIZE = 4096
+
+# Rozmiar słownika procesu, po którego przekroczeniu jest on zastępowany pustym
+MAX_VOCABULARY_SIZE = 200_000
+
+# Maksymalny rozmiar ciała żądania (bajty)
+MAX_BODY_BYTES = 1 << 20
+
+# Górne granice przedziałów histogramów opóźnień (ms)
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# Liczba ostatnich pomiarów, z których liczone są percentyle
+LATENCY_SAMPLES = 1000
+
+# Percentyle opóźnień w /stats
+PERCENTILES = [50, 95, 99]
+
+# Tekst rozgrzewający model przy starcie
+WARMUP_TEXT = "Kalisz jest jednym z najstarszych miast w Polsce. Leży nad Prosną."
+
+# Statusy HTTP używane przez serwis
+HTTP_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+def available_metrics() -> list[Metric]:
+    """Metryki liczone dla pojedynczego tekstu (bez porównawczych i korpusowych)."""
+    return [metric for metric in get_metrics() if not metric.is_comparison]
+
+
+class LatencyHistogram:
+    """
+    Histogram opóźnień z przedziałami LATENCY_BUCKETS_MS (ostatni
+    przedział bez górnej granicy) i percentylami z ostatnich pomiarów.
+    """
+
+    def __init__(self, buckets: list[float] = LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    def observe(self, elapsed_ms: float) -> None:
+        """Dodaje pomiar."""
+        self.counts[int(np.searchsorted(self.buckets, elapsed_ms))] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.samples.append(elapsed_ms)
+
+    def snapshot(self) -> dict:
+        """Przedziały (le = górna granica, liczności skumulowane), suma, percentyle."""
+        cumulative = np.cumsum(self.counts).tolist()
+        summary = {
+            "count": self.count,
+            "sum_ms": round(self.total_ms, 3),
+            "buckets": [
+                {"le": bound, "count": count}
+                for bound, count in zip([*self.buckets, "+Inf"], cumulative)
+            ],
+        }
+        if self.samples:
+            values = np.percentile(np.asarray(self.samples), PERCENTILES)
+            summary.update({f"p{q}": round(float(value), 3) for q, value in zip(PERCENTILES, values)})
+        return summary
+
+
+class ServiceStats:
+    """Histogramy opóźnień etapów, trafienia cache i rozmiary wsadów."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.latencies: dict[str, LatencyHistogram] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.inflight_hits = 0
+        self.vocabulary_resets = 0
+        self.batch_sizes: Counter[int] = Counter()
+
+    def observe(self, stage: str, elapsed_ms: float) -> None:
+        """Dodaje pomiar etapu (np. "request", "parse", "metric:ttr")."""
+        histogram = self.latencies.get(stage)
+        if histogram is None:
+            histogram = self.latencies[stage] = LatencyHistogram()
+        histogram.observe(elapsed_ms)
+
+    def snapshot(self) -> dict:
+        """Stan statystyk dla /stats."""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "cache": {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": round(self.cache_hits / lookups, 4) if lookups else None,
+                "inflight_hits": self.inflight_hits,
+            },
+            "vocabulary": {
+                "size": len(get_vocabulary()),
+                "resets": self.vocabulary_resets,
+            },
+            "batch_sizes": {str(size): count for size, count in sorted(self.batch_sizes.items())},
+            "latency_ms": {stage: histogram.snapshot() for stage, histogram in sorted(self.latencies.items())},
+        }
+
+
+class ResultCache:
+    """Wyniki metryk po (hash treści, metryka), najstarsze usuwane pierwsze."""
+
+    def __init__(self, max_size: int = RESULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._results: OrderedDict[tuple[str, str], dict] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, content_hash: str, metric_name: str) -> dict | None:
+        """Zwraca wynik {"value", "extra"} lub None."""
+        result = self._results.get((content_hash, metric_name))
+        if result is not None:
+            self._results.move_to_end((content_hash, metric_name))
+        return result
+
+    def put(self, content_hash: str, metric_name: str, result: dict) -> None:
+        """Zapisuje wynik."""
+        self._results[(content_hash, metric_name)] = result
+        self._results.move_to_end((content_hash, metric_name))
+
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+
+def _timed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def _parse_batch(texts: list[str], max_vocabulary_size: int) -> tuple[list[ParsedDocument], bool]:
+    """
+    Parsuje wsad jednym wywołaniem nlp.pipe (w wątku modelu).
+
+    Słownik procesu tylko rośnie, więc gdy przekroczy max_vocabulary_size,
+    przed wsadem jest zastępowany pustym. Dokumenty wcześniejszych wsadów
+    zachowują swój słownik i zwalniają go, gdy wypadną z cache procesu.
+
+    Returns:
+        Tuple (dokumenty, czy słownik został wymieniony)
+    """
+    reset = len(get_vocabulary()) > max_vocabulary_size
+    if reset:
+        reset_vocabulary()
+
+    documents = [
+        ParsedDocument(text, doc)
+        for text, doc in zip(texts, get_nlp().pipe(texts, batch_size=len(texts)))
+    ]
+    for document in documents:
+        register_document(document)
+    return documents, reset
+
+
+def _compute_metric(metric: Metric, document: ParsedDocument | None, text: str) -> dict:
+    """
+    Liczy metrykę dla tekstu (w wątku modelu).
+
+    Dokument sparsowany we wsadzie jest ponownie wstawiany do cache
+    procesu - mógł z niego wypaść, gdy w międzyczasie parsowano inne wsady.
+    """
+    if document is not None:
+        register_document(document)
+
+    value = metric.calculate_func(text)
+    extra = metric.extra_data_func(text) if metric.extra_data_func else None
+    return {"value": value, "extra": extra}
+
+
+class ParseBatcher:
+    """
+    Zbiera teksty z równoczesnych żądań i parsuje je wsadowo (nlp.pipe)
+    w wątku modelu.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor,
+        stats: ServiceStats,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        batch_window_ms: float = BATCH_WINDOW_MS,
+        max_vocabulary_size: int = MAX_VOCABULARY_SIZE
+    ):
+        self.executor = executor
+        self.stats = stats
+        self.max_batch_size = max_batch_size
+        self.batch_window_ms = batch_window_ms
+        self.max_vocabulary_size = max_vocabulary_size
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future, float]] = asyncio.Queue()
+
+    async def parse(self, text: str) -> ParsedDocument:
+        """Dodaje tekst do kolejki i czeka na jego dokument."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list[tuple[str, asyncio.Future, float]]:
+        """Czeka na pierwszy tekst i dobiera kolejne do pełnego wsadu lub końca okna."""
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.batch_window_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def run(self) -> None:
+        """Pętla wsadów (zadanie asyncio działające przez cały czas życia serwisu)."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            started = time.perf_counter()
+            for _, _, queued_at in batch:
+                self.stats.observe("queue", (started - queued_at) * 1000)
+
+            # Ten sam tekst z kilku żądań parsowany jest raz
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+            self.stats.batch_sizes[len(texts)] += 1
+
+            try:
+                documents, reset = await loop.run_in_executor(
+                    self.executor, _parse_batch, texts, self.max_vocabulary_size
+                )
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats.observe("parse", _timed_ms(started))
+            self.stats.vocabulary_resets += reset
+            by_text = dict(zip(texts, documents))
+            for text, future, _ in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+
+
+class MetricsService:
+    """Obsługa żądań: cache wyników, wsadowe parsowanie, metryki w wątku modelu."""
+
+    def __init__(
+        self,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        batch_window_ms: float = BATCH_WINDOW_MS,
+        max_vocabulary_size: int = MAX_VOCABULARY_SIZE
+    ):
+        self.metrics = {metric.name: metric for metric in available_metrics()}
+        self.stats = ServiceStats()
+        self.cache = ResultCache()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+        self.batcher = ParseBatcher(
+            self.executor, self.stats, max_batch_size, batch_window_ms, max_vocabulary_size
+        )
+        # Obliczenia w toku: (hash treści, metryka) -> wynik (rezultat, błąd)
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+    def warm_up(self) -> None:
+        """Ładuje model (tylko komponenty potrzebne metrykom) i parsuje tekst rozgrzewający."""
+        set_pipeline_requirements(get_requirements(list(self.metrics.values())))
+
+        start = time.perf_counter()
+        nlp = get_nlp()
+        nlp(WARMUP_TEXT)
+        print(f"Model {nlp.meta.get('name', '?')} gotowy ({_timed_ms(start):.0f} ms), komponenty: {', '.join(nlp.pipe_names)}")
+
+    def select_metrics(self, names: list[str] | None) -> list[Metric]:
+        """
+        Wybiera metryki żądania (None = wszystkie dostępne).
+
+        Raises:
+            ValueError: Gdy żądanie zawiera nieznane lub niedostępne metryki
+        """
+        if names is None:
+            return list(self.metrics.values())
+
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError("Pole metrics musi być listą nazw metryk")
+
+        unknown = [name for name in names if name not in self.metrics]
+        if unknown:
+            raise ValueError(
+                f"Niedostępne metryki: {', '.join(unknown)}. Dostępne: {', '.join(self.metrics)}"
+            )
+
+        return [metric for name, metric in self.metrics.items() if name in names]
+
+    async def compute(self, text: str, metrics: list[Metric]):
+        """
+        Liczy metryki tekstu, zwraca wyniki w kolejności gotowości.
+
+        Najpierw zwracane są wyniki z cache; tekst jest parsowany (wsadowo)
+        tylko wtedy, gdy któraś z brakujących metryk używa spaCy. Metryki
+        liczone właśnie dla tego samego tekstu przez inne żądanie nie są
+        liczone ponownie - żądanie czeka na ich wynik.
+
+        Yields:
+            Tuple (nazwa metryki, {"value", "extra", "cached"} lub None, błąd lub None)
+        """
+        loop = asyncio.get_running_loop()
+        content_hash = hash_content(text)
+
+        cached = []
+        owned = []
+        waiting = []
+        for metric in metrics:
+            result = self.cache.get(content_hash, metric.name)
+            if result is not None:
+                self.stats.cache_hits += 1
+                cached.append((metric, result))
+                continue
+
+            self.stats.cache_misses += 1
+            future = self._inflight.get((content_hash, metric.name))
+            if future is None:
+                self._inflight[(content_hash, metric.name)] = loop.create_future()
+                owned.append(metric)
+            else:
+                self.stats.inflight_hits += 1
+                waiting.append((metric, future))
+
+        try:
+            for metric, result in cached:
+                yield metric.name, {**result, "cached": True}, None
+
+            document = None
+            if get_requirements(owned):
+                try:
+                    document = await self.batcher.parse(text)
+                except Exception as e:
+                    for metric in owned:
+                        self._finish(content_hash, metric, None, str(e))
+                        yield metric.name, None, str(e)
+                    owned = []
+
+            for metric in owned:
+                start = time.perf_counter()
+                try:
+                    result = await loop.run_in_executor(self.executor, _compute_metric, metric, document, text)
+                except Exception as e:
+                    self._finish(content_hash, metric, None, str(e))
+                    yield metric.name, None, str(e)
+                    continue
+
+                self.stats.observe(f"metric:{metric.name}", _timed_ms(start))
+                self.cache.put(content_hash, metric.name, result)
+                self._finish(content_hash, metric, result, None)
+                yield metric.name, {**result, "cached": False}, None
+        finally:
+            # Żądanie przerwane (np. rozłączony klient) - czekający dostają błąd
+            for metric in owned:
+                self._finish(content_hash, metric, None, "Obliczenie przerwane")
+
+        for metric, future in waiting:
+            result, error = await future
+            yield metric.name, (None if error else {**result, "cached": True}), error
+
+    def _finish(self, content_hash: str, metric: Metric, result: dict | None, error: str | None) -> None:
+        """Kończy obliczenie w toku i przekazuje wynik czekającym żądaniom."""
+        future = self._inflight.pop((content_hash, metric.name), None)
+        if future is not None and not future.done():
+            future.set_result((result, error))
+
+    async def handle_metrics(self, body: bytes, stream: bool, writer: asyncio.StreamWriter) -> None:
+        """POST /metrics - wyniki jednym obiektem JSON lub strumieniowo (NDJSON)."""
+        start = time.perf_counter()
+        try:
+            request = json.loads(body or b"{}")
+            text = request.get("text") if isinstance(request, dict) else None
+            if not isinstance(text, str):
+                raise ValueError("Pole text (napis) jest wymagane")
+            metrics = self.select_metrics(request.get("metrics"))
+        except ValueError as e:
+            await send_json(writer, 400, {"error": str(e)})
+            return
+
+        content_hash = hash_content(text)
+
+        if stream:
+            await send_headers(writer, 200, "application/x-ndjson")
+            async for name, result, error in self.compute(text, metrics):
+                line = {"metric": name, "error": error} if error else {"metric": name, **result}
+                writer.write(_encode(line) + b"\n")
+                await writer.drain()
+            writer.write(_encode({"done": True, "hash": content_hash, "total_ms": round(_timed_ms(start), 3)}) + b"\n")
+            await writer.drain()
+        else:
+            results = {}
+            errors = {}
+            async for name, result, error in self.compute(text, metrics):
+                if error:
+                    errors[name] = error
+                else:
+                    results[name] = result
+            await send_json(writer, 200, {
+                "hash": content_hash,
+                "results": {metric.name: results[metric.name] for metric in metrics if metric.name in results},
+                "errors": errors,
+                "timings_ms": {"total": round(_timed_ms(start), 3)},
+            })
+
+        self.stats.observe("request", _timed_ms(start))
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Obsługuje jedno połączenie HTTP/1.1 (jedno żądanie, Connection: close)."""
+        try:
+            method, target, headers = await read_request_head(reader)
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                await send_json(writer, 413, {"error": f"Maksymalny rozmiar żądania: {MAX_BODY_BYTES} B"})
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+            await self.dispatch(method, url.path, query, body, writer)
+        except (ValueError, asyncio.IncompleteReadError):
+            await send_json(writer, 400, {"error": "Nieprawidłowe żądanie HTTP"})
+        except ConnectionError:
+            pass
+        except Exception as e:
+            await send_json(writer, 500, {"error": str(e)})
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def dispatch(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, list[str]],
+        body: bytes,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """Kieruje żądanie do endpointu."""
+        if path == "/metrics" and method == "POST":
+            stream = query.get("stream", ["0"])[0] in ("1", "true")
+            await self.handle_metrics(body, stream, writer)
+        elif path == "/metrics" and method == "GET":
+            await send_json(writer, 200, {
+                "metrics": [
+                    {"name": metric.name, "requires": sorted(metric.requires)}
+                    for metric in self.metrics.values()
+                ]
+            })
+        elif path == "/stats" and method == "GET":
+            await send_json(writer, 200, self.stats.snapshot())
+        elif path == "/health" and method == "GET":
+            await send_json(writer, 200, {
+                "status": "ok",
+                "cached_results": len(self.cache),
+                "vocabulary_size": len(get_vocabulary()),
+            })
+        elif path in ("/metrics", "/stats", "/health"):
+            await send_json(writer, 405, {"error": f"Metoda {method} nie jest obsługiwana"})
+        else:
+            await send_json(writer, 404, {"error": f"Nieznany endpoint: {path}"})
+
+
+async def read_request_head(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str]]:
+    """
+    Czyta linię żądania i nagłówki HTTP.
+
+    Returns:
+        Tuple (metoda, ścieżka z zapytaniem, {nagłówek małymi literami: wartość})
+
+    Raises:
+        ValueError: Gdy linia żądania jest nieprawidłowa
+    """
+    request_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    method, target, _ = request_line.split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    return method.upper(), target, headers
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+async def send_headers(
+    writer: asyncio.StreamWriter,
+    status: int,
+    content_type: str,
+    content_length: int | None = None
+) -> None:
+    """Wysyła linię statusu i nagłówki (bez Content-Length - ciało do zamknięcia połączenia)."""
+    lines = [
+        f"HTTP/1.1 {status} {HTTP_STATUS[status]}",
+        f"Content-Type: {content_type}; charset=utf-8",
+        "Cache-Control: no-store",
+        "Connection: close",
+    ]
+    if content_length is not None:
+        lines.append(f"Content-Length: {content_length}")
+
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+
+async def send_json(writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+    """Wysyła odpowiedź JSON."""
+    body = _encode(payload)
+    await send_headers(writer, status, "application/json", len(body))
+    writer.write(body)
+    await writer.drain()
+
+
+async def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    max_batch_size: int = MAX_BATCH_SIZE,
+    batch_window_ms: float = BATCH_WINDOW_MS,
+    max_vocabulary_size: int = MAX_VOCABULARY_SIZE
+) -> None:
+    """Uruchamia serwis (do przerwania Ctrl+C)."""
+    service = MetricsService(max_batch_size, batch_window_ms, max_vocabulary_size)
+    service.warm_up()
+
+    batcher_task = asyncio.create_task(service.batcher.run())
+    server = await asyncio.start_server(service.handle_connection, host, port)
+
+    print(f"Serwis metryk: http://{host}:{port} (metryki: {', '.join(service.metrics)})")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batcher_task.cancel()
+        service.executor.shutdown(wait=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwis HTTP liczący metryki dla dowolnego tekstu")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Adres nasłuchu")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE, help="Maksymalny wsad nlp.pipe")
+    parser.add_argument("--batch-window-ms", type=float, default=BATCH_WINDOW_MS, help="Czas zbierania wsadu (ms)")
+    parser.add_argument(
+        "--max-vocabulary-size", type=int, default=MAX_VOCABULARY_SIZE,
+        help="Rozmiar słownika procesu, po którego przekroczeniu jest on zastępowany pustym"
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(
+            args.host, args.port, args.max_batch_size, args.batch_window_ms, args.max_vocabulary_size
+        ))
+    except KeyboardInterrupt:
+        print("\nZatrzymano serwis.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+migrate_logs.py - Migracja logów generowania do magazynu blobów
+
+Przenosi teksty pól BLOB_FIELDS (source_contents) z logów
+data/generation-logs/<artykuł>/<wersja>.json do magazynu adresowanego
+treścią (blob_store.py) i zastępuje je referencjami. Teksty wspólne
+dla wersji artykułu (i dla różnych artykułów) są zapisywane raz.
+
+Logi zapisywane są w tym samym formacie co w scripts/lib/files.ts
+(JSON z wcięciem 2), przez plik tymczasowy i rename. Migracja jest
+idempotentna - referencje pozostają bez zmian. --restore wstawia teksty
+z powrotem do logów (np. przed ponownym generowaniem przez skrypty TS).
+
+Użycie:
+    python migrate_logs.py --compress
+    python migrate_logs.py --dry-run
+    python migrate_logs.py --restore
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from blob_store import BLOB_DIR, REFERENCE_PREFIX, get_blob, is_reference, put_blob
+from common import GENERATION_LOGS_DIR
+from generation_logs import BLOB_FIELDS, list_log_files
+
+
+def _write_log(path: Path, log: dict) -> int:
+    """Zapisuje log (plik tymczasowy + rename) i zwraca jego rozmiar."""
+    data = json.dumps(log, ensure_ascii=False, indent=2).encode("utf-8")
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+    return len(data)
+
+
+def migrate_log(
+    path: Path,
+    blob_dir: Path = BLOB_DIR,
+    compress: bool = False,
+    restore: bool = False,
+    dry_run: bool = False
+) -> tuple[int, int]:
+    """
+    Migruje jeden log (teksty -> referencje albo odwrotnie).
+
+    Args:
+        path: Ścieżka logu
+        blob_dir: Katalog magazynu blobów
+        compress: Czy kompresować nowe bloby
+        restore: Wstaw teksty z powrotem zamiast referencji
+        dry_run: Nie zapisuj zmian
+
+    Returns:
+        Tuple (rozmiar logu przed, rozmiar po) w bajtach
+    """
+    size_before = path.stat().st_size
+
+    with open(path, "r", encoding="utf-8") as f:
+        log = json.load(f)
+
+    for field in BLOB_FIELDS:
+        if field not in log:
+            continue
+
+        if restore:
+            log[field] = [get_blob(value, blob_dir) if is_reference(value) else value for value in log[field]]
+        elif dry_run:
+            log[field] = [value if is_reference(value) else REFERENCE_PREFIX + "0" * 64 for value in log[field]]
+        else:
+            log[field] = [
+                value if is_reference(value) else put_blob(value, blob_dir, compress)
+                for value in log[field]
+            ]
+
+    if dry_run:
+        return size_before, len(json.dumps(log, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    return size_before, _write_log(path, log)
+
+
+def _directory_size(directory: Path) -> int:
+    """Łączny rozmiar plików w katalogu (0, jeśli nie istnieje)."""
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migracja source_contents logów generowania do magazynu blobów")
+    parser.add_argument("--logs-dir", type=Path, default=GENERATION_LOGS_DIR, help="Katalog logów")
+    parser.add_argument("--blob-dir", type=Path, default=BLOB_DIR, help="Katalog magazynu blobów")
+    parser.add_argument("--compress", action="store_true", help="Kompresuj bloby (gzip)")
+    parser.add_argument("--restore", action="store_true", help="Wstaw teksty z powrotem do logów")
+    parser.add_argument("--dry-run", action="store_true", help="Tylko policz oszczędność, bez zapisu")
+    args = parser.parse_args()
+
+    paths = list_log_files(args.logs_dir)
+    blobs_before = _directory_size(args.blob_dir) if args.blob_dir.exists() else 0
+    total_before = 0
+    total_after = 0
+
+    for path in paths:
+        size_before, size_after = migrate_log(
+            path,
+            blob_dir=args.blob_dir,
+            compress=args.compress,
+            restore=args.restore,
+            dry_run=args.dry_run
+        )
+        total_before += size_before
+        total_after += size_after
+
+    blobs_after = _directory_size(args.blob_dir) if args.blob_dir.exists() else 0
+
+    print(f"Logi: {len(paths)}")
+    print(f"Rozmiar logów: {total_before / 1024:.0f} KB -> {total_after / 1024:.0f} KB")
+    if not args.dry_run:
+        print(f"Rozmiar magazynu blobów: {blobs_before / 1024:.0f} KB -> {blobs_after / 1024:.0f} KB ({args.blob_dir})")
+
+
+if __name__ == "__main__":
+    main()
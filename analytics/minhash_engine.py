@@ -0,0 +1,262 @@
+"""
+minhash_engine.py - MinHash + LSH do podobieństwa Jaccarda w całym korpusie
+
+Porównanie każdej pary dokumentów (wszystkie miejsca, wszystkie wersje,
+ewentualnie akapity) dokładnym Jaccardem jest kwadratowe. Silnik:
+
+1. Koduje elementy zbiorów (lematy) do 32-bitowych hashy
+2. Liczy sygnatury MinHash: dla num_perm funkcji h(x) = (a*x + b) mod p
+   minimum po elementach zbioru (jedna macierz dokumenty x num_perm)
+3. Dzieli sygnatury na pasma (LSH banding) - dokumenty z identycznym
+   pasmem trafiają do jednego kubełka i stają się kandydatami
+4. Weryfikuje kandydatów dokładnym indeksem Jaccarda na zbiorach
+
+Liczba pasm i wierszy w paśmie dobierana jest tak, by próg LSH
+(1/pasma)^(1/wiersze) był możliwie bliski zadanemu progowi podobieństwa.
+
+Użycie:
+    index = build_index({klucz: zbiór_lematów}, threshold=0.5)
+    index.similar_pairs()        # [(klucz_a, klucz_b, jaccard), ...]
+    index.top_k_neighbors(5)     # {klucz: [(sąsiad, jaccard), ...]}
+"""
+
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Hashable
+
+import numpy as np
+from scipy import sparse
+
+# Liczba funkcji haszujących (długość sygnatury)
+DEFAULT_NUM_PERM = 128
+
+# Domyślny próg podobieństwa dla kandydatów LSH
+DEFAULT_THRESHOLD = 0.5
+
+# Największa liczba pierwsza < 2^32 - modulo rodziny h(x) = (a*x + b) mod p;
+# a, b, x < p, więc a*x + b < 2^64 mieści się w uint64
+HASH_PRIME = 4294967291
+
+# Maksymalna liczba elementów macierzy hashy w jednej porcji
+SIGNATURE_CHUNK_ELEMENTS = 1 << 22
+
+
+def jaccard(set_a: set, set_b: set) -> float:
+    """Dokładny indeks Jaccarda (1.0 dla dwóch pustych zbiorów)."""
+    if not set_a and not set_b:
+        return 1.0
+
+    union = len(set_a | set_b)
+    return len(set_a & set_b) / union if union else 0.0
+
+
+def hash_elements(elements: set[str]) -> np.ndarray:
+    """Zwraca stabilne (niezależne od procesu) 32-bitowe hashe elementów."""
+    return np.fromiter(
+        (
+            int.from_bytes(hashlib.blake2b(element.encode("utf-8"), digest_size=4).digest(), "little")
+            for element in elements
+        ),
+        dtype=np.uint64,
+        count=len(elements)
+    )
+
+
+def choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    Dobiera liczbę pasm i wierszy w paśmie (pasma * wiersze <= num_perm),
+    dla których próg LSH (1/pasma)^(1/wiersze) jest najbliższy progowi.
+    """
+    candidates = [
+        (bands, num_perm // bands)
+        for bands in range(1, num_perm + 1)
+    ]
+    return min(
+        candidates,
+        key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold)
+    )
+
+
+def compute_signatures(
+    element_hashes: list[np.ndarray],
+    num_perm: int = DEFAULT_NUM_PERM,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Liczy sygnatury MinHash wielu zbiorów naraz.
+
+    Hashe wszystkich zbiorów są łączone w jedną tablicę, permutowane
+    macierzowo i redukowane minimum w obrębie zbioru (np.minimum.reduceat),
+    porcjami o ograniczonej liczbie elementów.
+
+    Args:
+        element_hashes: Hashe elementów każdego zbioru (niepuste)
+        num_perm: Liczba funkcji haszujących
+        seed: Ziarno współczynników funkcji
+
+    Returns:
+        Macierz uint64 (zbiory x num_perm)
+    """
+    rng = np.random.default_rng(seed)
+    prime = np.uint64(HASH_PRIME)
+    a = rng.integers(1, HASH_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, HASH_PRIME, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(element_hashes), num_perm), dtype=np.uint64)
+    elements_per_chunk = max(1, SIGNATURE_CHUNK_ELEMENTS // num_perm)
+
+    start = 0
+    while start < len(element_hashes):
+        # Porcja zbiorów o łącznej liczbie elementów <= elements_per_chunk
+        end = start
+        size = 0
+        while end < len(element_hashes) and (end == start or size + len(element_hashes[end]) <= elements_per_chunk):
+            size += len(element_hashes[end])
+            end += 1
+
+        chunk = element_hashes[start:end]
+        values = np.concatenate(chunk) % prime
+        offsets = np.cumsum([0] + [len(h) for h in chunk[:-1]])
+
+        permuted = (values[:, None] * a + b) % prime
+        signatures[start:end] = np.minimum.reduceat(permuted, offsets, axis=0)
+        start = end
+
+    return signatures
+
+
+@dataclass
+class MinHashIndex:
+    """
+    Indeks MinHash/LSH nad zbiorami (np. lematami dokumentów).
+
+    Attributes:
+        keys: Klucze zbiorów (np. (artykuł, wersja))
+        sets: Zbiory elementów (do dokładnej weryfikacji)
+        signatures: Sygnatury MinHash (zbiory x num_perm)
+        bands: Liczba pasm LSH
+        rows: Liczba wierszy sygnatury w paśmie
+    """
+    keys: list[Hashable]
+    sets: list[set[str]]
+    signatures: np.ndarray
+    bands: int
+    rows: int
+    _jaccard_cache: dict[tuple[int, int], float] = field(default_factory=dict, repr=False)
+    _candidates: set[tuple[int, int]] | None = field(default=None, repr=False)
+
+    def candidate_pairs(self) -> set[tuple[int, int]]:
+        """Pary indeksów zbiorów, które trafiły do wspólnego kubełka LSH."""
+        if self._candidates is not None:
+            return self._candidates
+
+        pairs = set()
+
+        for band in range(self.bands):
+            band_values = self.signatures[:, band * self.rows:(band + 1) * self.rows]
+            _, bucket_ids = np.unique(band_values, axis=0, return_inverse=True)
+
+            buckets = defaultdict(list)
+            for index, bucket in enumerate(bucket_ids.ravel()):
+                buckets[bucket].append(index)
+
+            for members in buckets.values():
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        pairs.add((first, second))
+
+        self._candidates = pairs
+        return pairs
+
+    def exact_jaccard(self, first: int, second: int) -> float:
+        """Dokładny Jaccard dwóch zbiorów indeksu (z cache)."""
+        pair = (min(first, second), max(first, second))
+        if pair not in self._jaccard_cache:
+            self._jaccard_cache[pair] = jaccard(self.sets[pair[0]], self.sets[pair[1]])
+        return self._jaccard_cache[pair]
+
+    def estimated_jaccard(self, first: int, second: int) -> float:
+        """Jaccard oszacowany z sygnatur (odsetek zgodnych minimów)."""
+        return float(np.mean(self.signatures[first] == self.signatures[second]))
+
+    def similar_pairs(self, threshold: float = 0.0) -> list[tuple[Hashable, Hashable, float]]:
+        """
+        Zweryfikowane pary kandydatów o dokładnym Jaccardzie >= threshold.
+
+        Returns:
+            Lista (klucz_a, klucz_b, jaccard) malejąco po podobieństwie
+        """
+        result = []
+        for first, second in self.candidate_pairs():
+            similarity = self.exact_jaccard(first, second)
+            if similarity >= threshold:
+                result.append((self.keys[first], self.keys[second], similarity))
+
+        result.sort(key=lambda item: item[2], reverse=True)
+        return result
+
+    def top_k_neighbors(self, k: int) -> dict[Hashable, list[tuple[Hashable, float]]]:
+        """
+        Do k najbliższych sąsiadów każdego zbioru spośród kandydatów LSH
+        (dokładny Jaccard).
+        """
+        neighbors = defaultdict(list)
+        for first, second in self.candidate_pairs():
+            similarity = self.exact_jaccard(first, second)
+            neighbors[first].append((second, similarity))
+            neighbors[second].append((first, similarity))
+
+        return {
+            self.keys[index]: [
+                (self.keys[other], similarity)
+                for other, similarity in sorted(neighbors[index], key=lambda item: item[1], reverse=True)[:k]
+            ]
+            for index in range(len(self.keys))
+        }
+
+    def similarity_matrix(self) -> sparse.csr_matrix:
+        """Rzadka symetryczna macierz dokładnych Jaccardów par kandydatów."""
+        pairs = list(self.candidate_pairs())
+        if not pairs:
+            return sparse.csr_matrix((len(self.keys), len(self.keys)))
+
+        first, second = np.array(pairs).T
+        values = np.array([self.exact_jaccard(i, j) for i, j in pairs])
+        matrix = sparse.coo_matrix(
+            (np.concatenate([values, values]), (np.concatenate([first, second]), np.concatenate([second, first]))),
+            shape=(len(self.keys), len(self.keys))
+        )
+        return matrix.tocsr()
+
+
+def build_index(
+    sets: dict[Hashable, set[str]],
+    threshold: float = DEFAULT_THRESHOLD,
+    num_perm: int = DEFAULT_NUM_PERM,
+    seed: int = 0
+) -> MinHashIndex:
+    """
+    Buduje indeks MinHash/LSH. Puste zbiory są pomijane (nie mają
+    sygnatury, trafiałyby do jednego kubełka).
+
+    Args:
+        sets: Słownik {klucz: zbiór elementów}
+        threshold: Docelowy próg podobieństwa (dobór pasm LSH)
+        num_perm: Liczba funkcji haszujących
+        seed: Ziarno funkcji haszujących
+
+    Returns:
+        MinHashIndex
+    """
+    keys = [key for key, elements in sets.items() if elements]
+    element_sets = [sets[key] for key in keys]
+    bands, rows = choose_bands(num_perm, threshold)
+
+    signatures = compute_signatures(
+        [hash_elements(elements) for elements in element_sets],
+        num_perm=num_perm,
+        seed=seed
+    ) if keys else np.empty((0, num_perm), dtype=np.uint64)
+
+    return MinHashIndex(keys, element_sets, signatures, bands, rows)
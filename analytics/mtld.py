@@ -14,6 +14,11 @@ ALGORYTM:
 5. Powtarza proces od końca tekstu (bi-directional)
 6. Końcowy MTLD to średnia z obu kierunków
 
+Obliczenia wykonuje wektorowy silnik NumPy (mtld_engine.py), zgodny
+z biblioteką lexical_diversity, na identyfikatorach słownika dokumentu
+(token_ids, lemma_ids). Warianty MTLD-MA-wrap i HD-D liczone są
+tylko w danych dodatkowych - każda miara raz na dokument.
+
 INTERPRETACJA:
 - Wyższa wartość = większa różnorodność leksykalna
 - Typowe wartości: 50-150
@@ -32,86 +37,96 @@ ZASTOSOWANIE:
 - Analiza czy teksty dla dzieci mają prostsze słownictwo
 """
 
-from lexical_diversity import lex_div as ld
+from document import get_document
+from registry import Metric
+from mtld_engine import encode_tokens, hdd_from_ids, mtld, mtld_ma_wrap_from_ids, TokenInput
+from runner import run_metrics
 
-from common import (
-    get_tokens,
-    get_lemmas,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+# MTLD potrzebuje minimum ~50 tokenów dla sensownych wyników
+MIN_TOKENS = 50
 
 
-def calculate_mtld(tokens: list[str]) -> float:
+def calculate_mtld(tokens: TokenInput) -> float:
     """
     Oblicza MTLD dla listy tokenów.
     
     Args:
-        tokens: Lista tokenów (słów)
+        tokens: Lista tokenów (słów) lub tablica ich identyfikatorów
     
     Returns:
         Wartość MTLD
     """
-    if len(tokens) < 50:
-        # MTLD potrzebuje minimum ~50 tokenów dla sensownych wyników
+    if len(tokens) < MIN_TOKENS:
         return 0.0
     
-    try:
-        mtld_value = ld.mtld(tokens)
-        return round(mtld_value, 2)
-    except Exception:
-        return 0.0
+    return round(mtld(tokens), 2)
 
 
-def calculate_mtld_from_text_full(text: str) -> dict:
+def calculate_extra_measures(tokens: TokenInput) -> dict:
     """
-    Oblicza MTLD dla tekstu - zarówno na tokenach jak i lematach.
+    Oblicza MTLD-MA-wrap i HD-D dla listy tokenów (jedno zakodowanie).
     
     Args:
-        text: Tekst do analizy
+        tokens: Lista tokenów (słów) lub tablica ich identyfikatorów
     
     Returns:
-        Słownik z MTLD na tokenach i lematach oraz statystykami
+        Słownik {"mtld_ma_wrap", "hdd"} (zera dla zbyt krótkich tekstów)
     """
-    tokens = get_tokens(text, lowercase=True)
-    lemmas = get_lemmas(text, lowercase=True)
+    if len(tokens) < MIN_TOKENS:
+        return {"mtld_ma_wrap": 0.0, "hdd": 0.0}
     
+    ids = encode_tokens(tokens)
     return {
-        "mtld_tokens": calculate_mtld(tokens),
-        "mtld_lemmas": calculate_mtld(lemmas),
-        "token_count": len(tokens),
-        "lemma_count": len(lemmas)
+        "mtld_ma_wrap": round(mtld_ma_wrap_from_ids(ids), 2),
+        "hdd": round(hdd_from_ids(ids), 4)
     }
 
 
 def calculate_mtld_from_text(text: str) -> dict:
-    """Zwraca główną wartość MTLD (dict z mtld_tokens i mtld_lemmas)."""
-    results = calculate_mtld_from_text_full(text)
+    """
+    Oblicza MTLD dla tekstu - zarówno na tokenach jak i lematach.
+    
+    Args:
+        text: Tekst do analizy
+    
+    Returns:
+        Słownik z mtld_tokens i mtld_lemmas
+    """
+    doc = get_document(text)
     return {
-        "mtld_tokens": results["mtld_tokens"],
-        "mtld_lemmas": results["mtld_lemmas"]
+        "mtld_tokens": calculate_mtld(doc.token_ids),
+        "mtld_lemmas": calculate_mtld(doc.lemma_ids)
     }
 
 
 def get_extra_data_mtld(content: str) -> dict:
-    """Zwraca dodatkowe dane dla MTLD."""
-    results = calculate_mtld_from_text_full(content)
+    """Zwraca dodatkowe dane dla MTLD (MTLD-MA-wrap i HD-D liczone tylko tutaj)."""
+    doc = get_document(content)
+    tokens = doc.token_ids
+    lemmas = doc.lemma_ids
+    token_measures = calculate_extra_measures(tokens)
+    lemma_measures = calculate_extra_measures(lemmas)
     return {
-        "token_count": results["token_count"],
-        "lemma_count": results["lemma_count"]
+        "token_count": len(tokens),
+        "lemma_count": len(lemmas),
+        "mtld_ma_wrap_tokens": token_measures["mtld_ma_wrap"],
+        "mtld_ma_wrap_lemmas": lemma_measures["mtld_ma_wrap"],
+        "hdd_tokens": token_measures["hdd"],
+        "hdd_lemmas": lemma_measures["hdd"]
     }
 
 
+METRIC = Metric(
+    name="mtld",
+    calculate_func=calculate_mtld_from_text,
+    extra_data_func=get_extra_data_mtld,
+    requires=frozenset({"tokens", "lemmas"}),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="mtld",
-        calculate_func=calculate_mtld_from_text,
-        extra_data_func=get_extra_data_mtld
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("mtld", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -0,0 +1,278 @@
+"""
+mtld_engine.py - Wektorowe MTLD, MTLD-MA-wrap i HD-D (NumPy)
+
+Implementacja miar różnorodności leksykalnej zgodna z biblioteką
+lexical_diversity (mtld, mtld_ma_wrap, hdd), ale liczona na tablicach
+NumPy zamiast pętli po wycinkach listy tokenów.
+
+IDEA:
+Tokeny są kodowane do identyfikatorów całkowitych, a dla każdej pozycji i
+liczona jest pozycja poprzedniego wystąpienia tego samego typu (prev[i],
+-1 gdy brak). Token i jest nowym typem we fragmencie zaczynającym się
+w s wtedy i tylko wtedy, gdy prev[i] < s. Dzięki temu liczba typów
+narastającego fragmentu to cumsum(prev[s:] < s), a TTR i granice
+faktorów wyznacza się operacjami na tablicach:
+- MTLD: granice faktorów szukane w oknach (podwajanych, gdy granicy brak),
+  osobno dla tekstu i jego odwrócenia (bi-directional)
+- MTLD-MA-wrap: dla wszystkich pozycji startowych naraz (macierz
+  pozycja x długość, liczona blokami i porcjami), na tekście zawiniętym
+- HD-D: z częstości typów (bincount) i rozkładu hipergeometrycznego
+
+Wyniki odpowiadają bibliotece lexical_diversity (próg TTR 0.72,
+minimalna długość faktora 10, próbka HD-D 42 tokeny).
+
+Wszystkie miary dla jednego tekstu liczy jedno wywołanie:
+    measures = lexical_diversity_measures(tokens)
+    # {"mtld": ..., "mtld_ma_wrap": ..., "hdd": ...}
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+# Próg TTR kończący faktor (Jarvis & McCarthy)
+MTLD_THRESHOLD = 0.72
+
+# Minimalna długość pełnego faktora
+MTLD_MIN_FACTOR_LENGTH = 10
+
+# Wielkość losowej próbki w HD-D
+HDD_SAMPLE_SIZE = 42
+
+# Początkowa szerokość okna wyszukiwania granicy faktora
+INITIAL_WINDOW = 128
+
+# Długość bloku sprawdzanego naraz dla wszystkich pozycji startowych (MA-wrap)
+MA_WRAP_BLOCK = 256
+
+# Maksymalna liczba elementów macierzy pozycja x długość w jednej porcji
+MA_WRAP_CHUNK_ELEMENTS = 1 << 22
+
+TokenInput = Sequence[str] | np.ndarray
+
+
+def encode_tokens(tokens: TokenInput) -> np.ndarray:
+    """
+    Koduje tokeny do zwartych identyfikatorów całkowitych (0..V-1).
+
+    Args:
+        tokens: Lista tokenów lub tablica identyfikatorów
+
+    Returns:
+        Tablica int64 identyfikatorów w kolejności tekstu
+    """
+    if isinstance(tokens, np.ndarray) and tokens.dtype.kind in "iu":
+        _, ids = np.unique(tokens, return_inverse=True)
+        return ids.astype(np.int64, copy=False)
+
+    vocab = {}
+    return np.fromiter(
+        (vocab.setdefault(token, len(vocab)) for token in tokens),
+        dtype=np.int64,
+        count=len(tokens)
+    )
+
+
+def previous_occurrence(ids: np.ndarray) -> np.ndarray:
+    """
+    Zwraca dla każdej pozycji indeks poprzedniego wystąpienia tego samego
+    identyfikatora (-1, jeśli to pierwsze wystąpienie).
+    """
+    order = np.argsort(ids, kind="stable")
+    sorted_ids = ids[order]
+
+    prev = np.full(len(ids), -1, dtype=np.int64)
+    same = sorted_ids[1:] == sorted_ids[:-1]
+    prev[order[1:][same]] = order[:-1][same]
+    return prev
+
+
+def _mtld_direction(
+    prev: np.ndarray,
+    threshold: float,
+    min_length: int
+) -> float:
+    """MTLD w jednym kierunku (odpowiednik mtlder z lexical_diversity)."""
+    n = len(prev)
+    factors = 0.0
+    start = 0
+    window = INITIAL_WINDOW
+
+    while True:
+        # Ostatnia pozycja tekstu zawsze zamyka fragment częściowy
+        end = min(start + window, n - 1)
+
+        if end > start:
+            types = np.cumsum(prev[start:end] < start)
+            lengths = np.arange(1, end - start + 1)
+            is_boundary = (types / lengths < threshold) & (lengths >= min_length)
+            boundary = int(np.argmax(is_boundary))
+
+            if is_boundary[boundary]:
+                factors += 1
+                start += boundary + 1
+                window = INITIAL_WINDOW
+                continue
+
+            if end < n - 1:
+                window *= 2
+                continue
+
+        # Fragment częściowy [start, n)
+        ttr = np.count_nonzero(prev[start:] < start) / (n - start)
+        factors += (1 - ttr) / (1 - threshold)
+        break
+
+    # Suma długości faktorów to zawsze długość tekstu
+    return float(n / factors) if factors else 0.0
+
+
+def mtld_from_ids(
+    ids: np.ndarray,
+    threshold: float = MTLD_THRESHOLD,
+    min_length: int = MTLD_MIN_FACTOR_LENGTH
+) -> float:
+    """MTLD (średnia z obu kierunków) dla zakodowanych tokenów."""
+    if len(ids) == 0:
+        return 0.0
+
+    forward = _mtld_direction(previous_occurrence(ids), threshold, min_length)
+    backward = _mtld_direction(previous_occurrence(ids[::-1]), threshold, min_length)
+    return float((forward + backward) / 2)
+
+
+def _max_types_below_threshold(max_length: int, threshold: float) -> np.ndarray:
+    """
+    Dla każdej długości fragmentu L (indeks L) zwraca największą liczbę
+    typów t, dla której t / L < threshold (-1, jeśli taka nie istnieje).
+    Porównanie liczb całkowitych zastępuje dzielenie w pętli, a wynik
+    jest identyczny z porównaniem t / L < threshold.
+    """
+    lengths = np.arange(max_length + 1)
+    max_types = np.floor(lengths * threshold).astype(np.int64)
+
+    # Korekta zaokrągleń: t / L musi być ściśle mniejsze od progu
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_types -= (max_types / lengths >= threshold)
+        max_types += ((max_types + 1) / lengths < threshold)
+    max_types[0] = -1
+    return max_types
+
+
+def mtld_ma_wrap_from_ids(
+    ids: np.ndarray,
+    threshold: float = MTLD_THRESHOLD,
+    min_length: int = MTLD_MIN_FACTOR_LENGTH
+) -> float:
+    """
+    MTLD-MA-wrap dla zakodowanych tokenów: średnia długość pierwszego
+    pełnego faktora dla każdej pozycji startowej, z zawinięciem tekstu.
+    """
+    n = len(ids)
+    if n == 0:
+        return 0.0
+
+    prev = previous_occurrence(np.concatenate([ids, ids])).astype(np.int32)
+    padded = np.concatenate([prev, np.full(MA_WRAP_BLOCK, 2 * n, dtype=np.int32)])
+
+    # Dopuszczalna liczba typów dla długości L (indeks L - 1); fragmenty
+    # krótsze niż min_length nigdy nie kończą faktora
+    max_types = _max_types_below_threshold(2 * n + MA_WRAP_BLOCK, threshold)[1:].astype(np.int32)
+    max_types[:min_length - 1] = -1
+
+    total_length = 0
+    factor_count = 0
+
+    # Pozycje startowe bez znalezionej granicy i liczba typów w dotychczas
+    # sprawdzonym fragmencie [start, start + covered)
+    pending = np.arange(n, dtype=np.int32)
+    pending_types = np.zeros(n, dtype=np.int32)
+    covered = 0
+    offsets = np.arange(MA_WRAP_BLOCK, dtype=np.int32)
+    chunk_size = MA_WRAP_CHUNK_ELEMENTS // MA_WRAP_BLOCK
+
+    while pending.size:
+        block_max_types = max_types[covered:covered + MA_WRAP_BLOCK]
+        unresolved = []
+        unresolved_types = []
+
+        for chunk_start in range(0, pending.size, chunk_size):
+            starts = pending[chunk_start:chunk_start + chunk_size]
+            positions = starts[:, None] + (covered + offsets)
+
+            types = np.cumsum(padded[positions] < starts[:, None], axis=1, dtype=np.int32)
+            types += pending_types[chunk_start:chunk_start + chunk_size, None]
+
+            # Pozycje za końcem zawiniętego tekstu (2n) nie mogą być granicą
+            is_boundary = (types <= block_max_types) & (positions < 2 * n)
+            boundary = np.argmax(is_boundary, axis=1)
+            found = is_boundary[np.arange(starts.size), boundary]
+
+            total_length += int(np.sum(covered + boundary[found] + 1))
+            factor_count += int(np.count_nonzero(found))
+
+            # Bez granicy w bloku: szukaj dalej, o ile tekst się nie skończył
+            keep = ~found & (starts + covered + MA_WRAP_BLOCK < 2 * n)
+            unresolved.append(starts[keep])
+            unresolved_types.append(types[keep, -1])
+
+        pending = np.concatenate(unresolved)
+        pending_types = np.concatenate(unresolved_types)
+        covered += MA_WRAP_BLOCK
+
+    return float(total_length / factor_count) if factor_count else 0.0
+
+
+def hdd_from_ids(ids: np.ndarray, sample_size: int = HDD_SAMPLE_SIZE) -> float:
+    """
+    HD-D dla zakodowanych tokenów: suma po typach prawdopodobieństwa
+    wystąpienia typu w losowej próbce sample_size tokenów (podzielona
+    przez sample_size).
+    """
+    n = len(ids)
+    if n < sample_size:
+        return 0.0
+
+    counts = np.bincount(ids)
+    counts = counts[counts > 0]
+
+    # P(0 wystąpień) = C(n - f, k) / C(n, k) = prod_i (n - f - i) / (n - i)
+    steps = np.arange(sample_size)
+    prob_absent = np.prod((n - counts[:, None] - steps) / (n - steps), axis=1)
+    prob_absent = np.maximum(prob_absent, 0.0)
+
+    return float(np.sum((1.0 - prob_absent) / sample_size))
+
+
+def mtld(tokens: TokenInput, min_length: int = MTLD_MIN_FACTOR_LENGTH) -> float:
+    """MTLD (bi-directional) - odpowiednik lexical_diversity.lex_div.mtld."""
+    return mtld_from_ids(encode_tokens(tokens), min_length=min_length)
+
+
+def mtld_ma_wrap(tokens: TokenInput, min_length: int = MTLD_MIN_FACTOR_LENGTH) -> float:
+    """MTLD-MA-wrap - odpowiednik lexical_diversity.lex_div.mtld_ma_wrap."""
+    return mtld_ma_wrap_from_ids(encode_tokens(tokens), min_length=min_length)
+
+
+def hdd(tokens: TokenInput) -> float:
+    """HD-D - odpowiednik lexical_diversity.lex_div.hdd."""
+    return hdd_from_ids(encode_tokens(tokens))
+
+
+def lexical_diversity_measures(tokens: TokenInput) -> dict[str, float]:
+    """
+    Liczy MTLD, MTLD-MA-wrap i HD-D na jednym zakodowaniu tokenów.
+
+    Args:
+        tokens: Lista tokenów lub tablica identyfikatorów
+
+    Returns:
+        Słownik {"mtld", "mtld_ma_wrap", "hdd"}
+    """
+    ids = encode_tokens(tokens)
+
+    return {
+        "mtld": mtld_from_ids(ids),
+        "mtld_ma_wrap": mtld_ma_wrap_from_ids(ids),
+        "hdd": hdd_from_ids(ids),
+    }
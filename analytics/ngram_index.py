@@ -0,0 +1,177 @@
+"""
+ngram_index.py - Indeks n-gramów tekstów źródłowych (wierność źródłom)
+
+Porównanie wygenerowanego tekstu ze źródłami przez szukanie wspólnych
+podciągów jest kwadratowe względem długości tekstów. Indeks:
+
+1. Koduje lematy źródeł do identyfikatorów całkowitych (słownik zbioru
+   źródeł, identyfikatory od 1; 0 = lemat spoza źródeł)
+2. Zamienia każdy n-gram (n = 3..5) na jeden klucz uint64 - identyfikatory
+   upakowane bitowo (dokładnie, gdy n * bity_słownika <= 64) albo hash
+   wielomianowy (mod 2^64) dla bardzo dużych słowników
+3. Trzyma posortowane unikalne klucze n-gramów każdego rozmiaru
+
+Tekst wygenerowany jest sprawdzany jednym przebiegiem: klucze wszystkich
+jego n-gramów liczone są wektorowo, a przynależność do źródeł wyznacza
+searchsorted na posortowanych kluczach indeksu. N-gramy nie przekraczają
+granic pojedynczych źródeł.
+
+Użycie:
+    index = build_index([lematy_źródła_1, lematy_źródła_2, ...])
+    index.score(lematy_tekstu)
+    # {"copy_ratio": ..., "novel_ngram_rate_3": ..., "longest_copied_span": ...}
+"""
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+# Rozmiary n-gramów (w lematach)
+NGRAM_SIZES = (3, 4, 5)
+
+# Podstawa hasha wielomianowego (nieparzysta, FNV-1 64-bit prime)
+HASH_BASE = np.uint64(1099511628211)
+
+
+def ngram_keys(ids: np.ndarray, n: int, bits: int) -> np.ndarray:
+    """
+    Klucze wszystkich n-gramów sekwencji identyfikatorów.
+
+    Args:
+        ids: Identyfikatory lematów (uint64)
+        n: Rozmiar n-gramu
+        bits: Liczba bitów identyfikatora (0 = hash wielomianowy)
+
+    Returns:
+        Tablica uint64 o długości len(ids) - n + 1 (pusta dla krótszych)
+    """
+    count = len(ids) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+
+    multiplier = np.uint64(1 << bits) if bits else HASH_BASE
+    keys = np.zeros(count, dtype=np.uint64)
+
+    # Przepełnienie uint64 przy hashu jest zamierzone (arytmetyka mod 2^64)
+    with np.errstate(over="ignore"):
+        for offset in range(n):
+            keys = keys * multiplier + ids[offset:offset + count]
+
+    return keys
+
+
+def _run_lengths(mask: np.ndarray) -> np.ndarray:
+    """Długości serii kolejnych wartości True w masce."""
+    padded = np.concatenate([[False], mask, [False]])
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[1::2] - edges[::2]
+
+
+@dataclass
+class NgramIndex:
+    """
+    Indeks n-gramów lematów zbioru tekstów źródłowych.
+
+    Attributes:
+        vocab: Słownik lemat -> identyfikator (od 1)
+        bits: Bity identyfikatora przy pakowaniu kluczy (0 = hash)
+        ngrams: Posortowane unikalne klucze n-gramów {n: klucze}
+    """
+    vocab: dict[str, int]
+    bits: int
+    ngrams: dict[int, np.ndarray]
+
+    def encode(self, lemmas: Sequence[str]) -> np.ndarray:
+        """Koduje lematy (0 dla lematów spoza źródeł)."""
+        return np.fromiter(
+            (self.vocab.get(lemma, 0) for lemma in lemmas),
+            dtype=np.uint64,
+            count=len(lemmas)
+        )
+
+    def copied(self, ids: np.ndarray, n: int) -> np.ndarray:
+        """Maska n-gramów tekstu występujących w źródłach (po pozycji startowej)."""
+        keys = ngram_keys(ids, n, self.bits)
+        index_keys = self.ngrams[n]
+        if not len(keys) or not len(index_keys):
+            return np.zeros(len(keys), dtype=bool)
+
+        positions = np.minimum(np.searchsorted(index_keys, keys), len(index_keys) - 1)
+        return index_keys[positions] == keys
+
+    def score(self, lemmas: Sequence[str]) -> dict[str, float | int]:
+        """
+        Miary wierności źródłom dla tekstu (jeden przebieg po n-gramach).
+
+        - copy_ratio: odsetek lematów tekstu pokrytych przez n-gramy
+          najmniejszego rozmiaru występujące w źródłach
+        - novel_ngram_rate_<n>: odsetek n-gramów tekstu nieobecnych w źródłach
+        - longest_copied_span: najdłuższy ciąg lematów pokryty łańcuchem
+          nakładających się skopiowanych n-gramów najmniejszego rozmiaru
+
+        Args:
+            lemmas: Lematy tekstu
+
+        Returns:
+            Słownik miar (zaokrąglonych do 4 miejsc)
+        """
+        ids = self.encode(lemmas)
+        novel_rates = {}
+        coverage_n = min(self.ngrams)
+
+        for n in sorted(self.ngrams):
+            copied = self.copied(ids, n)
+            novel_rates[f"novel_ngram_rate_{n}"] = round(1 - float(copied.mean()), 4) if len(copied) else 0.0
+
+            if n != coverage_n:
+                continue
+
+            # Pokrycie lematów: każdy skopiowany n-gram pokrywa pozycje [i, i + n)
+            starts = np.flatnonzero(copied)
+            delta = np.bincount(starts, minlength=len(ids) + 1) - np.bincount(starts + n, minlength=len(ids) + 1)
+            covered = np.cumsum(delta)[:len(ids)] > 0
+
+            runs = _run_lengths(copied)
+            copy_ratio = round(float(covered.mean()), 4) if len(ids) else 0.0
+            longest_span = int(runs.max() + n - 1) if len(runs) else 0
+
+        return {"copy_ratio": copy_ratio, **novel_rates, "longest_copied_span": longest_span}
+
+
+def build_index(
+    sources: Sequence[Sequence[str]],
+    sizes: Sequence[int] = NGRAM_SIZES
+) -> NgramIndex:
+    """
+    Buduje indeks n-gramów zbioru źródeł.
+
+    Args:
+        sources: Lematy kolejnych tekstów źródłowych
+        sizes: Rozmiary n-gramów
+
+    Returns:
+        NgramIndex
+    """
+    vocab = {}
+    encoded = [
+        np.fromiter(
+            (vocab.setdefault(lemma, len(vocab) + 1) for lemma in lemmas),
+            dtype=np.uint64,
+            count=len(lemmas)
+        )
+        for lemmas in sources
+    ]
+
+    bits = len(vocab).bit_length()
+    if bits * max(sizes) > 64:
+        bits = 0
+
+    ngrams = {
+        n: np.unique(np.concatenate(
+            [ngram_keys(ids, n, bits) for ids in encoded] or [np.empty(0, dtype=np.uint64)]
+        ))
+        for n in sizes
+    }
+
+    return NgramIndex(vocab, bits, ngrams)
@@ -0,0 +1,106 @@
+"""
+pack_corpus.py - Pakowanie data/articles/** do jednego pliku korpusu
+
+Czyta wszystkie pliki <artykuł>/<wersja>.json z katalogu artykułów
+i zapisuje je w formacie corpus_pack.py (tablica offsetów + treści
+UTF-8). Metryki czytają spakowany korpus, gdy wskazuje go zmienna
+ANALYTICS_CORPUS_PACK:
+
+    python pack_corpus.py
+    ANALYTICS_CORPUS_PACK=cache/corpus.pack python run_all.py
+
+Plik trzeba zbudować ponownie po każdej zmianie artykułów.
+--verify porównuje każdy dokument z plikiem JSON i mierzy czas
+wczytania całego korpusu z katalogów i z pliku.
+
+Użycie:
+    python pack_corpus.py
+    python pack_corpus.py --articles-dir /tmp/korpus --output /tmp/korpus.pack --verify
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from common import ARTICLES_DIR, VERSIONS
+from corpus_pack import PackedCorpus, write_pack
+
+# Domyślna ścieżka spakowanego korpusu (obok cache parsowania)
+DEFAULT_PACK_PATH = Path(__file__).parent / "cache" / "corpus.pack"
+
+
+def list_article_dirs(articles_dir: Path) -> list[str]:
+    """Nazwy artykułów w katalogu (posortowane, bez ukrytych)."""
+    return sorted(
+        path.name for path in Path(articles_dir).iterdir()
+        if path.is_dir() and not path.name.startswith(".")
+    )
+
+
+def iter_article_files(articles_dir: Path, articles: list[str]):
+    """Dokumenty (artykuł, wersja, dane JSON) z katalogu artykułów."""
+    for article_name in articles:
+        for version in VERSIONS:
+            file_path = Path(articles_dir) / article_name / f"{version}.json"
+            if not file_path.exists():
+                continue
+
+            with open(file_path, "r", encoding="utf-8") as f:
+                yield article_name, version, json.load(f)
+
+
+def verify_pack(path: Path, articles_dir: Path) -> int:
+    """
+    Porównuje spakowany korpus z plikami JSON i wypisuje czasy wczytania.
+
+    Returns:
+        Liczba niezgodnych dokumentów
+    """
+    articles = list_article_dirs(articles_dir)
+
+    start = time.perf_counter()
+    from_files = {(article, version): data for article, version, data in iter_article_files(articles_dir, articles)}
+    files_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    corpus = PackedCorpus(path)
+    from_pack = {
+        (article, version): corpus.load(article, version)
+        for article in corpus.articles
+        for version in corpus.versions
+        if corpus.has(article, version)
+    }
+    pack_time = time.perf_counter() - start
+
+    mismatches = [key for key in from_files.keys() | from_pack.keys() if from_files.get(key) != from_pack.get(key)]
+    for article, version in sorted(mismatches)[:10]:
+        print(f"  NIEZGODNOŚĆ: {article}/{version}")
+
+    print(f"Dokumenty: {len(from_files)}, niezgodne: {len(mismatches)}")
+    print(f"Wczytanie korpusu: katalogi {files_time:.3f} s, plik korpusu {pack_time:.3f} s")
+
+    return len(mismatches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pakowanie artykułów do jednego pliku korpusu")
+    parser.add_argument("--articles-dir", type=Path, default=ARTICLES_DIR, help="Katalog artykułów")
+    parser.add_argument("--output", type=Path, default=DEFAULT_PACK_PATH, help="Plik korpusu")
+    parser.add_argument("--verify", action="store_true", help="Porównaj z plikami JSON i zmierz czas wczytania")
+    args = parser.parse_args()
+
+    articles = list_article_dirs(args.articles_dir)
+    stats = write_pack(args.output, articles, VERSIONS, iter_article_files(args.articles_dir, articles))
+
+    print(f"Artykuły: {stats['articles']}, dokumenty: {stats['documents']}")
+    print(f"Treści: {stats['content_bytes'] / 1024:.0f} KB, plik: {stats['file_bytes'] / 1024:.0f} KB")
+    print(f"Zapisano: {args.output}")
+    print(f"Użycie: ANALYTICS_CORPUS_PACK={args.output} python run_all.py")
+
+    if args.verify and verify_pack(args.output, args.articles_dir):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,8 @@ ZASTOSOWANIE:
 - Porównanie organizacji treści między wersjami
 """
 
-from common import (
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+from registry import Metric
+from runner import run_metrics
 
 
 def calculate_paragraph_count(text: str) -> int:
@@ -40,15 +38,16 @@ def calculate_paragraph_count(text: str) -> int:
     return len(paragraphs)
 
 
+METRIC = Metric(
+    name="paragraph_count",
+    calculate_func=calculate_paragraph_count,
+    requires=frozenset(),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="paragraph_count",
-        calculate_func=calculate_paragraph_count
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("paragraph_count", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -0,0 +1,166 @@
+"""
+parse_cache.py - Trwały cache sparsowanych dokumentów spaCy
+
+Ten moduł zawiera:
+- Zapis sparsowanych dokumentów (DocBin) do cache/parses/
+- Odczyt dokumentów z cache bez ładowania modelu spaCy
+
+Klucz cache to hash SHA-256 z nazwy modelu, wersji modelu, zestawu
+włączonych komponentów potoku i treści artykułu. Zmiana treści lub
+aktualizacja modelu unieważnia wpis. Dokument sparsowany pełnym potokiem
+obsługuje też zapytania o okrojony potok.
+
+Przy "ciepłym" uruchomieniu (wszystkie treści w cache) model nie jest
+w ogóle ładowany - do odtworzenia dokumentów wystarcza pusty słownik
+spaCy dla polskiego.
+
+Cache można wyłączyć zmienną środowiskową ANALYTICS_PARSE_CACHE=0.
+
+Użycie:
+    python parse_cache.py           # statystyki cache
+    python parse_cache.py --clear   # usunięcie cache
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import spacy
+from spacy.tokens import Doc, DocBin
+
+from common import get_model_info, get_pipeline_components
+
+# Katalog cache (obok output/)
+CACHE_DIR = Path(__file__).parent / "cache" / "parses"
+
+PARSE_CACHE_ENABLED = os.environ.get("ANALYTICS_PARSE_CACHE", "1") != "0"
+
+# Słownik do deserializacji (pusty model polski, bez wag)
+_vocab = None
+
+
+def _get_vocab():
+    """Zwraca słownik spaCy używany do odtwarzania dokumentów z cache."""
+    global _vocab
+    if _vocab is None:
+        _vocab = spacy.blank("pl").vocab
+    return _vocab
+
+
+def get_cache_key(text: str, components: list[str] | None = None) -> str:
+    """
+    Zwraca klucz cache dla tekstu.
+
+    Args:
+        text: Treść artykułu
+        components: Włączone komponenty potoku (None = pełny potok)
+
+    Returns:
+        Hash SHA-256 (hex) z nazwy i wersji modelu, komponentów i treści
+    """
+    model_name, model_version = get_model_info()
+    pipeline = "full" if components is None else ",".join(components)
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{model_name}\0{model_version}\0{pipeline}\0".encode("utf-8"))
+    hasher.update(text.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def _candidate_keys(text: str) -> list[str]:
+    """Klucze, pod którymi może leżeć dokument dla bieżącego potoku."""
+    components = get_pipeline_components()
+    keys = [get_cache_key(text, components)]
+
+    if components is not None:
+        keys.append(get_cache_key(text))
+
+    return keys
+
+
+def _cache_path(key: str) -> Path:
+    return CACHE_DIR / key[:2] / f"{key}.spacy"
+
+
+def is_cached(text: str) -> bool:
+    """Sprawdza czy tekst ma zapisany dokument w cache."""
+    return PARSE_CACHE_ENABLED and any(
+        _cache_path(key).exists() for key in _candidate_keys(text)
+    )
+
+
+def load_cached_doc(text: str) -> Doc | None:
+    """
+    Wczytuje sparsowany dokument z cache.
+
+    Args:
+        text: Treść artykułu
+
+    Returns:
+        Doc spaCy lub None, jeśli brak wpisu w cache
+    """
+    if not PARSE_CACHE_ENABLED:
+        return None
+
+    for key in _candidate_keys(text):
+        try:
+            data = _cache_path(key).read_bytes()
+        except FileNotFoundError:
+            continue
+
+        doc_bin = DocBin().from_bytes(data)
+        docs = list(doc_bin.get_docs(_get_vocab()))
+        if docs:
+            return docs[0]
+
+    return None
+
+
+def store_cached_doc(text: str, doc: Doc) -> Path | None:
+    """
+    Zapisuje sparsowany dokument do cache.
+
+    Zapis jest atomowy (plik tymczasowy + rename), więc równoległe
+    procesy nie zostawią uszkodzonych wpisów.
+
+    Args:
+        text: Treść artykułu
+        doc: Dokument spaCy sparsowany z tej treści
+
+    Returns:
+        Ścieżka do zapisanego pliku lub None, jeśli cache jest wyłączony
+    """
+    if not PARSE_CACHE_ENABLED:
+        return None
+
+    file_path = _cache_path(get_cache_key(text, get_pipeline_components()))
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    doc_bin = DocBin(store_user_data=False)
+    doc_bin.add(doc)
+
+    tmp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(doc_bin.to_bytes())
+    os.replace(tmp_path, file_path)
+
+    return file_path
+
+
+def clear_cache() -> None:
+    """Usuwa cały cache parsowania."""
+    if CACHE_DIR.exists():
+        shutil.rmtree(CACHE_DIR)
+
+
+if __name__ == "__main__":
+    if "--clear" in sys.argv:
+        clear_cache()
+        print(f"Usunięto cache: {CACHE_DIR}")
+    else:
+        files = list(CACHE_DIR.glob("*/*.spacy")) if CACHE_DIR.exists() else []
+        total_size = sum(f.stat().st_size for f in files)
+        print(f"Cache parsowania: {CACHE_DIR}")
+        print(f"  Dokumenty: {len(files)}")
+        print(f"  Rozmiar: {total_size / 1024:.1f} KB")
@@ -0,0 +1,97 @@
+"""
+pipe_engine.py - Wsadowy silnik parsowania oparty o nlp.pipe
+
+Silnik runnera dla engine="pipe" (runner._iter_pipe_results): zamiast
+wysyłać osobne zadanie (i osobne wywołanie nlp()) dla każdej pary
+(artykuł, wersja), silnik przepuszcza wszystkie niesparsowane treści
+przez nlp.pipe z konfigurowalnym batch_size i n_process. Gotowe
+dokumenty trafiają do cache procesu (register_document), a metryki są
+liczone strumieniowo - artykuł jest przetwarzany, gdy tylko wszystkie
+jego wersje są sparsowane.
+
+Treści obecne w cache parsowania nie są wysyłane do nlp.pipe.
+"""
+
+from typing import Iterator
+
+from common import get_nlp, load_article, VERSIONS
+from document import ParsedDocument, register_document
+from parse_cache import is_cached, store_cached_doc
+
+# Domyślny rozmiar wsadu dla nlp.pipe
+DEFAULT_BATCH_SIZE = 64
+
+
+def load_versions(article_name: str) -> dict[str, str]:
+    """Wczytuje treści wszystkich dostępnych wersji artykułu."""
+    contents = {}
+
+    for version in VERSIONS:
+        try:
+            data = load_article(article_name, version)
+            contents[version] = data.get("content", "")
+        except FileNotFoundError:
+            pass  # Pominąć brakujące wersje
+
+    return contents
+
+
+def iter_parsed_articles(
+    articles: list[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_process: int = 1
+) -> Iterator[tuple[str, dict[str, str]]]:
+    """
+    Parsuje artykuły wsadowo i zwraca je, gdy wszystkie wersje są gotowe.
+
+    Artykuły, których wszystkie wersje są w cache parsowania, zwracane są
+    od razu. Pozostałe treści przechodzą przez jedno wywołanie nlp.pipe.
+
+    Args:
+        articles: Nazwy artykułów
+        batch_size: Rozmiar wsadu nlp.pipe
+        n_process: Liczba procesów nlp.pipe
+
+    Yields:
+        Tuple (article_name, {wersja: treść}) - dokumenty treści są już
+        w cache procesu, więc get_document() ich nie parsuje
+    """
+    pending = {}
+    contents_by_article = {}
+    to_parse = []
+
+    for article_name in articles:
+        contents = load_versions(article_name)
+        uncached = [
+            (content, (article_name, version))
+            for version, content in contents.items()
+            if not is_cached(content)
+        ]
+
+        if uncached:
+            pending[article_name] = len(uncached)
+            contents_by_article[article_name] = contents
+            to_parse.extend(uncached)
+        else:
+            yield article_name, contents
+
+    if not to_parse:
+        return
+
+    nlp = get_nlp()
+    docs = nlp.pipe(
+        to_parse,
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=n_process
+    )
+
+    for doc, (article_name, version) in docs:
+        text = contents_by_article[article_name][version]
+        register_document(ParsedDocument(text, doc=doc))
+        store_cached_doc(text, doc)
+
+        pending[article_name] -= 1
+        if pending[article_name] == 0:
+            yield article_name, contents_by_article.pop(article_name)
+
@@ -0,0 +1,493 @@
+"""
+profiling.py - Instrumentacja przebiegu metryk (oś czasu i profile)
+
+Opcjonalne pomiary zadań liczenia metryk (runner.py). Dla każdego
+zadania (artykułu) zapisywane są:
+- etapy: load (odczyt JSON), parse (spaCy lub cache parsowania),
+  metric:<nazwa> (obliczenia metryki), serialize (pickle wyniku)
+- proces roboczy (pid) i rozmiar zserializowanego wyniku
+- czas oczekiwania w paczce (od startu paczki w procesie roboczym do
+  startu zadania)
+
+Zadania trafiają do puli w paczkach (scheduling.py), więc dla każdej
+paczki zapisywane są osobno:
+- czas oczekiwania w kolejce puli (od wysłania paczki do jej startu
+  w procesie roboczym)
+- czas powrotu wyników do procesu nadrzędnego (IPC, od końca paczki
+  do odebrania wyników - wyniki wszystkich zadań paczki wracają razem)
+
+Wyniki trafiają do output/profiling/:
+- trace.json - oś czasu w formacie Chrome trace (chrome://tracing,
+  ui.perfetto.dev), jeden wiersz na proces
+- summary.json - percentyle czasów etapów, oczekiwania, IPC i rozmiarów
+  wyników oraz obciążenie procesów roboczych
+
+Opcjonalnie każda metryka jest profilowana (cProfile lub pyinstrument),
+a profile ze wszystkich zadań są łączone w <metryka>.prof (pstats)
+lub <metryka>.html (pyinstrument).
+
+Pomiary są wyłączone domyślnie i bez nich zadania liczą się tak jak
+wcześniej. Włączanie:
+    python run_all.py --trace
+    python run_all.py --trace --profiler cprofile
+    ANALYTICS_TRACE=1 ANALYTICS_PROFILER=pyinstrument python run_all.py
+"""
+
+import cProfile
+import importlib.util
+import json
+import os
+import pickle
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+# Zmienna środowiskowa włączająca oś czasu ("1")
+TRACE_ENV = "ANALYTICS_TRACE"
+
+# Zmienna środowiskowa wybierająca profiler metryk
+PROFILER_ENV = "ANALYTICS_PROFILER"
+
+# Obsługiwane profilery metryk
+PROFILERS = ["cprofile", "pyinstrument"]
+
+# Percentyle w podsumowaniu
+PERCENTILES = [50, 95, 99]
+
+# Liczba funkcji w tekstowym raporcie profilu cProfile
+PROFILE_REPORT_LINES = 30
+
+
+@dataclass
+class ProfilingConfig:
+    """
+    Ustawienia pomiarów przekazywane do procesów roboczych.
+
+    Attributes:
+        profile_dir: Katalog wyników (trace.json, summary.json, profile)
+        profiler: "cprofile", "pyinstrument" albo None (tylko oś czasu)
+    """
+    profile_dir: Path
+    profiler: str | None = None
+
+
+def config_from_env(profile_dir: Path, trace: bool = False, profiler: str | None = None) -> ProfilingConfig | None:
+    """
+    Zwraca ustawienia pomiarów z argumentów i zmiennych środowiskowych.
+
+    Args:
+        profile_dir: Katalog wyników
+        trace: Czy włączyć oś czasu (--trace)
+        profiler: Profiler metryk (--profiler); wybranie profilera
+            włącza też oś czasu
+
+    Returns:
+        ProfilingConfig albo None, gdy pomiary są wyłączone
+
+    Raises:
+        ValueError: Dla nieznanego profilera
+        ImportError: Gdy wybrany profiler nie jest zainstalowany
+    """
+    profiler = profiler or os.environ.get(PROFILER_ENV) or None
+    trace = trace or os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+    if profiler is not None and profiler not in PROFILERS:
+        raise ValueError(f"Nieznany profiler: {profiler} (dostępne: {', '.join(PROFILERS)})")
+
+    if profiler == "pyinstrument" and importlib.util.find_spec("pyinstrument") is None:
+        raise ImportError("Profiler pyinstrument nie jest zainstalowany (pip install pyinstrument)")
+
+    if not trace and profiler is None:
+        return None
+
+    return ProfilingConfig(profile_dir=Path(profile_dir), profiler=profiler)
+
+
+def now_us() -> int:
+    """Bieżący czas w mikrosekundach (zegar wspólny dla procesów)."""
+    return time.time_ns() // 1000
+
+
+class TaskTrace:
+    """
+    Pomiary jednego zadania w procesie, który je liczy.
+
+    Obiekt jest zwracany do procesu nadrzędnego razem z wynikiem zadania
+    (jest mały - lista zdarzeń bez danych wyników).
+
+    Args:
+        task: Nazwa zadania (artykuł)
+        config: Ustawienia pomiarów
+        chunk_started_at: Start paczki puli, w której liczone jest
+            zadanie (None poza pulą)
+    """
+
+    def __init__(self, task: str, config: ProfilingConfig, chunk_started_at: int | None = None):
+        self.task = task
+        self.config = config
+        self.pid = os.getpid()
+        self.chunk_started_at = chunk_started_at
+        self.started_at = now_us()
+        self.finished_at = None
+        self.events = []
+        self.args = {}
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[dict]:
+        """
+        Mierzy etap zadania.
+
+        Zwraca słownik argumentów zdarzenia, do którego można dopisać
+        wartości znane dopiero po etapie (np. rozmiar wyniku).
+        """
+        start = now_us()
+        try:
+            yield args
+        finally:
+            self.events.append({"name": name, "ts": start, "dur": now_us() - start, "args": args})
+
+    @contextmanager
+    def profile(self, metric_name: str) -> Iterator[None]:
+        """Profiluje metrykę wybranym profilerem (bez profilera nic nie robi)."""
+        profiler = self.config.profiler
+
+        if profiler is None:
+            yield
+            return
+
+        parts_dir = self.config.profile_dir / "parts" / metric_name
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        part_path = parts_dir / f"{self.pid}-{time.time_ns()}"
+
+        if profiler == "cprofile":
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                profile.dump_stats(part_path.with_suffix(".prof"))
+        else:
+            from pyinstrument import Profiler
+
+            profile = Profiler()
+            profile.start()
+            try:
+                yield
+            finally:
+                profile.stop().save(part_path.with_suffix(".pyisession"))
+
+    def serialize(self, result: Any) -> None:
+        """Mierzy serializację wyniku tak, jak wysyła go pula procesów."""
+        with self.span("serialize") as args:
+            args["bytes"] = len(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        self.args["result_bytes"] = args["bytes"]
+
+    def finish(self) -> "TaskTrace":
+        """Kończy zadanie i zwraca pomiary."""
+        self.finished_at = now_us()
+        return self
+
+
+class ChunkTrace:
+    """
+    Pomiary paczki zadań puli w procesie roboczym.
+
+    Oczekiwanie w kolejce puli i powrót wyników (IPC) dotyczą całej
+    paczki, nie pojedynczych zadań. Obiekt wraca do procesu nadrzędnego
+    razem z wynikami paczki.
+    """
+
+    def __init__(self, config: ProfilingConfig, submitted_at: int):
+        self.config = config
+        self.pid = os.getpid()
+        self.submitted_at = submitted_at
+        self.started_at = now_us()
+        self.finished_at = None
+        self.tasks = 0
+
+    def task(self, name: str) -> TaskTrace:
+        """Rozpoczyna pomiary kolejnego zadania paczki."""
+        self.tasks += 1
+        return TaskTrace(name, self.config, self.started_at)
+
+    def finish(self) -> "ChunkTrace":
+        """Kończy paczkę (po ostatnim zadaniu) i zwraca pomiary."""
+        self.finished_at = now_us()
+        return self
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """Percentyle PERCENTILES, średnia, suma i liczba obserwacji."""
+    array = np.asarray(values, dtype=float)
+    summary = {
+        f"p{q}": round(float(value), 3)
+        for q, value in zip(PERCENTILES, np.percentile(array, PERCENTILES))
+    }
+    summary["mean"] = round(float(array.mean()), 3)
+    summary["total"] = round(float(array.sum()), 3)
+    summary["count"] = int(array.size)
+    return summary
+
+
+class TraceCollector:
+    """
+    Zbiera pomiary zadań w procesie nadrzędnym i zapisuje oś czasu,
+    podsumowanie i połączone profile.
+    """
+
+    def __init__(self, config: ProfilingConfig):
+        self.config = config
+        self.pid = os.getpid()
+        self.started_at = now_us()
+        self.tasks = []
+        self.chunks = []
+        self.events = []
+
+    def submitted(self) -> int:
+        """Znacznik czasu wysłania paczki do puli."""
+        return now_us()
+
+    def add(self, trace: TaskTrace) -> None:
+        """Dodaje pomiary zadania odebranego przez proces nadrzędny."""
+        self.tasks.append(trace)
+
+    def add_chunk(self, chunk: ChunkTrace) -> None:
+        """Dodaje pomiary paczki w chwili odebrania jej wyników."""
+        chunk.received_at = now_us()
+        self.chunks.append(chunk)
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[dict]:
+        """Mierzy etap procesu nadrzędnego (planowanie, zapis wyników)."""
+        start = now_us()
+        try:
+            yield args
+        finally:
+            self.events.append({"name": name, "ts": start, "dur": now_us() - start, "args": args})
+
+    def _worker_names(self) -> dict[int, str]:
+        pids = sorted({trace.pid for trace in [*self.tasks, *self.chunks]} - {self.pid})
+        names = {pid: f"worker-{index}" for index, pid in enumerate(pids, start=1)}
+        names[self.pid] = "main"
+        return names
+
+    def chrome_trace(self) -> dict:
+        """
+        Zwraca oś czasu w formacie Chrome trace.
+
+        Każdy proces ma wiersz zadań (tid 0) i etapów (tid 1), a powrót
+        wyników paczki do procesu nadrzędnego jest osobnym wierszem (tid 2).
+        """
+        events = []
+
+        for pid, name in self._worker_names().items():
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"{name} ({pid})"}})
+            for tid, thread_name in enumerate(["zadania", "etapy", "IPC"]):
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+
+        def _event(name: str, ts: int, dur: int, pid: int, tid: int, cat: str, args: dict) -> dict:
+            return {
+                "name": name, "cat": cat, "ph": "X",
+                "ts": ts - self.started_at, "dur": max(dur, 0),
+                "pid": pid, "tid": tid, "args": args,
+            }
+
+        for event in self.events:
+            events.append(_event(event["name"], event["ts"], event["dur"], self.pid, 0, "main", event["args"]))
+
+        for trace in self.tasks:
+            events.append(_event(
+                trace.task, trace.started_at, trace.finished_at - trace.started_at,
+                trace.pid, 0, "task", self._task_args(trace)
+            ))
+            for event in trace.events:
+                events.append(_event(
+                    event["name"], event["ts"], event["dur"], trace.pid, 1,
+                    event["name"].split(":")[0], event["args"]
+                ))
+
+        for chunk in self.chunks:
+            events.append(_event(
+                "ipc", chunk.finished_at, chunk.received_at - chunk.finished_at,
+                chunk.pid, 2, "ipc", self._chunk_args(chunk)
+            ))
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def _task_args(self, trace: TaskTrace) -> dict:
+        args = {"worker": self._worker_names()[trace.pid]}
+        if trace.chunk_started_at is not None:
+            args["chunk_wait_ms"] = round((trace.started_at - trace.chunk_started_at) / 1000, 3)
+        if "result_bytes" in trace.args:
+            args["result_bytes"] = trace.args["result_bytes"]
+        return args
+
+    def _chunk_args(self, chunk: ChunkTrace) -> dict:
+        return {
+            "worker": self._worker_names()[chunk.pid],
+            "tasks": chunk.tasks,
+            "queue_wait_ms": round((chunk.started_at - chunk.submitted_at) / 1000, 3),
+            "ipc_ms": round((chunk.received_at - chunk.finished_at) / 1000, 3),
+        }
+
+    def summary(self) -> dict:
+        """
+        Liczy podsumowanie pomiarów.
+
+        Returns:
+            Słownik {"wall_time_ms", "tasks", "chunks", "stages",
+            "queue_wait_ms", "ipc_ms" (na paczkę), "chunk_wait_ms",
+            "result_bytes" (na zadanie), "workers"}; czasy w milisekundach
+        """
+        wall_time = now_us() - self.started_at
+        names = self._worker_names()
+
+        stages = defaultdict(list)
+        workers = defaultdict(lambda: {"tasks": 0, "busy_ms": 0.0})
+        task_args = [self._task_args(trace) for trace in self.tasks]
+        chunk_args = [self._chunk_args(chunk) for chunk in self.chunks]
+
+        for trace in self.tasks:
+            for event in trace.events:
+                stages[event["name"]].append(event["dur"] / 1000)
+
+            worker = workers[names[trace.pid]]
+            worker["tasks"] += 1
+            worker["busy_ms"] += (trace.finished_at - trace.started_at) / 1000
+
+        for event in self.events:
+            stages[f"main:{event['name']}"].append(event["dur"] / 1000)
+
+        for worker in workers.values():
+            worker["busy_ms"] = round(worker["busy_ms"], 3)
+            worker["utilization"] = round(worker["busy_ms"] / (wall_time / 1000), 4) if wall_time else None
+
+        summary = {
+            "wall_time_ms": round(wall_time / 1000, 3),
+            "tasks": len(self.tasks),
+            "chunks": len(self.chunks),
+            "stages": {name: _percentiles(values) for name, values in sorted(stages.items())},
+            "workers": dict(sorted(workers.items())),
+        }
+        for measure, measured in [
+            ("queue_wait_ms", chunk_args),
+            ("ipc_ms", chunk_args),
+            ("chunk_wait_ms", task_args),
+            ("result_bytes", task_args),
+        ]:
+            values = [args[measure] for args in measured if measure in args]
+            if values:
+                summary[measure] = _percentiles(values)
+
+        return summary
+
+    def merge_profiles(self) -> list[Path]:
+        """
+        Łączy profile metryk ze wszystkich zadań w jeden plik na metrykę.
+
+        Returns:
+            Lista zapisanych plików
+        """
+        parts_root = self.config.profile_dir / "parts"
+        if not parts_root.exists():
+            return []
+
+        written = []
+        for parts_dir in sorted(path for path in parts_root.iterdir() if path.is_dir()):
+            parts = sorted(parts_dir.iterdir())
+            if not parts:
+                continue
+
+            if self.config.profiler == "cprofile":
+                path = self.config.profile_dir / f"{parts_dir.name}.prof"
+                stats = pstats.Stats(*map(str, parts))
+                stats.dump_stats(path)
+
+                with open(path.with_suffix(".txt"), "w", encoding="utf-8") as f:
+                    pstats.Stats(str(path), stream=f).sort_stats("cumulative").print_stats(PROFILE_REPORT_LINES)
+            else:
+                from pyinstrument.renderers import HTMLRenderer
+                from pyinstrument.session import Session
+
+                session = Session.load(parts[0])
+                for part in parts[1:]:
+                    session = Session.combine(session, Session.load(part))
+
+                path = self.config.profile_dir / f"{parts_dir.name}.html"
+                path.write_text(HTMLRenderer().render(session), encoding="utf-8")
+
+            for part in parts:
+                part.unlink()
+            parts_dir.rmdir()
+            written.append(path)
+
+        parts_root.rmdir()
+        return written
+
+    def write(self) -> dict:
+        """
+        Zapisuje trace.json, summary.json i połączone profile.
+
+        Returns:
+            Podsumowanie (jak summary())
+        """
+        profile_dir = self.config.profile_dir
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        summary = self.summary()
+        profiles = self.merge_profiles()
+        if profiles:
+            summary["profiles"] = [path.name for path in profiles]
+
+        with open(profile_dir / "trace.json", "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+        with open(profile_dir / "summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        return summary
+
+
+def span(trace: TaskTrace | TraceCollector | None, name: str, **args: Any):
+    """Etap zadania (lub procesu nadrzędnego) albo pusty kontekst, gdy pomiary są wyłączone."""
+    return nullcontext(args) if trace is None else trace.span(name, **args)
+
+
+def profile(trace: TaskTrace | None, metric_name: str):
+    """Profil metryki albo pusty kontekst, gdy pomiary są wyłączone."""
+    return nullcontext() if trace is None else trace.profile(metric_name)
+
+
+def print_summary(summary: dict) -> None:
+    """Wypisuje tabelę czasów etapów i obciążenie procesów roboczych."""
+    print(f"\n{'Etap':<32} {'liczba':>7} {'suma [ms]':>11} {'p50 [ms]':>10} {'p95 [ms]':>10} {'udział':>8}")
+
+    wall_time = summary["wall_time_ms"]
+    for name, stats in summary["stages"].items():
+        print(
+            f"{name:<32} {stats['count']:>7} {stats['total']:>11.1f} {stats['p50']:>10.2f} "
+            f"{stats['p95']:>10.2f} {stats['total'] / wall_time if wall_time else 0:>8.1%}"
+        )
+
+    for measure, label in [
+        ("queue_wait_ms", "kolejka puli / paczka [ms]"),
+        ("ipc_ms", "powrót wyników / paczka [ms]"),
+        ("chunk_wait_ms", "oczekiwanie w paczce [ms]"),
+        ("result_bytes", "rozmiar wyniku [B]"),
+    ]:
+        if measure in summary:
+            stats = summary[measure]
+            print(f"{label:<32} p50={stats['p50']:.2f} p95={stats['p95']:.2f} p99={stats['p99']:.2f}")
+
+    print(f"\n{'Proces':<12} {'zadania':>8} {'zajęty [ms]':>12} {'obciążenie':>11}")
+    for name, worker in summary["workers"].items():
+        print(f"{name:<12} {worker['tasks']:>8} {worker['busy_ms']:>12.1f} {worker['utilization'] or 0:>11.1%}")
+
+    print(f"\nCzas całkowity: {wall_time / 1000:.2f} s, zadania: {summary['tasks']}")
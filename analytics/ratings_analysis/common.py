@@ -4,14 +4,15 @@ Wczytuje dane z data/ratings/single.json i data/ratings/compare.json.
 """
 
 import json
+import os
 from pathlib import Path
 from typing import Dict, List, Any
 import numpy as np
 
-# Konfiguracja ścieżek
+# Konfiguracja ścieżek (można nadpisać zmiennymi środowiskowymi, np. w benchmarkach)
 BASE_DIR = Path(__file__).parent.parent.parent
-RATINGS_DIR = BASE_DIR / "data" / "ratings"
-CHARTS_OUTPUT_DIR = Path(__file__).parent / "output"
+RATINGS_DIR = Path(os.environ.get("ANALYTICS_RATINGS_DIR", BASE_DIR / "data" / "ratings"))
+CHARTS_OUTPUT_DIR = Path(os.environ.get("ANALYTICS_RATINGS_OUTPUT_DIR", Path(__file__).parent / "output"))
 
 # Pliki z danymi
 SINGLE_RATINGS_FILE = RATINGS_DIR / "single.json"
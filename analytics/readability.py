@@ -37,6 +37,9 @@ OPIS METRYK:
    - 12-14: Trudny (studia)
    - 14+: Bardzo trudny (specjalistyczny)
 
+Polskie wskaźniki (Pisarek, FOG-PL, SMOG) i wyniki per zdanie liczy
+readability_pl.py (readability_engine.py).
+
 UWAGA:
 Wzory zostały stworzone dla języka angielskiego. Dla polskiego wyniki
 mogą być przesunięte ze względu na różnice w morfologii (polski ma
@@ -48,69 +51,82 @@ ZASTOSOWANIE:
 - Porównanie czytelności różnych wersji artykułów
 """
 
-from common import (
-    get_tokens,
-    get_sentences,
-    count_syllables_polish,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+import numpy as np
+
+from document import get_document
+from readability_engine import EN_HARD_WORD_SYLLABLES, flesch_reading_ease, gunning_fog
+from registry import Metric
+from runner import run_metrics
 
 
-def calculate_flesch_reading_ease(text: str) -> float:
+def get_text_statistics(text: str) -> dict:
     """
-    Oblicza Flesch Reading Ease dla tekstu polskiego.
+    Zwraca statystyki tekstu wspólne dla wszystkich wzorów czytelności,
+    liczone z jednej tablicy sylab dokumentu.
     
     Args:
         text: Tekst do analizy
     
     Returns:
-        Wynik FRE (wyższy = łatwiejszy tekst)
+        Słownik z liczbą słów, zdań, sylab i trudnych słów
+    """
+    doc = get_document(text)
+    syllables = doc.syllables
+    
+    return {
+        "words": len(syllables),
+        "sentences": len(doc.sentences),
+        "syllables": int(syllables.sum()),
+        "hard_words": int(np.count_nonzero(syllables >= EN_HARD_WORD_SYLLABLES)),
+    }
+
+
+def calculate_flesch_reading_ease(stats: dict) -> float:
     """
-    tokens = get_tokens(text)
-    sentences = get_sentences(text)
+    Oblicza Flesch Reading Ease dla tekstu polskiego.
+    
+    Args:
+        stats: Statystyki tekstu z get_text_statistics
     
-    if len(sentences) == 0 or len(tokens) == 0:
+    Returns:
+        Wynik FRE (wyższy = łatwiejszy tekst)
+    """
+    if stats["sentences"] == 0 or stats["words"] == 0:
         return 0.0
     
     # Średnia długość zdania
-    asl = len(tokens) / len(sentences)
+    asl = stats["words"] / stats["sentences"]
     
     # Średnia liczba sylab na słowo
-    total_syllables = sum(count_syllables_polish(word) for word in tokens)
-    asw = total_syllables / len(tokens)
+    asw = stats["syllables"] / stats["words"]
     
     # Wzór Flesch Reading Ease
-    fre = 206.835 - (1.015 * asl) - (84.6 * asw)
+    fre = flesch_reading_ease(asl, asw)
     
     return round(fre, 2)
 
 
-def calculate_fog_index(text: str) -> float:
+def calculate_fog_index(stats: dict) -> float:
     """
     Oblicza Gunning Fog Index dla tekstu.
     
     Args:
-        text: Tekst do analizy
+        stats: Statystyki tekstu z get_text_statistics
     
     Returns:
         Wynik Fog Index (liczba lat edukacji)
     """
-    tokens = get_tokens(text)
-    sentences = get_sentences(text)
-    
-    if len(sentences) == 0 or len(tokens) == 0:
+    if stats["sentences"] == 0 or stats["words"] == 0:
         return 0.0
     
     # Średnia długość zdania
-    asl = len(tokens) / len(sentences)
+    asl = stats["words"] / stats["sentences"]
     
     # Procent trudnych słów (3+ sylaby)
-    hard_words = [word for word in tokens if count_syllables_polish(word) >= 3]
-    phw = (len(hard_words) / len(tokens)) * 100
+    phw = (stats["hard_words"] / stats["words"]) * 100
     
     # Wzór Gunning Fog Index
-    fog = 0.4 * (asl + phw)
+    fog = gunning_fog(asl, phw)
     
     return round(fog, 2)
 
@@ -135,8 +151,9 @@ def get_readability_level(fre: float) -> str:
 
 def calculate_readability(text: str) -> dict:
     """Oblicza wskaźniki czytelności i zwraca główną wartość."""
-    fre = calculate_flesch_reading_ease(text)
-    fog = calculate_fog_index(text)
+    stats = get_text_statistics(text)
+    fre = calculate_flesch_reading_ease(stats)
+    fog = calculate_fog_index(stats)
     
     return {
         "flesch_reading_ease": fre,
@@ -147,29 +164,27 @@ def calculate_readability(text: str) -> dict:
 
 def get_extra_data_readability(content: str) -> dict:
     """Zwraca dodatkowe dane dla readability."""
-    tokens = get_tokens(content)
-    sentences = get_sentences(content)
-    total_syllables = sum(count_syllables_polish(w) for w in tokens)
-    hard_words = [w for w in tokens if count_syllables_polish(w) >= 3]
+    stats = get_text_statistics(content)
     
     return {
-        "avg_sentence_length": round(len(tokens) / max(len(sentences), 1), 2),
-        "avg_syllables_per_word": round(total_syllables / max(len(tokens), 1), 2),
-        "hard_words_count": len(hard_words),
-        "hard_words_percent": round(len(hard_words) / max(len(tokens), 1) * 100, 2)
+        "avg_sentence_length": round(stats["words"] / max(stats["sentences"], 1), 2),
+        "avg_syllables_per_word": round(stats["syllables"] / max(stats["words"], 1), 2),
+        "hard_words_count": stats["hard_words"],
+        "hard_words_percent": round(stats["hard_words"] / max(stats["words"], 1) * 100, 2)
     }
 
 
+METRIC = Metric(
+    name="readability",
+    calculate_func=calculate_readability,
+    extra_data_func=get_extra_data_readability,
+    requires=frozenset({"tokens", "sentences"}),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="readability",
-        calculate_func=calculate_readability,
-        extra_data_func=get_extra_data_readability
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("readability", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -0,0 +1,276 @@
+"""
+readability_engine.py - Wskaźniki czytelności z jednej tablicy sylab
+
+Wszystkie wskaźniki czytelności (polskie i anglojęzyczne) liczone są
+z tych samych tablic dokumentu: sylab słów (ParsedDocument.syllables)
+i numeru zdania każdego słowa. Sumy na zdanie (słowa, sylaby, trudne
+słowa) wyznacza jedno np.bincount, więc wyniki dla całego tekstu i dla
+każdego zdania powstają w jednym przebiegu, bez ponownego parsowania
+zdań.
+
+WSKAŹNIKI TEKSTU:
+- Pisarek (nieliniowy): sqrt(ASL² + PHW²) / 2
+- Pisarek (liniowy): ASL / 3 + PHW / 3 + 1
+  gdzie ASL = średnia długość zdania, PHW = % słów 4+ sylabowych
+  (w polszczyźnie słowa 3-sylabowe są typowe, trudne są dopiero 4+)
+- FOG-PL (jak w Jasnopisie): 0.4 × (ASL + PHW)
+- Flesch Reading Ease: 206.835 - 1.015 × ASL - 84.6 × ASW
+- Gunning Fog: 0.4 × (ASL + % słów 3+ sylabowych)
+- SMOG: 1.043 × sqrt(słowa 3+ sylabowe × 30 / zdania) + 3.1291
+
+Wyniki Pisarka i FOG-PL odpowiadają w przybliżeniu liczbie lat nauki
+(skala PISAREK_LEVELS).
+
+WSKAŹNIKI ZDAŃ:
+Dla każdego zdania: zakres znaków w tekście, liczba słów, sylab, trudnych
+słów oraz Pisarek i FOG-PL zdania - do podświetlania trudnych zdań
+we frontendzie (utils/highlightedHtml.tsx).
+
+Użycie:
+    arrays = build_sentence_arrays(get_document(text))
+    document_scores(arrays)        # {"pisarek": ..., "fog_pl": ..., "smog": ...}
+    sentence_scores(arrays)        # {"pisarek": array, "fog_pl": array}
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from document import ParsedDocument
+
+# Minimalna liczba sylab trudnego słowa w polskich wzorach (Pisarek, FOG-PL)
+PL_HARD_WORD_SYLLABLES = 4
+
+# Minimalna liczba sylab trudnego słowa we wzorach anglojęzycznych (Fog, SMOG)
+EN_HARD_WORD_SYLLABLES = 3
+
+# Poziomy trudności wg wskaźnika Pisarka (górna granica, etykieta)
+PISAREK_LEVELS = [
+    (7, "bardzo_łatwy"),       # szkoła podstawowa, klasy 1-6
+    (10, "łatwy"),             # klasy 7-9
+    (13, "średni"),            # szkoła średnia
+    (16, "trudny"),            # studia
+    (float("inf"), "bardzo_trudny"),
+]
+
+# Próg wskaźnika Pisarka, od którego zdanie uznawane jest za trudne
+HARD_SENTENCE_PISAREK = 13
+
+
+@dataclass
+class SentenceArrays:
+    """
+    Tablice zdań dokumentu (jeden element = jedno niepuste zdanie).
+
+    Attributes:
+        starts: Początek zdania w tekście (indeks znaku)
+        ends: Koniec zdania w tekście (indeks znaku, wyłącznie)
+        words: Liczba słów
+        syllables: Liczba sylab
+        hard_words: Liczba słów PL_HARD_WORD_SYLLABLES+ sylabowych
+        polysyllables: Liczba słów EN_HARD_WORD_SYLLABLES+ sylabowych
+    """
+    starts: np.ndarray
+    ends: np.ndarray
+    words: np.ndarray
+    syllables: np.ndarray
+    hard_words: np.ndarray
+    polysyllables: np.ndarray
+
+
+def build_sentence_arrays(doc: ParsedDocument) -> SentenceArrays:
+    """
+    Buduje tablice zdań z tablicy sylab i granic zdań dokumentu
+    (ParsedDocument.sentence_offsets i sentence_spans - bez obiektów spaCy).
+
+    Zdania puste (same białe znaki) są pomijane - tak jak
+    w ParsedDocument.sentences.
+
+    Args:
+        doc: Sparsowany dokument
+
+    Returns:
+        SentenceArrays
+    """
+    spans = doc.sentence_spans
+    n_sentences = len(spans)
+
+    # Numer zdania każdego słowa (granice zdań w indeksach słów)
+    word_sentence = np.repeat(np.arange(n_sentences), np.diff(doc.sentence_offsets))
+
+    syllables = doc.syllables
+    if n_sentences == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return SentenceArrays(empty, empty, empty, empty, empty, empty)
+
+    def _per_sentence(weights: np.ndarray | None = None) -> np.ndarray:
+        return np.bincount(word_sentence, weights=weights, minlength=n_sentences).astype(np.int64)
+
+    return SentenceArrays(
+        starts=spans[:, 0].copy(),
+        ends=spans[:, 1].copy(),
+        words=_per_sentence(),
+        syllables=_per_sentence(syllables),
+        hard_words=_per_sentence(syllables >= PL_HARD_WORD_SYLLABLES),
+        polysyllables=_per_sentence(syllables >= EN_HARD_WORD_SYLLABLES),
+    )
+
+
+def pisarek(asl: np.ndarray | float, phw: np.ndarray | float) -> np.ndarray | float:
+    """Nieliniowy wskaźnik Pisarka."""
+    return np.sqrt(np.square(asl) + np.square(phw)) / 2
+
+
+def pisarek_linear(asl: float, phw: float) -> float:
+    """Liniowy wskaźnik Pisarka."""
+    return asl / 3 + phw / 3 + 1
+
+
+def fog_pl(asl: np.ndarray | float, phw: np.ndarray | float) -> np.ndarray | float:
+    """FOG-PL (Gunning Fog z progiem trudnych słów 4+ sylaby)."""
+    return 0.4 * (asl + phw)
+
+
+def flesch_reading_ease(asl: float, asw: float) -> float:
+    """Flesch Reading Ease."""
+    return 206.835 - (1.015 * asl) - (84.6 * asw)
+
+
+def gunning_fog(asl: float, polysyllable_percent: float) -> float:
+    """Gunning Fog Index."""
+    return 0.4 * (asl + polysyllable_percent)
+
+
+def smog(polysyllables: int, sentences: int) -> float:
+    """SMOG (McLaughlin) przeskalowany do 30 zdań."""
+    return 1.043 * np.sqrt(polysyllables * 30 / sentences) + 3.1291
+
+
+def pisarek_level(value: float) -> str:
+    """Zwraca poziom trudności dla wskaźnika Pisarka."""
+    for upper_bound, label in PISAREK_LEVELS:
+        if value < upper_bound:
+            return label
+    return PISAREK_LEVELS[-1][1]
+
+
+def document_scores(arrays: SentenceArrays) -> dict[str, float | str]:
+    """
+    Oblicza wskaźniki czytelności całego tekstu.
+
+    Args:
+        arrays: Tablice zdań dokumentu
+
+    Returns:
+        Słownik wskaźników (zaokrąglonych do 2 miejsc) i poziom trudności;
+        wartości 0.0, gdy tekst nie ma słów
+    """
+    words = int(arrays.words.sum())
+    sentences = len(arrays.words)
+
+    if words == 0 or sentences == 0:
+        return {
+            "pisarek": 0.0,
+            "pisarek_linear": 0.0,
+            "fog_pl": 0.0,
+            "flesch_reading_ease": 0.0,
+            "fog_index": 0.0,
+            "smog": 0.0,
+            "pisarek_level": pisarek_level(0.0),
+        }
+
+    asl = words / sentences
+    asw = int(arrays.syllables.sum()) / words
+    phw = int(arrays.hard_words.sum()) / words * 100
+    polysyllables = int(arrays.polysyllables.sum())
+
+    pisarek_value = float(pisarek(asl, phw))
+
+    return {
+        "pisarek": round(pisarek_value, 2),
+        "pisarek_linear": round(pisarek_linear(asl, phw), 2),
+        "fog_pl": round(float(fog_pl(asl, phw)), 2),
+        "flesch_reading_ease": round(flesch_reading_ease(asl, asw), 2),
+        "fog_index": round(gunning_fog(asl, polysyllables / words * 100), 2),
+        "smog": round(float(smog(polysyllables, sentences)), 2),
+        "pisarek_level": pisarek_level(pisarek_value),
+    }
+
+
+def sentence_scores(arrays: SentenceArrays) -> dict[str, np.ndarray]:
+    """
+    Oblicza wskaźniki Pisarka i FOG-PL każdego zdania (wektorowo).
+
+    Długością zdania jest jego liczba słów, a PHW - odsetek trudnych słów
+    w zdaniu (0 dla zdań bez słów).
+
+    Returns:
+        Słownik {"pisarek": tablica, "fog_pl": tablica}
+    """
+    words = arrays.words.astype(float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        phw = np.where(words > 0, arrays.hard_words / words * 100, 0.0)
+
+    return {
+        "pisarek": pisarek(words, phw),
+        "fog_pl": fog_pl(words, phw),
+    }
+
+
+def sentence_distribution(arrays: SentenceArrays) -> dict:
+    """
+    Rozkład trudności zdań: percentyle wskaźnika Pisarka zdań, odsetek
+    zdań trudnych i liczba zdań na poziomie trudności.
+    """
+    scores = sentence_scores(arrays)["pisarek"]
+
+    if scores.size == 0:
+        return {"sentences": 0}
+
+    p50, p90 = np.percentile(scores, [50, 90])
+    levels = [pisarek_level(value) for value in scores]
+
+    return {
+        "sentences": int(scores.size),
+        "pisarek_p50": round(float(p50), 2),
+        "pisarek_p90": round(float(p90), 2),
+        "pisarek_max": round(float(scores.max()), 2),
+        "hard_sentences_percent": round(float(np.mean(scores >= HARD_SENTENCE_PISAREK)) * 100, 2),
+        "levels": {label: levels.count(label) for _, label in PISAREK_LEVELS},
+    }
+
+
+def sentence_report(text: str, arrays: SentenceArrays) -> list[dict]:
+    """
+    Wyniki każdego zdania do podświetlania trudnych zdań we frontendzie.
+
+    Args:
+        text: Tekst dokumentu
+        arrays: Tablice zdań dokumentu
+
+    Returns:
+        Lista {"index", "start", "end", "text", "words", "syllables",
+        "hard_words", "pisarek", "fog_pl", "level", "is_hard"}
+    """
+    scores = sentence_scores(arrays)
+
+    return [
+        {
+            "index": index,
+            "start": int(start),
+            "end": int(end),
+            "text": text[start:end].strip(),
+            "words": int(words),
+            "syllables": int(syllables),
+            "hard_words": int(hard_words),
+            "pisarek": round(float(pisarek_value), 2),
+            "fog_pl": round(float(fog_value), 2),
+            "level": pisarek_level(pisarek_value),
+            "is_hard": bool(pisarek_value >= HARD_SENTENCE_PISAREK),
+        }
+        for index, (start, end, words, syllables, hard_words, pisarek_value, fog_value) in enumerate(zip(
+            arrays.starts, arrays.ends, arrays.words, arrays.syllables, arrays.hard_words,
+            scores["pisarek"], scores["fog_pl"]
+        ))
+    ]
@@ -0,0 +1,127 @@
+"""
+readability_pl.py - Polskie wskaźniki czytelności (Pisarek, FOG-PL, SMOG)
+
+OPIS METRYK:
+
+1. WSKAŹNIK PISARKA
+   Polska formuła czytelności (W. Pisarek), oparta na średniej długości
+   zdania i odsetku trudnych słów (4+ sylaby).
+
+   WZORY:
+   Pisarek (nieliniowy) = sqrt(ASL² + PHW²) / 2
+   Pisarek (liniowy) = ASL / 3 + PHW / 3 + 1
+
+   INTERPRETACJA (przybliżona liczba lat nauki):
+   - < 7: Bardzo łatwy (szkoła podstawowa, klasy 1-6)
+   - 7-9: Łatwy (klasy 7-9)
+   - 10-12: Średni (szkoła średnia)
+   - 13-15: Trudny (studia)
+   - 16+: Bardzo trudny (specjalistyczny)
+
+2. FOG-PL (jak w Jasnopisie)
+   Gunning Fog z progiem trudnych słów dostosowanym do polszczyzny:
+   FOG-PL = 0.4 × (ASL + PHW), gdzie PHW = % słów 4+ sylabowych
+
+3. FRE, GUNNING FOG, SMOG
+   Wzory anglojęzyczne (słowa trudne = 3+ sylaby) - do porównań
+   z readability.py i literaturą.
+
+4. ROZKŁAD TRUDNOŚCI ZDAŃ (extra_data)
+   Percentyle wskaźnika Pisarka liczonego dla każdego zdania, odsetek
+   zdań trudnych i liczba zdań na poziomach trudności.
+
+Wszystkie wskaźniki liczone są z jednej tablicy sylab i numerów zdań
+(readability_engine.py). Wyniki dla każdego zdania (zakres znaków,
+Pisarek, FOG-PL, czy trudne) eksportuje:
+
+    python readability_pl.py --sentences
+
+do output/readability_pl/sentences/<artykuł>/<wersja>.json - do
+podświetlania trudnych zdań we frontendzie (utils/highlightedHtml.tsx).
+
+ZASTOSOWANIE:
+- Ocena czytelności wzorami kalibrowanymi dla języka polskiego
+- Wskazanie konkretnych trudnych zdań w wersjach dla dzieci
+"""
+
+import argparse
+import json
+
+from common import OUTPUT_DIR, load_all_articles
+from document import get_document
+from readability_engine import (
+    build_sentence_arrays,
+    document_scores,
+    sentence_distribution,
+    sentence_report,
+)
+from registry import Metric
+from runner import run_metrics
+
+
+def calculate_readability_pl(text: str) -> dict:
+    """
+    Oblicza polskie i anglojęzyczne wskaźniki czytelności tekstu.
+
+    Args:
+        text: Tekst do analizy
+
+    Returns:
+        Słownik wskaźników i poziom trudności (wg Pisarka)
+    """
+    return document_scores(build_sentence_arrays(get_document(text)))
+
+
+def get_extra_data_readability_pl(content: str) -> dict:
+    """Zwraca rozkład trudności zdań."""
+    return sentence_distribution(build_sentence_arrays(get_document(content)))
+
+
+def export_sentence_reports() -> int:
+    """
+    Zapisuje wyniki per zdanie dla wszystkich artykułów i wersji.
+
+    Returns:
+        Liczba zapisanych plików
+    """
+    count = 0
+
+    for article_name, version, data in load_all_articles():
+        content = data.get("content", "")
+        sentences = sentence_report(content, build_sentence_arrays(get_document(content)))
+
+        file_path = OUTPUT_DIR / METRIC.name / "sentences" / article_name / f"{version}.json"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"article": article_name, "version": version, "sentences": sentences}, f, ensure_ascii=False, indent=2)
+
+        count += 1
+
+    return count
+
+
+METRIC = Metric(
+    name="readability_pl",
+    calculate_func=calculate_readability_pl,
+    extra_data_func=get_extra_data_readability_pl,
+    requires=frozenset({"tokens", "sentences"}),
+)
+
+
+def process_all_articles():
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
+
+    print("\nZakończono!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polskie wskaźniki czytelności")
+    parser.add_argument("--sentences", action="store_true", help="Eksportuj wyniki per zdanie (dla frontendu)")
+    args = parser.parse_args()
+
+    if args.sentences:
+        count = export_sentence_reports()
+        print(f"Zapisano wyniki zdań dla {count} dokumentów w: {OUTPUT_DIR / METRIC.name / 'sentences'}")
+    else:
+        process_all_articles()
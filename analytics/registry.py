@@ -0,0 +1,135 @@
+"""
+registry.py - Rejestr metryk NLP
+
+Każdy moduł metryki definiuje na poziomie modułu obiekt METRIC (instancję
+Metric), opisujący jak policzyć metrykę. Rejestr importuje moduły metryk
+(raz na proces) i zwraca ich definicje, dzięki czemu runner może policzyć
+wiele metryk w jednym przebiegu po korpusie.
+
+Rodzaje metryk:
+- per wersja: calculate_func(tekst) -> wartość (+ opcjonalne extra_data_func)
+- porównawcze: compare_func({wersja: tekst}) -> {para_wersji: wartość}
+- korpusowe porównawcze: corpus_func({artykuł: {wersja: tekst}})
+  -> {artykuł: {para_wersji: wartość}} - liczone raz dla całego korpusu
+  (np. TF-IDF ze wspólnym IDF), w procesie nadrzędnym; wartości mogą też
+  być per wersja ({wersja: {miara: wartość}}, np. porównanie ze źródłami)
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from common import PIPELINE_REQUIREMENTS
+
+# Moduły metryk w kolejności uruchamiania
+METRIC_MODULES = [
+    "word_count",
+    "sentence_count",
+    "avg_sentence_length",
+    "readability",
+    "readability_pl",
+    "ttr",
+    "mtld",
+    "lexical_density",
+    "paragraph_count",
+    "avg_word_length",
+    "jaccard_similarity",
+    "tfidf_overlap",
+    "source_faithfulness",
+    "generation_cost",
+]
+
+
+@dataclass
+class Metric:
+    """
+    Definicja metryki.
+
+    Attributes:
+        name: Nazwa metryki (katalog w output/)
+        calculate_func: Funkcja tekst -> wartość (metryki per wersja)
+        extra_data_func: Opcjonalna funkcja tekst -> dodatkowe dane
+        compare_func: Funkcja {wersja: tekst} -> porównania (metryki porównawcze)
+        corpus_func: Funkcja {artykuł: {wersja: tekst}} -> {artykuł: porównania}
+            (metryki porównawcze liczone na całym korpusie naraz)
+        source_func: Opcjonalna funkcja artykuł -> teksty źródłowe, z których
+            korzysta metryka korpusowa (ich hash wchodzi do hasha wejścia)
+        comparison_extra: Stałe dodatkowe dane zapisywane z porównaniami
+        requires: Widoki dokumentu używane przez metrykę (klucze
+            PIPELINE_REQUIREMENTS) - runner włącza tylko potrzebne
+            komponenty spaCy; pusty zbiór = metryka nie używa spaCy
+    """
+    name: str
+    calculate_func: Callable[[str], Any] | None = None
+    extra_data_func: Callable[[str], dict] | None = None
+    compare_func: Callable[[dict[str, str]], dict] | None = None
+    corpus_func: Callable[[dict[str, dict[str, str]]], dict[str, dict]] | None = None
+    source_func: Callable[[str], list[str]] | None = None
+    comparison_extra: dict | None = None
+    requires: frozenset[str] = frozenset(PIPELINE_REQUIREMENTS)
+
+    @property
+    def is_comparison(self) -> bool:
+        """Czy metryka porównuje wersje artykułu."""
+        return self.compare_func is not None or self.corpus_func is not None
+
+    @property
+    def is_corpus(self) -> bool:
+        """Czy metryka jest liczona raz dla całego korpusu."""
+        return self.corpus_func is not None
+
+
+def get_metric(name: str) -> Metric:
+    """
+    Zwraca definicję metryki o podanej nazwie.
+
+    Args:
+        name: Nazwa metryki (równa nazwie modułu)
+
+    Returns:
+        Obiekt Metric z modułu metryki
+    """
+    if name not in METRIC_MODULES:
+        raise KeyError(
+            f"Nieznana metryka: {name}. Dostępne: {', '.join(METRIC_MODULES)}"
+        )
+
+    module = importlib.import_module(name)
+    return module.METRIC
+
+
+def get_metrics(names: list[str] | None = None) -> list[Metric]:
+    """
+    Zwraca definicje wybranych metryk w kolejności uruchamiania.
+
+    Args:
+        names: Nazwy metryk (None = wszystkie)
+
+    Returns:
+        Lista obiektów Metric
+    """
+    selected = METRIC_MODULES if names is None else [
+        module_name for module_name in METRIC_MODULES if module_name in names
+    ]
+
+    unknown = set(names or []) - set(METRIC_MODULES)
+    if unknown:
+        raise KeyError(
+            f"Nieznane metryki: {', '.join(sorted(unknown))}. "
+            f"Dostępne: {', '.join(METRIC_MODULES)}"
+        )
+
+    return [get_metric(module_name) for module_name in selected]
+
+
+def get_requirements(metrics: list[Metric]) -> frozenset[str]:
+    """
+    Zwraca sumę widoków dokumentu wymaganych przez metryki.
+
+    Args:
+        metrics: Lista metryk
+
+    Returns:
+        Zbiór kluczy PIPELINE_REQUIREMENTS
+    """
+    return frozenset().union(*(metric.requires for metric in metrics))
@@ -0,0 +1,161 @@
+"""
+result_writer.py - Zbiorczy zapis wyników do plików JSON Lines
+
+Dotychczasowy format JSON (save_metric_result itd.) to osobny plik
+z wcięciami na każdy wynik: przy 100k dokumentów setki tysięcy małych
+zapisów (i wywołań mkdir). Ten moduł zapisuje wszystkie wyniki metryki
+do jednego pliku (shardu):
+
+    output/<metryka>/results.jsonl       (jeden wynik na linię)
+    output/<metryka>/results.jsonl.gz    (skompresowany, compress=True)
+
+Wiersze są kodowane szybkim enkoderem (orjson, jeśli jest zainstalowany;
+w przeciwnym razie json), buforowane i zapisywane do pliku
+tymczasowego, który na końcu zastępuje shard przez rename - czytelnik
+nigdy nie widzi pliku zapisanego w połowie.
+
+Wiersz shardu ma pola jak pliki per wynik: metric, article, version
+(None dla porównań), value, extra, computed_at.
+
+Użycie:
+    with BulkResultWriter(shard_path(OUTPUT_DIR, "word_count")) as writer:
+        writer.write({"metric": "word_count", ...})
+
+    for record in read_shard(path):
+        ...
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Nazwa shardu wyników metryki
+SHARD_FILENAME = "results.jsonl"
+
+# Rozszerzenie skompresowanego shardu
+COMPRESSED_SUFFIX = ".gz"
+
+# Rozmiar bufora zapisu (bajty)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Poziom kompresji gzip (szybki - shard jest zapisywany przy każdym przebiegu)
+COMPRESS_LEVEL = 3
+
+
+def _encode_json(record: Any) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _encode_orjson(record: Any) -> bytes:
+    return orjson.dumps(
+        record,
+        option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+
+# Enkodery wierszy (rekord -> linia JSON zakończona \n)
+ENCODERS: dict[str, Callable[[Any], bytes]] = {"json": _encode_json}
+if orjson is not None:
+    ENCODERS["orjson"] = _encode_orjson
+
+DEFAULT_ENCODER = "orjson" if orjson is not None else "json"
+
+
+def shard_path(output_dir: Path, metric_name: str, compress: bool = False) -> Path:
+    """Zwraca ścieżkę shardu wyników metryki."""
+    return Path(output_dir) / metric_name / (SHARD_FILENAME + (COMPRESSED_SUFFIX if compress else ""))
+
+
+class BulkResultWriter:
+    """
+    Buforowany zapis rekordów do pliku JSON Lines z atomową podmianą.
+
+    Plik docelowy powstaje dopiero przy close() (rename pliku
+    tymczasowego); przy wyjątku w bloku with plik tymczasowy jest
+    usuwany, a poprzednia wersja shardu zostaje bez zmian.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        compress: bool | None = None,
+        encoder: str = DEFAULT_ENCODER,
+        buffer_size: int = WRITE_BUFFER_SIZE
+    ):
+        """
+        Args:
+            path: Ścieżka pliku docelowego
+            compress: Kompresja gzip (None = wg rozszerzenia .gz)
+            encoder: Nazwa enkodera z ENCODERS
+            buffer_size: Rozmiar bufora zapisu
+        """
+        self.path = Path(path)
+        self.compress = self.path.suffix == COMPRESSED_SUFFIX if compress is None else compress
+        self.encode = ENCODERS[encoder]
+        self.count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+
+        self._raw = open(self.tmp_path, "wb", buffering=buffer_size)
+        self._file = self._raw
+        if self.compress:
+            self._file = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=COMPRESS_LEVEL, mtime=0)
+
+    def write(self, record: Any) -> None:
+        """Dopisuje rekord (jedna linia)."""
+        self._file.write(self.encode(record))
+        self.count += 1
+
+    def write_many(self, records: Iterator[Any]) -> None:
+        """Dopisuje rekordy."""
+        for record in records:
+            self.write(record)
+
+    def close(self) -> Path:
+        """Kończy zapis i podmienia plik docelowy."""
+        if self.compress:
+            self._file.close()
+        self._raw.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Przerywa zapis i usuwa plik tymczasowy."""
+        if self.compress:
+            self._file.close()
+        self._raw.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "BulkResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def read_shard(path: Path) -> Iterator[dict]:
+    """
+    Czyta rekordy shardu (także skompresowanego).
+
+    Yields:
+        Rekord (słownik) dla każdej linii
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == COMPRESSED_SUFFIX else open
+    loads = orjson.loads if orjson is not None else json.loads
+
+    with opener(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
@@ -0,0 +1,196 @@
+"""
+results_store.py - Kolumnowy magazyn wyników metryk (Parquet)
+
+Wszystkie wyniki metryk trafiają do jednej tabeli output/results.parquet
+zapisywanej jednym zapisem. Jeden wiersz to jedno pole wyniku:
+
+    article | version | metric | field | value | label | computed_at
+
+- version: wersja artykułu lub para wersji (metryki porównawcze,
+  np. "adult_full__adult_short")
+- field: "value" dla wyników skalarnych, klucz słownika dla wyników
+  złożonych (np. "ttr_tokens"), "extra.<klucz>" dla danych dodatkowych
+- value: wartość liczbowa (float64)
+- label: wartość tekstowa (np. readability_level), gdy pole nie jest liczbą
+
+Moduł nie importuje common.py - korzystają z niego też skrypty wykresów
+(charts/), które mają własny moduł common.
+
+Odczyt z projekcją kolumn i filtrem metryk:
+    table = read_results(path, metrics=["mtld", "word_count"],
+                         columns=["article", "version", "metric", "field", "value"])
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+RESULTS_FILENAME = "results.parquet"
+
+# Prefiks pól z danymi dodatkowymi (extra_data)
+EXTRA_PREFIX = "extra."
+
+SCHEMA = pa.schema([
+    ("article", pa.string()),
+    ("version", pa.string()),
+    ("metric", pa.string()),
+    ("field", pa.string()),
+    ("value", pa.float64()),
+    ("label", pa.string()),
+    ("computed_at", pa.timestamp("us")),
+])
+
+
+def _field_row(
+    article_name: str,
+    version: str,
+    metric_name: str,
+    field: str,
+    value: Any,
+    computed_at: datetime | None
+) -> dict:
+    """Tworzy wiersz tabeli dla jednego pola wyniku."""
+    numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    if numeric:
+        label = None
+    elif isinstance(value, str) or value is None:
+        label = value
+    else:
+        label = json.dumps(value, ensure_ascii=False)
+
+    return {
+        "article": article_name,
+        "version": version,
+        "metric": metric_name,
+        "field": field,
+        "value": float(value) if numeric else None,
+        "label": label,
+        "computed_at": computed_at,
+    }
+
+
+def flatten_result(
+    metric_name: str,
+    article_name: str,
+    version: str | None,
+    value: Any,
+    extra: dict | None = None,
+    computed_at: datetime | None = None
+) -> list[dict]:
+    """
+    Zamienia wynik metryki na wiersze tabeli.
+
+    Args:
+        metric_name: Nazwa metryki
+        article_name: Nazwa artykułu
+        version: Wersja artykułu (None dla metryk porównawczych)
+        value: Wartość metryki (dla porównań: {para_wersji: wartość})
+        extra: Dodatkowe dane
+        computed_at: Czas obliczenia
+
+    Returns:
+        Lista wierszy (słowników zgodnych ze SCHEMA)
+    """
+    if version is None:
+        versions = dict(value)
+    else:
+        versions = {version: value}
+
+    rows = []
+    for row_version, row_value in versions.items():
+        if isinstance(row_value, dict):
+            fields = row_value
+        else:
+            fields = {"value": row_value}
+
+        for key, field_value in {
+            **fields,
+            **{f"{EXTRA_PREFIX}{key}": v for key, v in (extra or {}).items()},
+        }.items():
+            rows.append(_field_row(article_name, row_version, metric_name, key, field_value, computed_at))
+
+    return rows
+
+
+def build_table(rows: Iterable[dict]) -> pa.Table:
+    """Buduje tabelę Arrow z wierszy."""
+    return pa.Table.from_pylist(list(rows), schema=SCHEMA)
+
+
+def write_table(table: pa.Table, path: Path) -> Path:
+    """
+    Zapisuje tabelę wyników jednym zapisem (plik tymczasowy + rename).
+
+    Args:
+        table: Tabela zgodna ze SCHEMA
+        path: Ścieżka pliku .parquet
+
+    Returns:
+        Ścieżka do zapisanego pliku
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+    return path
+
+
+def read_results(
+    path: Path,
+    metrics: list[str] | None = None,
+    columns: list[str] | None = None
+) -> pa.Table:
+    """
+    Wczytuje tabelę wyników z projekcją kolumn.
+
+    Args:
+        path: Ścieżka pliku .parquet
+        metrics: Metryki do wczytania (None = wszystkie)
+        columns: Kolumny do wczytania (None = wszystkie)
+
+    Returns:
+        Tabela Arrow
+    """
+    filters = [("metric", "in", metrics)] if metrics else None
+    return pq.read_table(path, columns=columns, filters=filters)
+
+
+def to_aggregated(rows: Iterable[dict]) -> dict[str, dict[str, Any]]:
+    """
+    Odtwarza strukturę danych z aggregated.json ({artykuł: {wersja: wartość}})
+    z wierszy jednej metryki. Pola "extra.*" są pomijane.
+
+    Args:
+        rows: Wiersze tabeli (np. table.to_pylist()) z kolumnami
+            article, version, field, value i label
+
+    Returns:
+        Słownik {artykuł: {wersja: wartość lub {pole: wartość}}}
+    """
+    aggregated = {}
+
+    for row in rows:
+        field = row["field"]
+        if field.startswith(EXTRA_PREFIX):
+            continue
+
+        value = row["value"] if row["value"] is not None else row["label"]
+        fields = aggregated.setdefault(row["article"], {}).setdefault(row["version"], {})
+        fields[field] = value
+
+    return {
+        article_name: {
+            version: fields["value"] if list(fields) == ["value"] else fields
+            for version, fields in versions.items()
+        }
+        for article_name, versions in aggregated.items()
+    }
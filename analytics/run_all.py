@@ -3,79 +3,119 @@ run_all.py - Uruchamia wszystkie metryki NLP
 
 Użycie:
     python run_all.py
+    python run_all.py --metrics word_count readability ttr
+    python run_all.py --workers 4
+    python run_all.py --engine pipe --batch-size 32 --n-process 4
+    python run_all.py --engine shared --workers 4
+    python run_all.py --force
+    python run_all.py --sinks parquet json
+    python run_all.py --sinks parquet jsonl_gz
+    python run_all.py --trace --profiler cprofile
 
-Uruchamia kolejno wszystkie skrypty analityczne i zapisuje wyniki do output/.
+Liczy wybrane metryki (domyślnie wszystkie) w jednym procesie nadrzędnym
+i jednym przebiegu po korpusie, a wyniki zapisuje do output/.
+Przeliczane są tylko wpisy, których treść lub kod metryki zmieniły się
+od poprzedniego uruchomienia (output/manifest.json). Domyślnie wyniki
+trafiają do tabeli output/results.parquet; dotychczasowe pliki JSON
+można włączyć ujściem "json", a zbiorcze pliki JSON Lines (jeden na
+metrykę, opcjonalnie skompresowany) ujściem "jsonl" / "jsonl_gz".
+
+--trace zapisuje oś czasu etapów zadań (Chrome trace) i podsumowanie
+do output/profiling/ (profiling.py), a --profiler dodaje profile metryk.
 """
 
-import subprocess
-import sys
-from pathlib import Path
+import argparse
+
+from common import OUTPUT_DIR
+from pipe_engine import DEFAULT_BATCH_SIZE
+from profiling import config_from_env, PROFILERS
+from registry import METRIC_MODULES
+from runner import ENGINES, PROFILING_DIR, run_metrics
+from sinks import DEFAULT_SINKS, SINKS
 
-# Lista skryptów do uruchomienia
-SCRIPTS = [
-    "word_count.py",
-    "sentence_count.py",
-    "avg_sentence_length.py",
-    "readability.py",
-    "ttr.py",
-    "mtld.py",
-    "lexical_density.py",
-    "paragraph_count.py",
-    "avg_word_length.py",
-    "jaccard_similarity.py",
-    "tfidf_overlap.py",
-]
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Uruchamia metryki NLP")
+    parser.add_argument(
+        "--metrics",
+        nargs="+",
+        choices=METRIC_MODULES,
+        help="Metryki do policzenia (domyślnie wszystkie)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Liczba procesów (domyślnie liczba CPU)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="pool",
+        help="Silnik: pula procesów (pool), wsadowe nlp.pipe (pipe) lub nlp.pipe + pula na wspólnej pamięci (shared)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rozmiar wsadu nlp.pipe (silniki pipe i shared)"
+    )
+    parser.add_argument(
+        "--n-process",
+        type=int,
+        default=1,
+        help="Liczba procesów nlp.pipe (silniki pipe i shared)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Przelicz wszystkie wpisy, ignorując manifest"
+    )
+    parser.add_argument(
+        "--sinks",
+        nargs="+",
+        choices=list(SINKS),
+        default=DEFAULT_SINKS,
+        help="Ujścia wyników: tabela Parquet, pliki JSON i/lub JSON Lines (domyślnie parquet)"
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Zapisz oś czasu etapów zadań i podsumowanie do output/profiling/"
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=PROFILERS,
+        default=None,
+        help="Profiluj każdą metrykę (cProfile lub pyinstrument; włącza --trace)"
+    )
+    return parser.parse_args()
 
 
 def main():
-    script_dir = Path(__file__).parent
-    
+    args = parse_args()
+
     print("=" * 60)
     print("URUCHAMIANIE WSZYSTKICH METRYK NLP")
     print("=" * 60)
-    
-    failed = []
-    
-    for script_name in SCRIPTS:
-        script_path = script_dir / script_name
-        
-        print(f"\n{'=' * 60}")
-        print(f"▶ {script_name}")
-        print("=" * 60)
-        
-        if not script_path.exists():
-            print(f"  POMINIĘTO - plik nie istnieje")
-            continue
-        
-        try:
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                cwd=str(script_dir),
-                capture_output=False
-            )
-            
-            if result.returncode != 0:
-                failed.append(script_name)
-                print(f"  BŁĄD (kod: {result.returncode})")
-                
-        except Exception as e:
-            failed.append(script_name)
-            print(f"  BŁĄD: {e}")
-    
+
+    run_metrics(
+        metric_names=args.metrics,
+        max_workers=args.workers,
+        engine=args.engine,
+        batch_size=args.batch_size,
+        n_process=args.n_process,
+        force=args.force,
+        sinks=args.sinks,
+        profiling=config_from_env(PROFILING_DIR, args.trace, args.profiler)
+    )
+
     print("\n" + "=" * 60)
     print("PODSUMOWANIE")
     print("=" * 60)
-    
-    if failed:
-        print(f"Błędy w {len(failed)} skryptach:")
-        for name in failed:
-            print(f"  - {name}")
-    else:
-        print("✓ Wszystkie skrypty wykonane pomyślnie!")
-    
-    print(f"\nWyniki zapisane w: {script_dir / 'output'}")
+    print("✓ Zakończono!")
+    print(f"\nWyniki zapisane w: {OUTPUT_DIR}")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,714 @@
+"""
+runner.py - Runner liczący wiele metryk w jednym przebiegu po korpusie
+
+Zamiast uruchamiać osobny proces Pythona dla każdej metryki, runner
+importuje moduły metryk raz i dla każdego artykułu liczy wszystkie
+wybrane metryki w jednym zadaniu. Wersje artykułu są wczytywane raz,
+a dzięki get_document() każdy tekst jest parsowany przez spaCy raz
+dla wszystkich metryk.
+
+Runner włącza w modelu spaCy tylko komponenty potrzebne wybranym
+metrykom (Metric.requires) - np. przebieg z samym word_count nie
+uruchamia taggera, parsera ani NER.
+
+Uruchomienia są przyrostowe: manifest (manifest.py) pamięta hash treści
+i wersję kodu każdego wyniku, więc liczone są tylko wpisy, których
+artykuł lub implementacja metryki się zmieniły. Procesy robocze tylko
+liczą - wyniki zapisuje proces nadrzędny, z manifestu, przez wybrane
+ujścia (sinks.py): kolumnową tabelę output/results.parquet i/lub
+dotychczasowe pliki JSON.
+
+Metryki korpusowe (Metric.corpus_func, np. TF-IDF ze wspólnym IDF)
+liczone są w procesie nadrzędnym, raz dla całego korpusu, po przebiegu
+per artykuł. Ich wpisy w manifeście mają wspólny hash całego korpusu,
+więc zmiana dowolnego artykułu przelicza całą metrykę.
+
+Silniki:
+- "pool": zadania artykułów w puli procesów (get_executor), wysyłane
+  od najdłuższych, krótkie artykuły łączone w paczki (scheduling.py)
+- "pipe": parsowanie wsadowe przez nlp.pipe (pipe_engine.py), metryki
+  liczone strumieniowo w procesie nadrzędnym
+- "shared": parsowanie wsadowe przez nlp.pipe w procesie nadrzędnym,
+  tablice tokenów, lematów i POS we wspólnej pamięci (shared_tokens.py),
+  metryki liczone w puli procesów na widokach tych tablic
+
+Opcjonalne pomiary etapów zadań (odczyt, parsowanie, metryki,
+serializacja, oczekiwanie w kolejce, IPC) i profile metryk zapisuje
+profiling.py do output/profiling/ (run_all.py --trace / --profiler
+albo zmienne ANALYTICS_TRACE / ANALYTICS_PROFILER).
+"""
+
+import json
+from concurrent.futures import as_completed
+
+from common import get_executor, list_articles, OUTPUT_DIR, set_pipeline_requirements
+from document import get_document
+from manifest import Manifest, entry_key, get_code_version, hash_content, hash_contents
+from parse_cache import is_cached
+from pipe_engine import DEFAULT_BATCH_SIZE, iter_parsed_articles, load_versions
+from profiling import (
+    ChunkTrace,
+    config_from_env,
+    print_summary,
+    profile,
+    ProfilingConfig,
+    span,
+    TaskTrace,
+    TraceCollector,
+)
+from registry import Metric, get_metrics, get_requirements
+from scheduling import ChunkTimer, ChunkTiming, pool_size, PoolUtilization, schedule_tasks
+from shared_tokens import (
+    fields_for_requirements,
+    register_shared_documents,
+    SENTENCES,
+    SharedDocument,
+    TokenStoreBuilder,
+    TokenStoreHandle,
+)
+from sinks import DEFAULT_SINKS, SINKS
+
+# Plan pracy dla artykułu: {metryka: wersje do policzenia} (None = porównanie wersji)
+ArticlePlan = dict[str, list[str] | None]
+
+# Silniki runnera
+ENGINES = ["pool", "pipe", "shared"]
+
+# Katalog wyników pomiarów (profiling.py)
+PROFILING_DIR = OUTPUT_DIR / "profiling"
+
+
+def _needs_model(
+    contents_by_article: dict[str, dict[str, str]],
+    metrics: list[Metric]
+) -> bool:
+    """
+    Sprawdza czy któraś z treści wymaga parsowania przez spaCy.
+    Gdy metryki nie używają spaCy albo wszystkie treści są w cache
+    parsowania, procesy robocze nie muszą ładować modelu.
+    """
+    if not get_requirements(metrics):
+        return False
+
+    return any(
+        not is_cached(content)
+        for contents in contents_by_article.values()
+        for content in contents.values()
+    )
+
+
+def _compute_metric(
+    metric: Metric,
+    article_name: str,
+    contents: dict[str, str],
+    versions: list[str] | None,
+    records: list[dict],
+    errors: list[str]
+) -> None:
+    """
+    Liczy jedną metrykę dla artykułu i dopisuje rekordy wyników
+    do listy records.
+
+    Args:
+        metric: Metryka
+        article_name: Nazwa artykułu
+        contents: Słownik {wersja: treść}
+        versions: Wersje do policzenia (None dla metryk porównawczych)
+        records: Lista rekordów {metric, article, version, value, extra}
+        errors: Lista komunikatów błędów
+    """
+    if metric.is_comparison:
+        try:
+            comparisons = metric.compare_func(contents)
+        except Exception as e:
+            errors.append(f"{metric.name}: {e}")
+            return
+
+        if not comparisons:
+            return
+
+        records.append({
+            "metric": metric.name,
+            "article": article_name,
+            "version": None,
+            "value": comparisons,
+            "extra": metric.comparison_extra,
+        })
+        return
+
+    for version in versions:
+        content = contents[version]
+        try:
+            value = metric.calculate_func(content)
+
+            extra_data = None
+            if metric.extra_data_func:
+                extra_data = metric.extra_data_func(content)
+        except Exception as e:
+            errors.append(f"{metric.name}/{version}: {e}")
+            continue
+
+        records.append({
+            "metric": metric.name,
+            "article": article_name,
+            "version": version,
+            "value": value,
+            "extra": extra_data,
+        })
+
+
+def _parse_planned(
+    contents: dict[str, str],
+    plan: ArticlePlan,
+    trace: TaskTrace
+) -> None:
+    """
+    Parsuje z góry treści potrzebne metrykom z planu, żeby w pomiarach
+    parsowanie było osobnym etapem, a nie częścią pierwszej metryki.
+    """
+    metrics = get_metrics(list(plan))
+    if not get_requirements(metrics):
+        return
+
+    if any(versions is None for versions in plan.values()):
+        versions = list(contents)
+    else:
+        versions = sorted({version for versions in plan.values() for version in versions})
+
+    with trace.span("parse", versions=len(versions)):
+        for version in versions:
+            document = get_document(contents[version])
+            # Dokumenty z bloku wspólnej pamięci nie mają obiektu Doc
+            if not isinstance(document, SharedDocument):
+                document.doc
+
+
+def compute_article_metrics(
+    article_name: str,
+    contents: dict[str, str],
+    plan: ArticlePlan,
+    trace: TaskTrace | None = None
+) -> tuple[list[dict], list[str]]:
+    """
+    Liczy metryki z planu dla wczytanych wersji jednego artykułu.
+
+    Args:
+        article_name: Nazwa artykułu
+        contents: Słownik {wersja: treść}
+        plan: {metryka: wersje do policzenia}
+        trace: Pomiary zadania (None = bez pomiarów)
+
+    Returns:
+        Tuple (lista rekordów wyników, lista błędów)
+    """
+    records = []
+    errors = []
+
+    if trace is not None:
+        _parse_planned(contents, plan, trace)
+
+    for metric in get_metrics(list(plan)):
+        with span(trace, f"metric:{metric.name}"), profile(trace, metric.name):
+            _compute_metric(metric, article_name, contents, plan[metric.name], records, errors)
+
+    return records, errors
+
+
+def process_article_metrics(
+    article_name: str,
+    plan: ArticlePlan,
+    token_store: TokenStoreHandle | None = None
+) -> tuple[str, list[dict], list[str]]:
+    """
+    Liczy metryki z planu dla jednego artykułu.
+    Używana w równoległym przetwarzaniu - musi być na poziomie modułu.
+
+    Args:
+        article_name: Nazwa artykułu
+        plan: {metryka: wersje do policzenia}
+        token_store: Blok tablic tokenów (silnik "shared")
+
+    Returns:
+        Tuple (article_name, lista rekordów wyników, lista błędów)
+    """
+    contents = load_versions(article_name)
+    if token_store is not None:
+        register_shared_documents(token_store, article_name, contents)
+    records, errors = compute_article_metrics(article_name, contents, plan)
+
+    return article_name, records, errors
+
+
+def process_article_metrics_traced(
+    article_name: str,
+    plan: ArticlePlan,
+    trace: TaskTrace,
+    token_store: TokenStoreHandle | None = None
+) -> tuple[str, list[dict], list[str], TaskTrace]:
+    """
+    Odpowiednik process_article_metrics z pomiarami etapów zadania.
+
+    Args:
+        article_name: Nazwa artykułu
+        plan: {metryka: wersje do policzenia}
+        trace: Pomiary zadania (ChunkTrace.task)
+        token_store: Blok tablic tokenów (silnik "shared")
+
+    Returns:
+        Tuple (article_name, lista rekordów wyników, lista błędów, pomiary)
+    """
+    with trace.span("load"):
+        contents = load_versions(article_name)
+    if token_store is not None:
+        with trace.span("attach"):
+            register_shared_documents(token_store, article_name, contents)
+    records, errors = compute_article_metrics(article_name, contents, plan, trace)
+    trace.serialize((article_name, records, errors))
+
+    return article_name, records, errors, trace.finish()
+
+
+def plan_work(
+    metrics: list[Metric],
+    code_versions: dict[str, str],
+    contents_by_article: dict[str, dict[str, str]],
+    manifest: Manifest,
+    force: bool = False
+) -> tuple[dict[str, ArticlePlan], dict[tuple[str, str], str]]:
+    """
+    Wyznacza wpisy do przeliczenia na podstawie manifestu.
+
+    Args:
+        metrics: Wybrane metryki
+        code_versions: {metryka: wersja kodu}
+        contents_by_article: {artykuł: {wersja: treść}}
+        manifest: Manifest poprzednich wyników
+        force: Przelicz wszystko, ignorując manifest
+
+    Returns:
+        Tuple ({artykuł: plan}, {(metryka, klucz_wpisu): hash_wejścia})
+    """
+    plans = {}
+    input_hashes = {}
+
+    for article_name, contents in contents_by_article.items():
+        content_hashes = {version: hash_content(content) for version, content in contents.items()}
+        plan = {}
+
+        for metric in metrics:
+            code_version = code_versions[metric.name]
+
+            if metric.is_comparison:
+                key = entry_key(article_name)
+                input_hash = hash_contents(content_hashes)
+                input_hashes[(metric.name, key)] = input_hash
+
+                if force or not manifest.is_fresh(metric.name, key, input_hash, code_version):
+                    plan[metric.name] = None
+                continue
+
+            stale = []
+            for version, input_hash in content_hashes.items():
+                key = entry_key(article_name, version)
+                input_hashes[(metric.name, key)] = input_hash
+
+                if force or not manifest.is_fresh(metric.name, key, input_hash, code_version):
+                    stale.append(version)
+
+            if stale:
+                plan[metric.name] = stale
+
+        if plan:
+            plans[article_name] = plan
+
+    return plans, input_hashes
+
+
+def plan_corpus_work(
+    metrics: list[Metric],
+    code_versions: dict[str, str],
+    contents_by_article: dict[str, dict[str, str]],
+    manifest: Manifest,
+    force: bool = False
+) -> tuple[list[Metric], dict[tuple[str, str], str]]:
+    """
+    Wyznacza metryki korpusowe do przeliczenia.
+
+    Hash wejścia wpisu metryki korpusowej obejmuje treści wszystkich
+    artykułów, stałe dane metryki (comparison_extra) i teksty źródłowe
+    (source_func), więc zmiana dowolnego z nich unieważnia wszystkie
+    jej wpisy.
+
+    Returns:
+        Tuple (metryki do przeliczenia, {(metryka, klucz_wpisu): hash_wejścia})
+    """
+    corpus_hash = hash_contents({
+        article_name: hash_contents({
+            version: hash_content(content) for version, content in contents.items()
+        })
+        for article_name, contents in contents_by_article.items()
+    })
+
+    stale_metrics = []
+    input_hashes = {}
+
+    for metric in metrics:
+        config = json.dumps(metric.comparison_extra, sort_keys=True)
+        if metric.source_func is not None:
+            config += "\0" + hash_contents({
+                article_name: hash_content("\0".join(metric.source_func(article_name)))
+                for article_name in contents_by_article
+            })
+        input_hash = hash_content(f"{corpus_hash}\0{config}")
+        keys = [entry_key(article_name) for article_name in contents_by_article]
+
+        for key in keys:
+            input_hashes[(metric.name, key)] = input_hash
+
+        if force or not all(
+            manifest.is_fresh(metric.name, key, input_hash, code_versions[metric.name])
+            for key in keys
+        ):
+            stale_metrics.append(metric)
+
+    return stale_metrics, input_hashes
+
+
+def compute_corpus_metric(
+    metric: Metric,
+    contents_by_article: dict[str, dict[str, str]]
+) -> tuple[list[dict], list[str]]:
+    """
+    Liczy metrykę korpusową dla wszystkich artykułów naraz.
+
+    Returns:
+        Tuple (lista rekordów wyników, lista błędów)
+    """
+    try:
+        results = metric.corpus_func(contents_by_article)
+    except Exception as e:
+        return [], [f"{metric.name}: {e}"]
+
+    records = [
+        {
+            "metric": metric.name,
+            "article": article_name,
+            "version": None,
+            "value": comparisons,
+            "extra": metric.comparison_extra,
+        }
+        for article_name, comparisons in results.items()
+        if comparisons
+    ]
+    return records, []
+
+
+def _apply_records(
+    manifest: Manifest,
+    records: list[dict],
+    input_hashes: dict[tuple[str, str], str],
+    code_versions: dict[str, str],
+    updated: set[tuple[str, str]]
+) -> None:
+    """Zapisuje rekordy wyników w manifeście i oznacza wpisy jako przeliczone."""
+    for record in records:
+        key = entry_key(record["article"], record["version"])
+        manifest.update(
+            metric_name=record["metric"],
+            key=key,
+            input_hash=input_hashes[(record["metric"], key)],
+            code_version=code_versions[record["metric"]],
+            value=record["value"],
+            extra=record["extra"]
+        )
+        updated.add((record["metric"], key))
+
+
+def estimate_cost(contents: dict[str, str], plan: ArticlePlan) -> int:
+    """
+    Szacuje koszt zadania artykułu jako łączną długość treści,
+    które metryki z planu muszą przetworzyć.
+    """
+    if any(versions is None for versions in plan.values()):
+        versions = contents
+    else:
+        versions = {version for versions in plan.values() for version in versions}
+
+    return sum(len(contents[version]) for version in versions)
+
+
+def process_article_chunk(
+    chunk: list[tuple[str, ArticlePlan]],
+    profiling: ProfilingConfig | None = None,
+    submitted_at: int | None = None,
+    token_store: TokenStoreHandle | None = None
+) -> tuple[list[tuple[str, list[dict], list[str], TaskTrace | None]], ChunkTiming, ChunkTrace | None]:
+    """
+    Liczy metryki dla paczki artykułów w jednym zadaniu puli.
+    Używana w równoległym przetwarzaniu - musi być na poziomie modułu.
+
+    Args:
+        chunk: Lista (artykuł, plan)
+        profiling: Ustawienia pomiarów (None = bez pomiarów)
+        submitted_at: Czas wysłania paczki do puli (przy pomiarach)
+        token_store: Blok tablic tokenów (silnik "shared")
+
+    Returns:
+        Tuple (lista (artykuł, rekordy, błędy, pomiary lub None), czas
+        paczki, pomiary paczki lub None)
+    """
+    timer = ChunkTimer()
+    chunk_trace = None if profiling is None else ChunkTrace(profiling, submitted_at)
+    results = []
+
+    for article_name, plan in chunk:
+        try:
+            if profiling is None:
+                results.append((*process_article_metrics(article_name, plan, token_store), None))
+            else:
+                results.append(process_article_metrics_traced(article_name, plan, chunk_trace.task(article_name), token_store))
+        except Exception as e:
+            results.append((article_name, [], [str(e)], None))
+
+    return results, timer.stop(), None if chunk_trace is None else chunk_trace.finish()
+
+
+def _iter_pool_results(
+    plans: dict[str, ArticlePlan],
+    contents_by_article: dict[str, dict[str, str]],
+    needs_model: bool,
+    max_workers: int | None,
+    collector: TraceCollector | None = None,
+    token_store: TokenStoreHandle | None = None
+):
+    """
+    Liczy metryki w puli procesów, zwraca wyniki w kolejności ukończenia.
+
+    Zadania wysyłane są od najdłuższych, a krótkie artykuły łączone
+    w paczki (schedule_tasks). Po przebiegu wypisywane jest obciążenie puli.
+    """
+    executor = get_executor(max_workers=max_workers, preload_model=needs_model)
+    workers = pool_size(max_workers)
+
+    costs = {
+        article_name: estimate_cost(contents_by_article[article_name], plan)
+        for article_name, plan in plans.items()
+    }
+    chunks = schedule_tasks(costs, workers)
+    utilization = PoolUtilization(workers)
+
+    future_to_chunk = {}
+    for chunk in chunks:
+        tasks = [(article_name, plans[article_name]) for article_name in chunk]
+        if collector is None:
+            future = executor.submit(process_article_chunk, tasks, token_store=token_store)
+        else:
+            future = executor.submit(
+                process_article_chunk, tasks, collector.config, collector.submitted(), token_store
+            )
+        future_to_chunk[future] = chunk
+
+    for future in as_completed(future_to_chunk):
+        chunk = future_to_chunk[future]
+        try:
+            results, timing, chunk_trace = future.result()
+        except Exception as e:
+            print(f"  BŁĄD: {', '.join(chunk)}: {e}")
+            continue
+
+        utilization.add(timing, len(chunk))
+        if collector is not None and chunk_trace is not None:
+            collector.add_chunk(chunk_trace)
+
+        for article_name, records, errors, trace in results:
+            if collector is not None and trace is not None:
+                collector.add(trace)
+
+            yield article_name, records, errors
+
+    utilization.print_report()
+
+
+def _iter_pipe_results(
+    plans: dict[str, ArticlePlan],
+    batch_size: int,
+    n_process: int,
+    collector: TraceCollector | None = None
+):
+    """
+    Parsuje wsadowo przez nlp.pipe i liczy metryki strumieniowo.
+
+    Przy pomiarach odczyt i parsowanie nlp.pipe nie należą do zadań
+    artykułów - zadanie obejmuje tylko obliczenia metryk.
+    """
+    for article_name, contents in iter_parsed_articles(list(plans), batch_size, n_process):
+        trace = None if collector is None else TaskTrace(article_name, collector.config)
+        records, errors = compute_article_metrics(article_name, contents, plans[article_name], trace)
+
+        if collector is not None:
+            collector.add(trace.finish())
+
+        yield article_name, records, errors
+
+
+def _iter_shared_results(
+    plans: dict[str, ArticlePlan],
+    contents_by_article: dict[str, dict[str, str]],
+    requirements: frozenset[str],
+    batch_size: int,
+    n_process: int,
+    max_workers: int | None,
+    collector: TraceCollector | None = None
+):
+    """
+    Parsuje wsadowo w procesie nadrzędnym, umieszcza tablice tokenów
+    we wspólnej pamięci i liczy metryki w puli procesów.
+
+    Proces roboczy dostaje tylko opis bloku (TokenStoreHandle). Blok
+    zawiera wszystkie widoki wymagane przez metryki (także granice zdań),
+    więc procesy robocze nie parsują tekstów i nie ładują modelu -
+    niezależnie od cache parsowania.
+    """
+    builder = TokenStoreBuilder(fields_for_requirements(requirements), sentences=SENTENCES in requirements)
+
+    with span(collector, "encode"):
+        for article_name, contents in iter_parsed_articles(list(plans), batch_size, n_process):
+            for version, content in contents.items():
+                builder.add(f"{article_name}/{version}", get_document(content))
+
+    with builder.build() as store:
+        print(
+            f"Tablice tokenów we wspólnej pamięci: {store.handle.n_documents} dokumentów, "
+            f"{store.handle.n_tokens} tokenów, {store.handle.n_sentences} zdań, słownik {store.handle.n_vocab}, {store.nbytes / 2**20:.1f} MB"
+        )
+        yield from _iter_pool_results(
+            plans, contents_by_article, False, max_workers, collector, store.handle
+        )
+
+
+def run_metrics(
+    metric_names: list[str] | None = None,
+    max_workers: int | None = None,
+    engine: str = "pool",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    n_process: int = 1,
+    force: bool = False,
+    sinks: list[str] | None = None,
+    profiling: ProfilingConfig | None = None
+) -> Manifest:
+    """
+    Liczy wybrane metryki dla wszystkich artykułów w jednym przebiegu.
+
+    Args:
+        metric_names: Nazwy metryk (None = wszystkie zarejestrowane)
+        max_workers: Liczba procesów silnika "pool" (None = liczba CPU)
+        engine: "pool" (zadanie na artykuł), "pipe" (nlp.pipe) lub
+            "shared" (nlp.pipe + pula na tablicach we wspólnej pamięci)
+        batch_size: Rozmiar wsadu nlp.pipe (silniki "pipe" i "shared")
+        n_process: Liczba procesów nlp.pipe (silniki "pipe" i "shared")
+        force: Przelicz wszystkie wpisy, ignorując manifest
+        sinks: Ujścia wyników z sinks.SINKS (None = DEFAULT_SINKS)
+        profiling: Ustawienia pomiarów (None = ze zmiennych
+            ANALYTICS_TRACE / ANALYTICS_PROFILER, domyślnie wyłączone)
+
+    Returns:
+        Zaktualizowany manifest z wynikami
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Nieznany silnik: {engine}")
+
+    sinks = DEFAULT_SINKS if sinks is None else sinks
+    unknown_sinks = set(sinks) - set(SINKS)
+    if unknown_sinks:
+        raise ValueError(f"Nieznane ujścia wyników: {', '.join(sorted(unknown_sinks))}")
+
+    profiling = profiling or config_from_env(PROFILING_DIR)
+    collector = None if profiling is None else TraceCollector(profiling)
+
+    metrics = get_metrics(metric_names)
+    names = [metric.name for metric in metrics]
+    articles = list_articles()
+
+    # Uruchamiaj tylko komponenty spaCy potrzebne wybranym metrykom
+    requirements = get_requirements(metrics)
+    set_pipeline_requirements(requirements)
+
+    print(f"Metryki: {', '.join(names)}")
+    print(f"Wymagane widoki dokumentu: {', '.join(sorted(requirements)) or 'brak (bez spaCy)'}")
+
+    with span(collector, "plan"):
+        manifest = Manifest.load()
+        code_versions = {metric.name: get_code_version(metric) for metric in metrics}
+        contents_by_article = {article_name: load_versions(article_name) for article_name in articles}
+
+        article_metrics = [metric for metric in metrics if not metric.is_corpus]
+        corpus_metrics = [metric for metric in metrics if metric.is_corpus]
+        plans, input_hashes = plan_work(article_metrics, code_versions, contents_by_article, manifest, force)
+        stale_corpus_metrics, corpus_input_hashes = plan_corpus_work(
+            corpus_metrics, code_versions, contents_by_article, manifest, force
+        )
+    input_hashes.update(corpus_input_hashes)
+
+    stale_count = sum(
+        1 if versions is None else len(versions)
+        for plan in plans.values()
+        for versions in plan.values()
+    ) + len(stale_corpus_metrics) * len(contents_by_article)
+    print(f"Wpisy do przeliczenia: {stale_count}/{len(input_hashes)} (pozostałe aktualne w manifeście)")
+
+    updated = set()
+
+    if plans:
+        if engine == "pool":
+            print(f"Przetwarzanie {len(plans)} artykułów (równolegle, {max_workers or 'auto'} procesów)...")
+            needs_model = _needs_model(
+                {article_name: contents_by_article[article_name] for article_name in plans},
+                article_metrics
+            )
+            article_iter = _iter_pool_results(plans, contents_by_article, needs_model, max_workers, collector)
+        elif engine == "pipe":
+            print(f"Przetwarzanie {len(plans)} artykułów (nlp.pipe, batch_size={batch_size}, n_process={n_process})...")
+            article_iter = _iter_pipe_results(plans, batch_size, n_process, collector)
+        else:
+            print(
+                f"Przetwarzanie {len(plans)} artykułów (nlp.pipe, batch_size={batch_size}, n_process={n_process}; "
+                f"metryki równolegle, {max_workers or 'auto'} procesów, wspólna pamięć)..."
+            )
+            article_iter = _iter_shared_results(
+                plans, contents_by_article, get_requirements(article_metrics),
+                batch_size, n_process, max_workers, collector
+            )
+
+        for article_name, records, errors in article_iter:
+            _apply_records(manifest, records, input_hashes, code_versions, updated)
+
+            print(f"  {article_name}: {len(records)} wyników")
+            for error in errors:
+                print(f"    BŁĄD: {error}")
+
+    for metric in stale_corpus_metrics:
+        print(f"Metryka korpusowa {metric.name} ({len(contents_by_article)} artykułów)...")
+        with span(collector, f"corpus:{metric.name}"):
+            records, errors = compute_corpus_metric(metric, contents_by_article)
+        _apply_records(manifest, records, input_hashes, code_versions, updated)
+
+        print(f"  {metric.name}: {len(records)} wyników")
+        for error in errors:
+            print(f"    BŁĄD: {error}")
+
+    # Usuń wpisy artykułów/wersji, których już nie ma w korpusie
+    for name in names:
+        manifest.prune(name, {key for metric_name, key in input_hashes if metric_name == name})
+
+    manifest.save()
+
+    for sink in sinks:
+        with span(collector, f"sink:{sink}"):
+            SINKS[sink](metrics, articles, manifest, updated)
+
+    if collector is not None:
+        summary = collector.write()
+        print_summary(summary)
+        print(f"Pomiary zapisane w: {profiling.profile_dir} (trace.json - chrome://tracing, ui.perfetto.dev)")
+
+    return manifest
@@ -0,0 +1,174 @@
+"""
+scheduling.py - Kolejność i paczkowanie zadań puli procesów
+
+Zadania wysyłane w kolejności katalogów kończą się "ogonem": długie
+dokumenty (adult_full są kilka razy dłuższe niż child_short) trafiające
+do puli na końcu liczą się, gdy pozostałe procesy już czekają. Moduł
+układa zadania według szacowanego kosztu (długości treści):
+
+- najdłuższe najpierw (LPT - longest processing time first), więc na
+  końcu zostają krótkie zadania wyrównujące obciążenie procesów
+- małe zadania łączone są w paczki o koszcie około
+  całkowity_koszt / (procesy × CHUNKS_PER_WORKER), więc zamiast
+  osobnego zadania (i osobnej serializacji wyniku) na każdy krótki
+  dokument wysyłana jest jedna paczka
+
+PoolUtilization mierzy obciążenie puli: suma czasu zadań w procesach
+roboczych / (czas ściany × liczba procesów). Przy dobrym rozkładzie
+czas ściany zbliża się do sumy czasu CPU zadań podzielonej przez liczbę
+procesów.
+
+Użycie:
+    chunks = schedule_tasks({task: cost, ...}, workers)
+    # chunks - lista paczek (list zadań) w kolejności wysyłania
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Hashable
+
+# Docelowa liczba paczek na proces roboczy (więcej = lepsze wyrównanie
+# obciążenia, mniej = mniejszy narzut IPC)
+CHUNKS_PER_WORKER = 4
+
+
+def pool_size(max_workers: int | None) -> int:
+    """Liczba procesów puli dla max_workers (None = liczba CPU)."""
+    return max_workers or os.cpu_count() or 1
+
+
+def schedule_tasks(
+    costs: dict[Hashable, float],
+    workers: int,
+    chunks_per_worker: int = CHUNKS_PER_WORKER
+) -> list[list[Hashable]]:
+    """
+    Układa zadania w paczki, od najdroższych.
+
+    Zadania o koszcie co najmniej docelowego kosztu paczki są wysyłane
+    pojedynczo; mniejsze są dokładane (od największych) do bieżącej
+    paczki, dopóki nie osiągnie ona kosztu docelowego.
+
+    Args:
+        costs: {zadanie: szacowany koszt} (np. długość treści)
+        workers: Liczba procesów puli
+        chunks_per_worker: Docelowa liczba paczek na proces
+
+    Returns:
+        Lista paczek (list zadań), posortowana malejąco wg kosztu paczki
+    """
+    if not costs:
+        return []
+
+    target = sum(costs.values()) / (max(workers, 1) * chunks_per_worker)
+    ordered = sorted(costs, key=lambda task: costs[task], reverse=True)
+
+    chunks = []
+    current = []
+    current_cost = 0.0
+
+    for task in ordered:
+        if costs[task] >= target:
+            chunks.append(([task], costs[task]))
+            continue
+
+        current.append(task)
+        current_cost += costs[task]
+        if current_cost >= target:
+            chunks.append((current, current_cost))
+            current = []
+            current_cost = 0.0
+
+    if current:
+        chunks.append((current, current_cost))
+
+    chunks.sort(key=lambda chunk: chunk[1], reverse=True)
+    return [tasks for tasks, _ in chunks]
+
+
+@dataclass
+class ChunkTiming:
+    """Czas przetwarzania paczki w procesie roboczym (sekundy)."""
+    busy_s: float
+    cpu_s: float
+
+
+class ChunkTimer:
+    """
+    Mierzy czas ściany i CPU paczki w procesie roboczym.
+
+    Użycie:
+        timer = ChunkTimer()
+        ...
+        return results, timer.stop()
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+    def stop(self) -> ChunkTiming:
+        """Zwraca czas od utworzenia."""
+        return ChunkTiming(
+            busy_s=time.perf_counter() - self.started,
+            cpu_s=time.process_time() - self.cpu_started
+        )
+
+
+@dataclass
+class PoolUtilization:
+    """
+    Obciążenie puli procesów w jednym przebiegu.
+
+    Attributes:
+        workers: Liczba procesów puli
+        tasks: Liczba zadań
+        chunks: Liczba paczek
+        busy_s: Suma czasów paczek w procesach roboczych
+        cpu_s: Suma czasów CPU paczek
+    """
+    workers: int
+    tasks: int = 0
+    chunks: int = 0
+    busy_s: float = 0.0
+    cpu_s: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+
+    def add(self, timing: ChunkTiming, tasks: int) -> None:
+        """Dodaje czas ukończonej paczki."""
+        self.chunks += 1
+        self.tasks += tasks
+        self.busy_s += timing.busy_s
+        self.cpu_s += timing.cpu_s
+
+    def report(self) -> dict:
+        """
+        Zwraca podsumowanie obciążenia.
+
+        Returns:
+            Słownik {"workers", "tasks", "chunks", "wall_time_s", "busy_s",
+            "cpu_s", "ideal_wall_time_s", "utilization"}; ideal_wall_time_s
+            to suma czasu CPU zadań podzielona przez liczbę procesów
+        """
+        wall_time = time.perf_counter() - self.started
+        return {
+            "workers": self.workers,
+            "tasks": self.tasks,
+            "chunks": self.chunks,
+            "wall_time_s": round(wall_time, 3),
+            "busy_s": round(self.busy_s, 3),
+            "cpu_s": round(self.cpu_s, 3),
+            "ideal_wall_time_s": round(self.cpu_s / self.workers, 3),
+            "utilization": round(self.busy_s / (wall_time * self.workers), 4) if wall_time else None,
+        }
+
+    def print_report(self) -> None:
+        """Wypisuje podsumowanie obciążenia."""
+        report = self.report()
+        print(
+            f"Pula: {report['workers']} procesów, {report['tasks']} zadań w {report['chunks']} paczkach; "
+            f"czas {report['wall_time_s']:.2f} s (idealnie {report['ideal_wall_time_s']:.2f} s = "
+            f"CPU zadań {report['cpu_s']:.2f} s / {report['workers']}), "
+            f"obciążenie {report['utilization'] or 0:.1%}"
+        )
@@ -17,11 +17,9 @@ ZASTOSOWANIE:
 - Porównanie złożoności składniowej między wersjami
 """
 
-from common import (
-    get_sentences,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+from document import get_document
+from registry import Metric
+from runner import run_metrics
 
 
 def calculate_sentence_count(text: str) -> int:
@@ -34,19 +32,19 @@ def calculate_sentence_count(text: str) -> int:
     Returns:
         Liczba zdań
     """
-    sentences = get_sentences(text)
-    return len(sentences)
+    return len(get_document(text).sentences)
+
+
+METRIC = Metric(
+    name="sentence_count",
+    calculate_func=calculate_sentence_count,
+    requires=frozenset({"sentences"}),
+)
 
 
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="sentence_count",
-        calculate_func=calculate_sentence_count
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("sentence_count", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -0,0 +1,445 @@
+"""
+shared_tokens.py - Tablice tokenów dokumentów we wspólnej pamięci
+
+Proces nadrzędny parsuje dokumenty (nlp.pipe, jak silnik "pipe")
+i umieszcza identyfikatory ich widoków tokenowych (tokens,
+tokens_original, lemmas, pos - w słowniku procesu, vocabulary.py) wraz
+ze słownikiem i granicami zdań w jednym bloku
+multiprocessing.shared_memory:
+
+    ids               int32 [pole][token]            - identyfikatory słów
+    doc_offsets       int64 [dokument + 1]           - zakres tokenów dokumentu
+    sentence_offsets  int64 [dokument + 1]           - zakres zdań dokumentu
+    sentence_bounds   int32 [zdanie + dokument]      - sentence_offsets dokumentów
+    sentence_spans    int64 [zdanie][2]              - zakresy znaków zdań
+    vocab_offsets     int64 [słowo + 1]              - zakres słowa w vocab_bytes
+    vocab_bytes       UTF-8                          - słowa słownika jedno za drugim
+    keys_bytes        JSON                           - klucze dokumentów ("artykuł/wersja")
+
+Sekcje zdań są wypełniane tylko, gdy metryki wymagają widoku
+"sentences" (TokenStoreHandle.sentences).
+
+Słownik jest wspólny dla wszystkich pól (słowo, lemat i znacznik POS
+o tej samej pisowni mają ten sam identyfikator).
+
+Słowniki procesów roboczych są niezależne - widok bloku mapuje raz
+identyfikatory bloku na słownik procesu (vocabulary_ids), a dalej
+mapowanie jest jednym indeksowaniem tablicy na dokument.
+
+Do procesów roboczych trafia tylko TokenStoreHandle (nazwa bloku
+i rozmiary sekcji, kilkaset bajtów). Proces roboczy dołącza blok raz
+(attach) i czyta tablice dokumentu jako widoki numpy na wspólną
+pamięć - bez kopiowania i bez serializacji list tokenów. SharedDocument
+udostępnia je metrykom jako ParsedDocument (get_document), mapując
+identyfikatory na słownik procesu przy pierwszym dostępie do widoku.
+Proces roboczy nigdy nie parsuje - widok, którego nie ma w bloku (w tym
+obiekt Doc spaCy), kończy się błędem.
+
+Blok należy do procesu nadrzędnego: SharedTokenStore.close() zwalnia
+go po przebiegu (także przy błędzie).
+
+Użycie:
+    builder = TokenStoreBuilder(fields, sentences=True)
+    builder.add("artykul/adult_full", get_document(text))
+    with builder.build() as store:
+        store.handle            # do wysłania procesom roboczym
+
+    # w procesie roboczym
+    register_shared_documents(handle, article_name, contents)
+"""
+
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from document import ParsedDocument, register_document
+from vocabulary import get_vocabulary, ID_DTYPE, Vocabulary
+
+# Widoki dokumentu przechowywane w bloku, w kolejności wierszy ids
+FIELDS = ["tokens", "tokens_original", "lemmas", "pos"]
+
+# Atrybut ParsedDocument z identyfikatorami widoku
+FIELD_IDS = {
+    "tokens": "token_ids",
+    "tokens_original": "original_token_ids",
+    "lemmas": "lemma_ids",
+    "pos": "pos_ids",
+}
+
+# Widoki przechowywane dla wymagań metryk (Metric.requires)
+FIELDS_BY_REQUIREMENT = {
+    "tokens": ["tokens", "tokens_original"],
+    "lemmas": ["lemmas"],
+    "pos": ["pos"],
+}
+
+# Wymaganie metryk, dla którego blok przechowuje granice zdań
+SENTENCES = "sentences"
+
+# Typ offsetów
+OFFSET_DTYPE = np.dtype(np.int64)
+
+# Typ granic zdań w indeksach słów (jak ParsedDocument.sentence_offsets)
+BOUND_DTYPE = np.dtype(np.int32)
+
+
+def fields_for_requirements(requirements: frozenset[str] | set[str]) -> list[str]:
+    """Widoki do zapisania w bloku dla wymagań metryk (kolejność FIELDS)."""
+    needed = {field for requirement in requirements for field in FIELDS_BY_REQUIREMENT.get(requirement, [])}
+    return [field for field in FIELDS if field in needed]
+
+
+def _aligned(position: int, alignment: int = 8) -> int:
+    return (position + alignment - 1) // alignment * alignment
+
+
+@dataclass(frozen=True)
+class TokenStoreHandle:
+    """
+    Opis bloku wspólnej pamięci wysyłany do procesów roboczych.
+
+    Attributes:
+        name: Nazwa bloku shared_memory
+        fields: Zapisane widoki (wiersze tablicy ids)
+        n_tokens: Liczba tokenów wszystkich dokumentów
+        n_documents: Liczba dokumentów
+        n_vocab: Rozmiar słownika
+        n_sentences: Liczba zdań wszystkich dokumentów
+        sentences: Czy blok przechowuje granice zdań
+        sections: {sekcja: (offset, rozmiar w bajtach)}
+    """
+    name: str
+    fields: tuple[str, ...]
+    n_tokens: int
+    n_documents: int
+    n_vocab: int
+    n_sentences: int
+    sentences: bool
+    sections: tuple[tuple[str, int, int], ...]
+
+
+class TokenStoreBuilder:
+    """Zbiera dokumenty w procesie nadrzędnym i buduje blok wspólnej pamięci."""
+
+    def __init__(
+        self,
+        fields: list[str] = FIELDS,
+        vocabulary: Vocabulary | None = None,
+        sentences: bool = False
+    ):
+        """
+        Args:
+            fields: Widoki do zapisania (kolejność FIELDS)
+            vocabulary: Słownik identyfikatorów dokumentów (domyślnie słownik procesu)
+            sentences: Czy zapisać granice zdań (sentence_offsets, sentence_spans)
+        """
+        self.fields = list(fields)
+        self.vocabulary = vocabulary if vocabulary is not None else get_vocabulary()
+        self.sentences = sentences
+        self.keys: list[str] = []
+        self.lengths: list[int] = []
+        self.ids: dict[str, list[np.ndarray]] = {field: [] for field in self.fields}
+        self.sentence_bounds: list[np.ndarray] = []
+        self.sentence_spans: list[np.ndarray] = []
+
+    def add(self, key: str, document: ParsedDocument) -> None:
+        """Dodaje dokument (identyfikatory widoków z self.fields i granice zdań) pod kluczem."""
+        for field in self.fields:
+            self.ids[field].append(getattr(document, FIELD_IDS[field]))
+
+        if self.sentences:
+            self.sentence_bounds.append(document.sentence_offsets)
+            self.sentence_spans.append(document.sentence_spans)
+
+        self.keys.append(key)
+        self.lengths.append(len(self.ids[self.fields[0]][-1]) if self.fields else 0)
+
+    def build(self) -> "SharedTokenStore":
+        """Tworzy blok wspólnej pamięci z zakodowanymi dokumentami."""
+        n_tokens = sum(self.lengths)
+        sentence_counts = [len(spans) for spans in self.sentence_spans]
+        n_sentences = sum(sentence_counts)
+        n_bounds = n_sentences + len(self.sentence_bounds)
+        vocab_encoded = [string.encode("utf-8") for string in self.vocabulary.strings]
+        vocab_lengths = np.fromiter((len(encoded) for encoded in vocab_encoded), dtype=OFFSET_DTYPE, count=len(vocab_encoded))
+        keys_bytes = json.dumps(self.keys, ensure_ascii=False).encode("utf-8")
+
+        sizes = [
+            ("ids", len(self.fields) * n_tokens * ID_DTYPE.itemsize),
+            ("doc_offsets", (len(self.keys) + 1) * OFFSET_DTYPE.itemsize),
+            ("sentence_offsets", (len(self.keys) + 1) * OFFSET_DTYPE.itemsize if self.sentences else 0),
+            ("sentence_bounds", n_bounds * BOUND_DTYPE.itemsize),
+            ("sentence_spans", n_sentences * 2 * OFFSET_DTYPE.itemsize),
+            ("vocab_offsets", (len(vocab_encoded) + 1) * OFFSET_DTYPE.itemsize),
+            ("vocab_bytes", int(vocab_lengths.sum())),
+            ("keys_bytes", len(keys_bytes)),
+        ]
+        sections = []
+        position = 0
+        for section, size in sizes:
+            sections.append((section, position, size))
+            position = _aligned(position + size)
+
+        block = shared_memory.SharedMemory(create=True, size=max(position, 1))
+        handle = TokenStoreHandle(
+            name=block.name,
+            fields=tuple(self.fields),
+            n_tokens=n_tokens,
+            n_documents=len(self.keys),
+            n_vocab=len(vocab_encoded),
+            n_sentences=n_sentences,
+            sentences=self.sentences,
+            sections=tuple(sections),
+        )
+
+        view = TokenStoreView(handle, block)
+        for row, field in enumerate(self.fields):
+            if self.ids[field]:
+                np.concatenate(self.ids[field], out=view.ids[row])
+        view.doc_offsets[0] = 0
+        np.cumsum(self.lengths, out=view.doc_offsets[1:])
+        if self.sentences:
+            view.sentence_offsets[0] = 0
+            np.cumsum(sentence_counts, out=view.sentence_offsets[1:])
+            if n_sentences:
+                np.concatenate(self.sentence_bounds, out=view.sentence_bounds)
+                np.concatenate(self.sentence_spans, out=view.sentence_spans)
+        view.vocab_offsets[0] = 0
+        np.cumsum(vocab_lengths, out=view.vocab_offsets[1:])
+        view.section("vocab_bytes")[:] = np.frombuffer(b"".join(vocab_encoded), dtype=np.uint8)
+        view.section("keys_bytes")[:] = np.frombuffer(keys_bytes, dtype=np.uint8)
+
+        return SharedTokenStore(handle, block, view)
+
+
+class TokenStoreView:
+    """
+    Tablice bloku wspólnej pamięci jako widoki numpy (bez kopiowania).
+
+    Attributes:
+        ids: int32 [pole][token]
+        doc_offsets: int64 [dokument + 1]
+        sentence_offsets: int64 [dokument + 1]
+        sentence_bounds: int32 [zdanie + dokument]
+        sentence_spans: int64 [zdanie][2]
+        vocab_offsets: int64 [słowo + 1]
+    """
+
+    def __init__(self, handle: TokenStoreHandle, block: shared_memory.SharedMemory):
+        self.handle = handle
+        self.block = block
+        self._sections = {section: (offset, size) for section, offset, size in handle.sections}
+
+        self.ids = self.section("ids", ID_DTYPE).reshape(len(handle.fields), handle.n_tokens)
+        self.doc_offsets = self.section("doc_offsets", OFFSET_DTYPE)
+        self.sentence_offsets = self.section("sentence_offsets", OFFSET_DTYPE)
+        self.sentence_bounds = self.section("sentence_bounds", BOUND_DTYPE)
+        self.sentence_spans = self.section("sentence_spans", OFFSET_DTYPE).reshape(handle.n_sentences, 2)
+        self.vocab_offsets = self.section("vocab_offsets", OFFSET_DTYPE)
+        self._rows = {field: row for row, field in enumerate(handle.fields)}
+
+    def section(self, name: str, dtype: np.dtype = np.dtype(np.uint8)) -> np.ndarray:
+        """Sekcja bloku jako tablica numpy (widok)."""
+        offset, size = self._sections[name]
+        return np.ndarray((size // dtype.itemsize,), dtype=dtype, buffer=self.block.buf, offset=offset)
+
+    @cached_property
+    def document_index(self) -> dict[str, int]:
+        """{klucz dokumentu: indeks} (dekodowany raz na proces)."""
+        keys = json.loads(self.section("keys_bytes").tobytes())
+        return {key: index for index, key in enumerate(keys)}
+
+    @cached_property
+    def strings(self) -> np.ndarray:
+        """Słownik jako tablica napisów (dekodowany raz na proces)."""
+        data = self.section("vocab_bytes").tobytes()
+        offsets = self.vocab_offsets.tolist()
+        return np.array(
+            [data[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])],
+            dtype=object
+        )
+
+    @cached_property
+    def vocabulary_ids(self) -> np.ndarray:
+        """Identyfikatory słów bloku w słowniku procesu (mapowane raz na proces)."""
+        return get_vocabulary().encode(self.strings, len(self.strings))
+
+    def has_field(self, field: str) -> bool:
+        """Czy widok dokumentu jest zapisany w bloku."""
+        return field in self._rows
+
+    def document_ids(self, key: str, field: str) -> np.ndarray:
+        """
+        Identyfikatory widoku dokumentu (widok na wspólną pamięć).
+
+        Raises:
+            KeyError: Gdy dokumentu lub pola nie ma w bloku
+        """
+        index = self.document_index[key]
+        start, end = self.doc_offsets[index], self.doc_offsets[index + 1]
+        return self.ids[self._rows[field], start:end]
+
+    def document_sentences(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Granice zdań dokumentu (widoki na wspólną pamięć).
+
+        Returns:
+            Tuple (sentence_offsets, sentence_spans) jak w ParsedDocument
+
+        Raises:
+            KeyError: Gdy dokumentu lub granic zdań nie ma w bloku
+        """
+        if not self.handle.sentences:
+            raise KeyError(SENTENCES)
+
+        index = self.document_index[key]
+        start, end = self.sentence_offsets[index], self.sentence_offsets[index + 1]
+        return self.sentence_bounds[start + index:end + index + 1], self.sentence_spans[start:end]
+
+    def decode(self, ids: np.ndarray) -> list[str]:
+        """Zamienia identyfikatory na napisy."""
+        return self.strings[ids].tolist()
+
+    def release(self) -> None:
+        """Zwalnia widoki (przed zamknięciem bloku)."""
+        self.ids = self.doc_offsets = self.vocab_offsets = None
+        self.sentence_offsets = self.sentence_bounds = self.sentence_spans = None
+        self.__dict__.pop("strings", None)
+
+
+class SharedTokenStore:
+    """
+    Blok wspólnej pamięci należący do procesu nadrzędnego.
+
+    Użycie jako menedżer kontekstu zwalnia blok po wyjściu z bloku with.
+    """
+
+    def __init__(self, handle: TokenStoreHandle, block: shared_memory.SharedMemory, view: TokenStoreView):
+        self.handle = handle
+        self.block = block
+        self.view = view
+
+    @property
+    def nbytes(self) -> int:
+        """Rozmiar bloku w bajtach."""
+        return self.block.size
+
+    def close(self) -> None:
+        """Zamyka i usuwa blok."""
+        self.view.release()
+        self.block.close()
+        self.block.unlink()
+
+    def __enter__(self) -> "SharedTokenStore":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+# Blok dołączony w procesie roboczym - jeden naraz
+_attached: TokenStoreView | None = None
+
+
+def attach(handle: TokenStoreHandle) -> TokenStoreView:
+    """
+    Dołącza blok w procesie roboczym (raz na blok; poprzedni jest
+    zamykany) i zwraca jego widok.
+    """
+    global _attached
+
+    if _attached is None or _attached.handle.name != handle.name:
+        if _attached is not None:
+            _attached.release()
+            _attached.block.close()
+        _attached = TokenStoreView(handle, shared_memory.SharedMemory(name=handle.name))
+
+    return _attached
+
+
+class SharedDocument(ParsedDocument):
+    """
+    ParsedDocument z widokami z bloku wspólnej pamięci.
+
+    Identyfikatory widoków tokenowych są mapowane na słownik procesu
+    (listy napisów i sylaby dekoduje z nich ParsedDocument), a zdania
+    odtwarzane z ich zakresów znaków. Dokument nie ma obiektu Doc spaCy
+    i nigdy nie parsuje tekstu - dostęp do widoku spoza bloku (doc,
+    words, pola nieobecne w bloku) kończy się błędem.
+    """
+
+    def __init__(self, text: str, view: TokenStoreView, key: str):
+        super().__init__(text)
+        self._view = view
+        self._key = key
+
+    def _missing(self, name: str) -> RuntimeError:
+        return RuntimeError(
+            f"Widoku {name} dokumentu {self._key} nie ma w bloku wspólnej pamięci "
+            f"(zapisane: {', '.join(self._view.handle.fields) or 'brak'}"
+            f"{', sentences' if self._view.handle.sentences else ''})"
+        )
+
+    def _shared(self, field: str) -> np.ndarray:
+        if not self._view.has_field(field):
+            raise self._missing(field)
+        return self._view.vocabulary_ids[self._view.document_ids(self._key, field)]
+
+    @property
+    def doc(self):
+        raise self._missing("doc")
+
+    @cached_property
+    def token_ids(self) -> np.ndarray:
+        return self._shared("tokens")
+
+    @cached_property
+    def original_token_ids(self) -> np.ndarray:
+        return self._shared("tokens_original")
+
+    @cached_property
+    def lemma_ids(self) -> np.ndarray:
+        return self._shared("lemmas")
+
+    @cached_property
+    def pos_ids(self) -> np.ndarray:
+        return self._shared("pos")
+
+    @cached_property
+    def sentence_offsets(self) -> np.ndarray:
+        try:
+            return self._view.document_sentences(self._key)[0]
+        except KeyError:
+            raise self._missing(SENTENCES) from None
+
+    @cached_property
+    def sentence_spans(self) -> np.ndarray:
+        try:
+            return self._view.document_sentences(self._key)[1]
+        except KeyError:
+            raise self._missing(SENTENCES) from None
+
+
+def register_shared_documents(
+    handle: TokenStoreHandle,
+    article_name: str,
+    contents: dict[str, str]
+) -> None:
+    """
+    Rejestruje w cache dokumentów procesu (get_document) dokumenty
+    artykułu z bloku wspólnej pamięci.
+
+    Args:
+        handle: Opis bloku
+        article_name: Nazwa artykułu
+        contents: Słownik {wersja: treść}
+    """
+    view = attach(handle)
+
+    for version, content in contents.items():
+        key = f"{article_name}/{version}"
+        if key in view.document_index:
+            register_document(SharedDocument(content, view, key))
@@ -0,0 +1,203 @@
+"""
+sinks.py - Zapis wyników runnera (Parquet i format JSON)
+
+Runner po każdym przebiegu przekazuje manifest do wybranych ujść:
+- "parquet": jedna kolumnowa tabela output/results.parquet
+  (results_store.py) z wynikami wszystkich metryk z manifestu,
+  zapisywana jednym zapisem
+- "json": dotychczasowy format - pliki per artykuł/wersja
+  (tylko przeliczone wpisy) oraz aggregated.json dla każdej metryki
+- "jsonl" / "jsonl_gz": jeden plik JSON Lines na metrykę
+  (output/<metryka>/results.jsonl[.gz], result_writer.py) ze wszystkimi
+  wynikami metryki, zapisywany zbiorczo i podmieniany atomowo
+
+Ujście to funkcja (metrics, articles, manifest, updated) -> None.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from common import (
+    OUTPUT_DIR,
+    save_aggregated_comparison_metric,
+    save_aggregated_metric,
+    save_comparison_result,
+    save_metric_result,
+    VERSIONS,
+)
+from manifest import Manifest, entry_key
+from registry import METRIC_MODULES, Metric
+from result_writer import BulkResultWriter, shard_path
+from results_store import RESULTS_FILENAME, build_table, flatten_result, write_table
+
+RESULTS_PATH = OUTPUT_DIR / RESULTS_FILENAME
+
+# Zbiór przeliczonych wpisów: {(metryka, klucz_wpisu)}
+UpdatedEntries = set[tuple[str, str]]
+
+
+def _parse_computed_at(entry: dict) -> datetime | None:
+    computed_at = entry.get("computed_at")
+    return datetime.fromisoformat(computed_at) if computed_at else None
+
+
+def write_parquet_results(
+    metrics: list[Metric],
+    articles: list[str],
+    manifest: Manifest,
+    updated: UpdatedEntries,
+    path: Path = RESULTS_PATH
+) -> Path:
+    """
+    Zapisuje tabelę wyników wszystkich metryk z manifestu.
+
+    Tabela obejmuje też metryki spoza bieżącego przebiegu, więc
+    uruchomienie z --metrics nie usuwa wyników pozostałych metryk.
+    """
+    rows = []
+
+    for metric_name in METRIC_MODULES:
+        entries = manifest.entries(metric_name)
+
+        for article_name in articles:
+            keys = [(entry_key(article_name), None)]
+            keys += [(entry_key(article_name, version), version) for version in VERSIONS]
+
+            for key, version in keys:
+                entry = entries.get(key)
+                if entry is None:
+                    continue
+
+                rows.extend(flatten_result(
+                    metric_name=metric_name,
+                    article_name=article_name,
+                    version=version,
+                    value=entry["value"],
+                    extra=entry["extra"],
+                    computed_at=_parse_computed_at(entry)
+                ))
+
+    return write_table(build_table(rows), path)
+
+
+def write_json_results(
+    metrics: list[Metric],
+    articles: list[str],
+    manifest: Manifest,
+    updated: UpdatedEntries
+) -> None:
+    """
+    Zapisuje wyniki w dotychczasowym formacie JSON: pliki przeliczonych
+    wpisów oraz aggregated.json dla metryk z bieżącego przebiegu.
+    """
+    for metric in metrics:
+        entries = manifest.entries(metric.name)
+
+        if metric.is_comparison:
+            aggregated = {}
+            for article_name in articles:
+                entry = entries.get(entry_key(article_name))
+                if entry is None:
+                    continue
+
+                aggregated[article_name] = entry["value"]
+                if (metric.name, entry_key(article_name)) in updated:
+                    save_comparison_result(
+                        metric_name=metric.name,
+                        article_name=article_name,
+                        comparisons=entry["value"],
+                        extra_data=entry["extra"]
+                    )
+
+            if aggregated:
+                save_aggregated_comparison_metric(metric.name, aggregated)
+            continue
+
+        aggregated = {}
+        for article_name in articles:
+            aggregated[article_name] = {}
+            for version in VERSIONS:
+                key = entry_key(article_name, version)
+                entry = entries.get(key)
+                if entry is None:
+                    continue
+
+                aggregated[article_name][version] = entry["value"]
+                if (metric.name, key) in updated:
+                    save_metric_result(
+                        metric_name=metric.name,
+                        article_name=article_name,
+                        version=version,
+                        value=entry["value"],
+                        extra_data=entry["extra"]
+                    )
+
+        save_aggregated_metric(metric.name, aggregated)
+
+
+def _iter_metric_records(metric: Metric, articles: list[str], manifest: Manifest):
+    """Rekordy wszystkich wyników metryki z manifestu (kolejność artykułów i wersji)."""
+    entries = manifest.entries(metric.name)
+    versions = [None] if metric.is_comparison else VERSIONS
+
+    for article_name in articles:
+        for version in versions:
+            entry = entries.get(entry_key(article_name, version))
+            if entry is None:
+                continue
+
+            yield {
+                "metric": metric.name,
+                "article": article_name,
+                "version": version,
+                "value": entry["value"],
+                "extra": entry["extra"],
+                "computed_at": entry.get("computed_at"),
+            }
+
+
+def write_jsonl_results(
+    metrics: list[Metric],
+    articles: list[str],
+    manifest: Manifest,
+    updated: UpdatedEntries,
+    compress: bool = False
+) -> list[Path]:
+    """
+    Zapisuje shard JSON Lines każdej metryki z bieżącego przebiegu.
+
+    Shard zawiera wszystkie wyniki metryki z manifestu (nie tylko
+    przeliczone), więc zawsze odpowiada pełnemu stanowi metryki.
+
+    Returns:
+        Lista zapisanych shardów
+    """
+    paths = []
+
+    for metric in metrics:
+        with BulkResultWriter(shard_path(OUTPUT_DIR, metric.name, compress)) as writer:
+            writer.write_many(_iter_metric_records(metric, articles, manifest))
+        paths.append(writer.path)
+
+    return paths
+
+
+def write_compressed_jsonl_results(
+    metrics: list[Metric],
+    articles: list[str],
+    manifest: Manifest,
+    updated: UpdatedEntries
+) -> list[Path]:
+    """Jak write_jsonl_results, z kompresją gzip."""
+    return write_jsonl_results(metrics, articles, manifest, updated, compress=True)
+
+
+SINKS: dict[str, Callable[[list[Metric], list[str], Manifest, UpdatedEntries], None]] = {
+    "parquet": write_parquet_results,
+    "json": write_json_results,
+    "jsonl": write_jsonl_results,
+    "jsonl_gz": write_compressed_jsonl_results,
+}
+
+DEFAULT_SINKS = ["parquet"]
@@ -0,0 +1,98 @@
+"""
+source_faithfulness.py - Wierność tekstu wobec artykułów źródłowych
+
+OPIS METRYKI:
+Mierzy, w jakim stopniu wygenerowany artykuł przepisuje teksty źródłowe
+(data/source-articles/<miejsce>.json - te same treści co source_contents
+w logach generowania), a w jakim stopniu formułuje treść własnymi słowami.
+
+METODA:
+1. Dla każdego miejsca zbuduj raz indeks n-gramów lematów (3-5) ze
+   wszystkich jego źródeł (ngram_index.py)
+2. Dla każdej wersji artykułu sprawdź jednym przebiegiem, które n-gramy
+   tekstu występują w źródłach
+
+MIARY (dla każdej wersji):
+- copy_ratio: odsetek lematów tekstu pokrytych 3-gramami ze źródeł
+- novel_ngram_rate_3/4/5: odsetek n-gramów tekstu nieobecnych w źródłach
+- longest_copied_span: najdłuższy przepisany fragment (w lematach)
+
+INTERPRETACJA:
+- Wysoki copy_ratio i długie skopiowane fragmenty = tekst blisko źródeł
+  (parafraza bliska cytatowi)
+- Wysoki novel_ngram_rate = tekst sformułowany od nowa
+- Wersje dla dzieci powinny mieć więcej nowych n-gramów niż adult_full
+
+Metryka jest korpusowa - runner liczy ją raz dla wszystkich artykułów,
+a zmiana tekstów źródłowych unieważnia wyniki (source_func).
+"""
+
+from common import (
+    load_source_contents,
+    VERSIONS,
+)
+from document import get_document
+from ngram_index import NGRAM_SIZES, build_index
+from registry import Metric
+from runner import run_metrics
+
+
+def score_versions(contents: dict[str, str], sources: list[str]) -> dict[str, dict]:
+    """
+    Oblicza miary wierności źródłom dla wersji jednego artykułu.
+
+    Args:
+        contents: Słownik {wersja: treść}
+        sources: Treści artykułów źródłowych miejsca
+
+    Returns:
+        Słownik {wersja: {miara: wartość}} (pusty, gdy brak źródeł)
+    """
+    if not sources:
+        return {}
+
+    index = build_index([get_document(source).lemmas for source in sources])
+
+    return {
+        version: index.score(get_document(contents[version]).lemmas)
+        for version in VERSIONS
+        if version in contents
+    }
+
+
+def compare_corpus(contents_by_article: dict[str, dict[str, str]]) -> dict[str, dict]:
+    """
+    Oblicza miary wierności źródłom dla wszystkich artykułów.
+
+    Args:
+        contents_by_article: Słownik {artykuł: {wersja: treść}}
+
+    Returns:
+        Słownik {artykuł: {wersja: {miara: wartość}}}
+    """
+    return {
+        article_name: score_versions(contents, load_source_contents(article_name))
+        for article_name, contents in contents_by_article.items()
+    }
+
+
+METRIC = Metric(
+    name="source_faithfulness",
+    corpus_func=compare_corpus,
+    source_func=load_source_contents,
+    comparison_extra={
+        "ngram_sizes": list(NGRAM_SIZES),
+    },
+    requires=frozenset({"lemmas"}),
+)
+
+
+def process_all_articles():
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
+
+    print("\nZakończono!")
+
+
+if __name__ == "__main__":
+    process_all_articles()
@@ -0,0 +1,207 @@
+"""
+tfidf_engine.py - Korpusowy silnik TF-IDF na macierzach rzadkich
+
+Zamiast dopasowywać TfidfVectorizer osobno do każdego dokumentu (wtedy
+IDF jest stałe i TF-IDF sprowadza się do częstości słów), silnik buduje
+jedną rzadką macierz dokument-termin dla całego korpusu w jednym fit.
+IDF liczone jest więc z prawdziwych częstości dokumentowych.
+
+Z macierzy, bez pętli po dokumentach:
+- top_keyword_mask: top-N terminów każdego dokumentu (argpartition na
+  wierszach macierzy rzadkiej dopełnionych do wspólnej szerokości)
+- keyword_overlaps: overlap słów kluczowych dla dowolnych par dokumentów
+
+Dokumenty pomocnicze (np. artykuły źródłowe) mogą wzbogacać statystyki
+IDF bez udziału w wynikach.
+
+Dokumenty podane jako identyfikatory lematów (build_id_matrix) są
+zliczane bezpośrednio z tablic - bez łączenia lematów w teksty
+i ponownej tokenizacji - z tym samym wynikiem co TfidfVectorizer.
+"""
+
+import re
+from typing import Sequence
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+
+from vocabulary import get_vocabulary, Vocabulary
+
+# Wzorzec tokenów - lematy rozdzielone spacjami, także jednoznakowe
+TOKEN_PATTERN = r"(?u)\b\w+\b"
+
+# Lemat będący dokładnie jednym terminem TOKEN_PATTERN
+SINGLE_TERM = re.compile(r"\w+")
+
+
+def build_document_matrix(
+    documents: Sequence[list[str]],
+    extra_documents: Sequence[list[str]] = ()
+) -> tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Buduje macierz TF-IDF dla korpusu w jednym dopasowaniu.
+
+    Args:
+        documents: Dokumenty jako listy lematów (wiersze wyniku)
+        extra_documents: Dokumenty uwzględniane tylko w IDF
+
+    Returns:
+        Tuple (macierz CSR dokumenty x terminy, nazwy terminów)
+    """
+    vectorizer = TfidfVectorizer(token_pattern=TOKEN_PATTERN)
+    texts = [" ".join(lemmas) for lemmas in [*documents, *extra_documents]]
+
+    try:
+        matrix = vectorizer.fit_transform(texts).tocsr()[:len(documents)]
+    except ValueError:
+        # Pusty słownik (brak jakichkolwiek terminów w korpusie)
+        return sparse.csr_matrix((len(documents), 0)), np.array([], dtype=object)
+
+    matrix.sort_indices()
+
+    return matrix, vectorizer.get_feature_names_out()
+
+
+def build_id_matrix(
+    documents: Sequence[np.ndarray],
+    extra_documents: Sequence[np.ndarray] = (),
+    vocabulary: Vocabulary | None = None
+) -> tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Buduje macierz TF-IDF dla korpusu z identyfikatorów lematów.
+
+    Wynik jest taki sam jak build_document_matrix na zdekodowanych
+    lematach: kolumny w kolejności alfabetycznej terminów, IDF i normy
+    jak w TfidfVectorizer. Gdy któryś lemat nie jest pojedynczym
+    terminem TOKEN_PATTERN (np. zawiera myślnik), macierz budowana jest
+    przez build_document_matrix.
+
+    Args:
+        documents: Dokumenty jako tablice identyfikatorów lematów (wiersze wyniku)
+        extra_documents: Dokumenty uwzględniane tylko w IDF
+        vocabulary: Słownik identyfikatorów (domyślnie słownik procesu)
+
+    Returns:
+        Tuple (macierz CSR dokumenty x terminy, nazwy terminów)
+    """
+    vocabulary = vocabulary if vocabulary is not None else get_vocabulary()
+    all_documents = [*documents, *extra_documents]
+
+    ids = np.concatenate(all_documents) if all_documents else np.zeros(0, dtype=np.int64)
+    used, first_position, term_index = np.unique(ids, return_index=True, return_inverse=True)
+    terms = vocabulary.decode(used)
+
+    if not all(SINGLE_TERM.fullmatch(term) for term in terms):
+        return build_document_matrix(
+            [vocabulary.decode(lemma_ids) for lemma_ids in documents],
+            [vocabulary.decode(lemma_ids) for lemma_ids in extra_documents]
+        )
+
+    if used.size == 0:
+        return sparse.csr_matrix((len(documents), 0)), np.array([], dtype=object)
+
+    n_terms = used.size
+
+    # Kolumna terminu = jego pozycja w kolejności alfabetycznej
+    term_order = np.argsort(np.array(terms, dtype=object), kind="stable")
+    term_column = np.empty(n_terms, dtype=np.int64)
+    term_column[term_order] = np.arange(n_terms)
+
+    # Terminy w wierszu w kolejności pierwszego wystąpienia w korpusie,
+    # jak w CountVectorizer - ta sama kolejność sumowania przy
+    # normalizacji daje identyczne wartości
+    occurrence_order = np.argsort(first_position, kind="stable")
+    occurrence_rank = np.empty(n_terms, dtype=np.int64)
+    occurrence_rank[occurrence_order] = np.arange(n_terms)
+
+    # Częstości terminów: unikalne komórki (wiersz, termin) i ich liczności
+    rows = np.repeat(np.arange(len(all_documents)), [len(lemma_ids) for lemma_ids in all_documents])
+    cells, counts = np.unique(rows * n_terms + occurrence_rank[term_index], return_counts=True)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(cells // n_terms, minlength=len(all_documents)))])
+    counts = sparse.csr_matrix(
+        (counts.astype(np.float64), term_column[occurrence_order[cells % n_terms]], indptr),
+        shape=(len(all_documents), n_terms)
+    )
+
+    matrix = TfidfTransformer().fit_transform(counts).tocsr()[:len(documents)]
+    matrix.sort_indices()
+
+    return matrix, np.array(terms, dtype=object)[term_order]
+
+
+def top_keyword_mask(matrix: sparse.csr_matrix, n: int) -> sparse.csr_matrix:
+    """
+    Wyznacza top-N terminów (najwyższe TF-IDF) każdego dokumentu.
+
+    Wiersze macierzy rzadkiej są dopełniane zerami do długości
+    najdłuższego wiersza, a N-ta wartość każdego wiersza wyznaczana
+    jednym argpartition. Remisy na granicy rozstrzyga kolejność terminów
+    (alfabetyczna), terminy z zerową wagą nie są wybierane.
+
+    Args:
+        matrix: Macierz CSR z posortowanymi indeksami kolumn
+        n: Liczba słów kluczowych na dokument
+
+    Returns:
+        Macierz CSR (bool) o kształcie matrix, True dla słów kluczowych
+    """
+    n_rows = matrix.shape[0]
+    row_nnz = np.diff(matrix.indptr)
+    width = int(row_nnz.max()) if n_rows else 0
+
+    if width == 0:
+        return sparse.csr_matrix(matrix.shape, dtype=bool)
+
+    # Wiersze dopełnione do wspólnej szerokości (kolejność jak w CSR)
+    filled = np.arange(width) < row_nnz[:, None]
+    scores = np.zeros((n_rows, width))
+    columns = np.zeros((n_rows, width), dtype=np.int64)
+    scores[filled] = matrix.data
+    columns[filled] = matrix.indices
+
+    k = min(n, width)
+    kth_index = np.argpartition(-scores, k - 1, axis=1)[:, k - 1]
+    kth_score = scores[np.arange(n_rows), kth_index][:, None]
+
+    above = scores > kth_score
+    tied = scores == kth_score
+    missing = k - above.sum(axis=1)
+    selected = (above | (tied & (np.cumsum(tied, axis=1) <= missing[:, None]))) & (scores > 0)
+
+    rows, positions = np.nonzero(selected)
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=bool), (rows, columns[rows, positions])),
+        shape=matrix.shape
+    )
+
+
+def keyword_overlaps(
+    mask: sparse.csr_matrix,
+    rows_a: np.ndarray,
+    rows_b: np.ndarray
+) -> np.ndarray:
+    """
+    Oblicza overlap słów kluczowych dla par wierszy.
+
+    Overlap = |A ∩ B| / ((|A| + |B|) / 2) * 100, a dla dwóch pustych
+    zbiorów 100.
+
+    Args:
+        mask: Maska słów kluczowych (top_keyword_mask)
+        rows_a: Indeksy pierwszych dokumentów par
+        rows_b: Indeksy drugich dokumentów par
+
+    Returns:
+        Tablica overlapów (procenty, zaokrąglone do 2 miejsc)
+    """
+    mask = mask.astype(np.int32)
+    sizes = np.asarray(mask.sum(axis=1)).ravel()
+
+    intersection = np.asarray(mask[rows_a].multiply(mask[rows_b]).sum(axis=1)).ravel()
+    avg_size = (sizes[rows_a] + sizes[rows_b]) / 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overlaps = np.where(avg_size > 0, intersection / avg_size * 100, 100.0)
+
+    return np.round(overlaps, 2)
@@ -6,8 +6,9 @@ Mierzy podobieństwo między wersjami artykułu na podstawie
 najważniejszych słów kluczowych (keywords) wyodrębnionych metodą TF-IDF.
 
 METODA:
-1. Dla każdej wersji oblicz TF-IDF
-2. Wyodrębnij top N słów kluczowych (najwyższe TF-IDF)
+1. Zbuduj jedną macierz TF-IDF dla wszystkich artykułów i wersji
+   (opcjonalnie wzbogaconą o artykuły źródłowe z data/source-articles)
+2. Wyodrębnij top N słów kluczowych każdego dokumentu (najwyższe TF-IDF)
 3. Oblicz overlap między zbiorami keywords różnych wersji
 
 TF-IDF (Term Frequency - Inverse Document Frequency):
@@ -15,6 +16,18 @@ TF-IDF (Term Frequency - Inverse Document Frequency):
 - IDF = log(liczba dokumentów / dokumenty zawierające słowo)
 - TF-IDF = TF × IDF
 
+Macierz budowana jest z identyfikatorów lematów dokumentów
+(vocabulary.py), bez łączenia lematów w teksty.
+
+IDF liczone jest na całym korpusie (tfidf_engine.py), więc słowa wspólne
+dla wszystkich artykułów (np. "kalisz", "kościół") ważą mniej niż terminy
+charakterystyczne dla miejsca. Metryka jest korpusowa - runner liczy ją
+raz dla wszystkich artykułów.
+
+Artykuły źródłowe włącza się zmienną środowiskową
+ANALYTICS_TFIDF_SOURCE_ARTICLES=1 (uwzględniane tylko w IDF); zmiana
+tekstów źródłowych unieważnia wtedy wyniki (source_func).
+
 INTERPRETACJA:
 - Wyższa wartość = więcej wspólnych słów kluczowych
 - Pokazuje czy wersje zachowują te same główne tematy/koncepty
@@ -24,144 +37,106 @@ ZASTOSOWANIE:
 - Analiza czy uproszczenie tekstu (child) nie traci ważnych słów kluczowych
 """
 
+import os
 from itertools import combinations
 
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
 
-from common import (
-    get_lemmas,
-    load_article,
-    process_comparison_articles_parallel,
-    save_aggregated_comparison_metric,
-    save_comparison_result,
-    VERSIONS,
-)
+from common import load_source_contents, VERSIONS
+from document import get_document
+from registry import Metric
+from runner import run_metrics
+from tfidf_engine import build_id_matrix, keyword_overlaps, top_keyword_mask
 
 # Liczba top keywords do porównania
 TOP_N_KEYWORDS = 20
 
-
-def get_top_keywords(text: str, n: int = TOP_N_KEYWORDS) -> set[str]:
-    """
-    Wyodrębnia top N słów kluczowych z tekstu metodą TF-IDF.
-    
-    Args:
-        text: Tekst do analizy
-        n: Liczba top keywords
-    
-    Returns:
-        Zbiór słów kluczowych
-    """
-    # Użyj lematów
-    lemmas = get_lemmas(text, lowercase=True)
-    
-    if len(lemmas) < 5:
-        return set(lemmas)
-    
-    # Przygotuj tekst jako string lematów
-    lemma_text = " ".join(lemmas)
-    
-    # TF-IDF (single document, więc IDF nie ma sensu, ale TF tak)
-    # Użyjemy prostszego podejścia - częstość słów
-    vectorizer = TfidfVectorizer(
-        max_features=n * 2,  # więcej na wszelki wypadek
-        token_pattern=r"(?u)\b\w+\b"
+# Czy artykuły źródłowe mają wzbogacać statystyki IDF
+INCLUDE_SOURCE_ARTICLES = os.environ.get("ANALYTICS_TFIDF_SOURCE_ARTICLES", "0") == "1"
+
+
+def _source_lemmas(article_names: list[str]) -> list[np.ndarray]:
+    """Identyfikatory lematów artykułów źródłowych (tylko gdy INCLUDE_SOURCE_ARTICLES)."""
+    if not INCLUDE_SOURCE_ARTICLES:
+        return []
+
+    return [
+        get_document(content).lemma_ids
+        for article_name in article_names
+        for content in load_source_contents(article_name)
+    ]
+
+
+def _compare(
+    contents_by_article: dict[str, dict[str, str]],
+    extra_documents: list[np.ndarray]
+) -> dict[str, dict]:
+    """Overlapy par wersji wszystkich artykułów z jednej macierzy TF-IDF."""
+    rows = {}
+    documents = []
+    for article_name, contents in contents_by_article.items():
+        for version, content in contents.items():
+            rows[(article_name, version)] = len(documents)
+            documents.append(get_document(content).lemma_ids)
+    
+    if not documents:
+        return {}
+    
+    matrix, _ = build_id_matrix(documents, extra_documents)
+    mask = top_keyword_mask(matrix, TOP_N_KEYWORDS)
+    
+    # Wszystkie pary wersji wszystkich artykułów naraz
+    pairs = [
+        (article_name, v1, v2)
+        for article_name, contents in contents_by_article.items()
+        for v1, v2 in combinations(VERSIONS, 2)
+        if v1 in contents and v2 in contents
+    ]
+    if not pairs:
+        return {article_name: {} for article_name in contents_by_article}
+    
+    overlaps = keyword_overlaps(
+        mask,
+        np.array([rows[(article_name, v1)] for article_name, v1, _ in pairs]),
+        np.array([rows[(article_name, v2)] for article_name, _, v2 in pairs])
     )
     
-    try:
-        tfidf_matrix = vectorizer.fit_transform([lemma_text])
-        feature_names = vectorizer.get_feature_names_out()
-        
-        # Pobierz scores
-        scores = tfidf_matrix.toarray()[0]
-        
-        # Sortuj i weź top N
-        word_scores = list(zip(feature_names, scores))
-        word_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        top_words = {word for word, score in word_scores[:n]}
-        return top_words
-        
-    except ValueError:
-        # Za mało słów
-        return set(lemmas)
-
-
-def calculate_keyword_overlap(keywords_a: set, keywords_b: set) -> float:
+    comparisons = {article_name: {} for article_name in contents_by_article}
+    for (article_name, v1, v2), overlap in zip(pairs, overlaps):
+        comparisons[article_name][f"{v1}__{v2}"] = float(overlap)
+    
+    return comparisons
+
+
+def compare_corpus(contents_by_article: dict[str, dict[str, str]]) -> dict[str, dict]:
     """
-    Oblicza overlap między dwoma zbiorami keywords.
+    Oblicza overlap słów kluczowych dla par wersji wszystkich artykułów
+    z jednej macierzy TF-IDF (IDF liczone na całym korpusie).
     
     Args:
-        keywords_a: Pierwszy zbiór keywords
-        keywords_b: Drugi zbiór keywords
+        contents_by_article: Słownik {artykuł: {wersja: treść}}
     
     Returns:
-        Overlap jako procent (0-100)
+        Słownik {artykuł: {"wersja1__wersja2": overlap w procentach}}
     """
-    if len(keywords_a) == 0 and len(keywords_b) == 0:
-        return 100.0
-    
-    intersection = len(keywords_a & keywords_b)
-    # Używamy średniej z dwóch zbiorów jako bazy
-    avg_size = (len(keywords_a) + len(keywords_b)) / 2
-    
-    if avg_size == 0:
-        return 0.0
-    
-    overlap = (intersection / avg_size) * 100
-    return round(overlap, 2)
-
-
-def process_single_article(article_name: str) -> dict:
-    """Przetwarza pojedynczy artykuł i zwraca porównania."""
-    # Pary do porównania
-    version_pairs = list(combinations(VERSIONS, 2))
-    
-    # Wczytaj wszystkie wersje i wyodrębnij keywords
-    version_keywords = {}
-    
-    for version in VERSIONS:
-        try:
-            data = load_article(article_name, version)
-            content = data.get("content", "")
-            keywords = get_top_keywords(content, TOP_N_KEYWORDS)
-            version_keywords[version] = keywords
-        except FileNotFoundError:
-            pass  # Pominąć brakujące wersje
-    
-    # Oblicz overlap dla każdej pary
-    comparisons = {}
-    
-    for v1, v2 in version_pairs:
-        if v1 in version_keywords and v2 in version_keywords:
-            overlap = calculate_keyword_overlap(
-                version_keywords[v1], 
-                version_keywords[v2]
-            )
-            key = f"{v1}__{v2}"
-            comparisons[key] = overlap
-    
-    if comparisons:
-        save_comparison_result(
-            metric_name="tfidf_overlap",
-            article_name=article_name,
-            comparisons=comparisons,
-            extra_data={"top_n_keywords": TOP_N_KEYWORDS}
-        )
-    
-    return comparisons
+    return _compare(contents_by_article, _source_lemmas(list(contents_by_article)))
+
+
+METRIC = Metric(
+    name="tfidf_overlap",
+    corpus_func=compare_corpus,
+    source_func=load_source_contents if INCLUDE_SOURCE_ARTICLES else None,
+    comparison_extra={
+        "top_n_keywords": TOP_N_KEYWORDS,
+        "source_articles": INCLUDE_SOURCE_ARTICLES,
+    },
+    requires=frozenset({"lemmas"}),
+)
 
 
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_comparison_articles_parallel(
-        metric_name="tfidf_overlap",
-        process_article_func=process_single_article
-    )
-    
-    # Zapisz agregowany JSON
-    if aggregated:
-        save_aggregated_comparison_metric("tfidf_overlap", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -28,31 +28,33 @@ WARIANTY:
 ZASTOSOWANIE:
 - Ocena bogactwa słownictwa generowanych tekstów
 - Porównanie różnorodności leksykalnej między wersjami (uwaga na długość!)
+
+Unikalne słowa liczone są na identyfikatorach słownika (vocabulary.py)
+przez sortowanie tablicy, bez budowania zbiorów napisów.
 """
 
-from common import (
-    get_tokens,
-    get_lemmas,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+import numpy as np
 
+from document import get_document
+from registry import Metric
+from runner import run_metrics
+from vocabulary import count_unique
 
-def calculate_ttr(tokens: list[str]) -> float:
+
+def calculate_ttr(ids: np.ndarray) -> float:
     """
     Oblicza Type-Token Ratio.
     
     Args:
-        tokens: Lista tokenów (słów)
+        ids: Identyfikatory tokenów (słów) w słowniku
     
     Returns:
         TTR jako wartość 0-1
     """
-    if len(tokens) == 0:
+    if len(ids) == 0:
         return 0.0
     
-    unique_tokens = set(tokens)
-    ttr = len(unique_tokens) / len(tokens)
+    ttr = count_unique(ids) / len(ids)
     
     return round(ttr, 4)
 
@@ -67,16 +69,17 @@ def calculate_ttr_from_text_full(text: str) -> dict:
     Returns:
         Słownik z TTR na tokenach i lematach
     """
-    tokens = get_tokens(text, lowercase=True)
-    lemmas = get_lemmas(text, lowercase=True)
+    doc = get_document(text)
+    token_ids = doc.token_ids
+    lemma_ids = doc.lemma_ids
     
     return {
-        "ttr_tokens": calculate_ttr(tokens),
-        "ttr_lemmas": calculate_ttr(lemmas),
-        "unique_tokens": len(set(tokens)),
-        "total_tokens": len(tokens),
-        "unique_lemmas": len(set(lemmas)),
-        "total_lemmas": len(lemmas)
+        "ttr_tokens": calculate_ttr(token_ids),
+        "ttr_lemmas": calculate_ttr(lemma_ids),
+        "unique_tokens": count_unique(token_ids),
+        "total_tokens": len(token_ids),
+        "unique_lemmas": count_unique(lemma_ids),
+        "total_lemmas": len(lemma_ids)
     }
 
 
@@ -107,16 +110,17 @@ def format_ttr_output(value: dict) -> str:
     return str(value)
 
 
+METRIC = Metric(
+    name="ttr",
+    calculate_func=calculate_ttr_from_text,
+    extra_data_func=get_extra_data_ttr,
+    requires=frozenset({"tokens", "lemmas"}),
+)
+
+
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="ttr",
-        calculate_func=calculate_ttr_from_text,
-        extra_data_func=get_extra_data_ttr
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("ttr", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -0,0 +1,194 @@
+"""
+vocabulary.py - Wspólny słownik procesu i tablicowa reprezentacja dokumentów
+
+Ten moduł zawiera:
+- Klasę Vocabulary - słownik napis <-> identyfikator int32, wspólny dla
+  wszystkich dokumentów procesu (get_vocabulary)
+- Klasę CompactDocument - widoki dokumentu jako tablice NumPy
+  (identyfikatory słów, lematów i POS, granice zdań, sylaby)
+- Funkcje liczące miary na identyfikatorach (sortowanie tablic)
+  zamiast zbiorów napisów
+
+ParsedDocument przechowuje widoki tokenowe jako identyfikatory; listy
+napisów (tokens, lemmas, ...) są z nich dekodowane, a ich elementy to
+napisy ze słownika - każde słowo jest w pamięci raz, a nie raz na
+wystąpienie. Identyfikatory są zgodne między dokumentami tego samego
+procesu (TTR, Jaccard, TF-IDF), ale nie między procesami - słownik
+bloku wspólnej pamięci (shared_tokens.py) jest mapowany na słownik
+procesu roboczego.
+
+Użycie:
+    vocabulary = get_vocabulary()
+    ids = vocabulary.encode(["ala", "ma", "kota", "ala"])   # [0, 1, 2, 0]
+    vocabulary.decode(ids)                                  # ["ala", "ma", "kota", "ala"]
+    count_unique(ids)                                       # 3
+"""
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from common import count_syllables_batch
+
+# Typ identyfikatorów słów
+ID_DTYPE = np.dtype(np.int32)
+
+
+class Vocabulary:
+    """
+    Słownik napis <-> identyfikator (kolejne liczby od 0).
+
+    Nowe napisy dostają kolejne identyfikatory przy kodowaniu; słownik
+    tylko rośnie, więc raz nadane identyfikatory się nie zmieniają.
+    """
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+        self._syllables = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def strings(self) -> list[str]:
+        """Napisy słownika w kolejności identyfikatorów."""
+        return self._strings
+
+    def encode(self, strings: Iterable[str], count: int = -1) -> np.ndarray:
+        """
+        Zamienia napisy na identyfikatory (nowe napisy dopisuje do słownika).
+
+        Args:
+            strings: Napisy do zakodowania
+            count: Liczba napisów (przyspiesza alokację; -1 = nieznana)
+
+        Returns:
+            Tablica int32 identyfikatorów
+        """
+        ids = self._ids
+        append = self._strings.append
+
+        def _lookup(string: str) -> int:
+            index = ids.get(string)
+            if index is None:
+                index = ids[string] = len(ids)
+                append(string)
+            return index
+
+        return np.fromiter(map(_lookup, strings), dtype=ID_DTYPE, count=count)
+
+    def decode(self, ids: np.ndarray) -> list[str]:
+        """Zamienia identyfikatory na napisy (obiekty ze słownika, bez kopii)."""
+        strings = self._strings
+        return [strings[index] for index in ids.tolist()]
+
+    def syllables(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Liczba sylab słów o podanych identyfikatorach (count_syllables_batch).
+
+        Sylaby liczone są raz na słowo słownika - dla nowych słów przy
+        pierwszym zapytaniu.
+        """
+        if len(self._syllables) < len(self._strings):
+            new_words = self._strings[len(self._syllables):]
+            self._syllables = np.concatenate([self._syllables, count_syllables_batch(new_words)])
+        return self._syllables[ids]
+
+
+# Słownik procesu (wspólny dla wszystkich dokumentów)
+_vocabulary = Vocabulary()
+
+
+def get_vocabulary() -> Vocabulary:
+    """Zwraca wspólny słownik procesu."""
+    return _vocabulary
+
+
+def reset_vocabulary() -> Vocabulary:
+    """
+    Zastępuje słownik procesu nowym, pustym (słownik tylko rośnie, więc
+    długo działający proces - np. metrics_service.py - ogranicza go tak).
+
+    Dokumenty utworzone wcześniej zachowują swój słownik
+    (ParsedDocument.vocabulary) - identyfikatory nowych dokumentów nie
+    są z nimi porównywalne.
+
+    Returns:
+        Nowy słownik procesu
+    """
+    global _vocabulary
+    _vocabulary = Vocabulary()
+    return _vocabulary
+
+
+@dataclass
+class CompactDocument:
+    """
+    Widoki tokenowe dokumentu jako tablice NumPy (wyrównane jak w
+    ParsedDocument - i-ty element opisuje i-te słowo).
+
+    Attributes:
+        token_ids: Identyfikatory słów małymi literami (int32)
+        lemma_ids: Identyfikatory lematów (int32)
+        pos_ids: Identyfikatory części mowy (int32)
+        sentence_offsets: Indeks pierwszego słowa każdego zdania
+            i liczba słów na końcu (int32, zdania + 1)
+        syllables: Liczba sylab słów (int32)
+    """
+    token_ids: np.ndarray
+    lemma_ids: np.ndarray
+    pos_ids: np.ndarray
+    sentence_offsets: np.ndarray
+    syllables: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        """Rozmiar tablic w bajtach."""
+        return sum(array.nbytes for array in vars(self).values())
+
+
+def unique_counts(ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Różne identyfikatory (posortowane) i liczby ich wystąpień.
+
+    Odpowiednik np.unique(ids, return_counts=True) - sortowanie i granice
+    serii mają mniejszy narzut dla krótkich tablic dokumentów.
+    """
+    ordered = np.sort(ids)
+    if len(ordered) == 0:
+        return ordered, np.zeros(0, dtype=np.int64)
+
+    starts = np.flatnonzero(np.concatenate([[True], ordered[1:] != ordered[:-1]]))
+    return ordered[starts], np.diff(np.append(starts, len(ordered)))
+
+
+def count_unique(ids: np.ndarray) -> int:
+    """Liczba różnych identyfikatorów."""
+    if len(ids) == 0:
+        return 0
+    ordered = np.sort(ids)
+    return 1 + int(np.count_nonzero(ordered[1:] != ordered[:-1]))
+
+
+def jaccard_ids(ids_a: np.ndarray, ids_b: np.ndarray) -> float:
+    """
+    Indeks Jaccarda zbiorów identyfikatorów (1.0 dla dwóch pustych).
+
+    Różne identyfikatory obu dokumentów są łączone i sortowane - część
+    wspólna to liczba sąsiednich równych par.
+
+    Args:
+        ids_a: Identyfikatory pierwszego dokumentu (mogą się powtarzać)
+        ids_b: Identyfikatory drugiego dokumentu
+
+    Returns:
+        |A ∩ B| / |A ∪ B| (bez zaokrąglenia)
+    """
+    merged = np.sort(np.concatenate([unique_counts(ids_a)[0], unique_counts(ids_b)[0]]))
+    if len(merged) == 0:
+        return 1.0
+
+    intersection = int(np.count_nonzero(merged[1:] == merged[:-1]))
+    return intersection / (len(merged) - intersection)
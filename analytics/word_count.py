@@ -15,11 +15,9 @@ ZASTOSOWANIE:
 - Analiza czy generator przestrzega limitów długości
 """
 
-from common import (
-    get_tokens,
-    process_articles_parallel,
-    save_aggregated_metric,
-)
+from document import get_document
+from registry import Metric
+from runner import run_metrics
 
 
 def calculate_word_count(text: str) -> int:
@@ -32,19 +30,19 @@ def calculate_word_count(text: str) -> int:
     Returns:
         Liczba słów (tokenów alfabetycznych)
     """
-    tokens = get_tokens(text)
-    return len(tokens)
+    return len(get_document(text).tokens)
+
+
+METRIC = Metric(
+    name="word_count",
+    calculate_func=calculate_word_count,
+    requires=frozenset({"tokens"}),
+)
 
 
 def process_all_articles():
-    """Przetwarza wszystkie artykuły i zapisuje wyniki."""
-    aggregated = process_articles_parallel(
-        metric_name="word_count",
-        calculate_func=calculate_word_count
-    )
-    
-    # Zapisz agregowany JSON
-    save_aggregated_metric("word_count", aggregated)
+    """Przetwarza wszystkie artykuły i zapisuje wyniki (przyrostowo, przez runner)."""
+    run_metrics([METRIC.name])
     
     print("\nZakończono!")
 
@@ -0,0 +1,48 @@
+import { NextResponse } from "next/server";
+
+// Local analytics service (analytics/metrics_service.py)
+const SERVICE_URL = process.env.ANALYTICS_SERVICE_URL ?? "http://127.0.0.1:8765";
+
+export const dynamic = "force-dynamic";
+
+function unavailable(error: unknown) {
+  console.error("Metrics service unavailable:", error);
+  return NextResponse.json(
+    { error: "Metrics service unavailable (npm run analytics:service)" },
+    { status: 503 }
+  );
+}
+
+export async function GET() {
+  try {
+    const res = await fetch(`${SERVICE_URL}/metrics`, { cache: "no-store" });
+    return NextResponse.json(await res.json(), { status: res.status });
+  } catch (error) {
+    return unavailable(error);
+  }
+}
+
+export async function POST(request: Request) {
+  const { searchParams } = new URL(request.url);
+  const stream = searchParams.get("stream") === "1";
+
+  try {
+    const upstream = await fetch(`${SERVICE_URL}/metrics${stream ? "?stream=1" : ""}`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: await request.text(),
+      cache: "no-store",
+    });
+
+    // Pass the body through so streamed (NDJSON) results reach the client as they arrive
+    return new Response(upstream.body, {
+      status: upstream.status,
+      headers: {
+        "Content-Type": upstream.headers.get("Content-Type") ?? "application/json",
+        "Cache-Control": "no-store",
+      },
+    });
+  } catch (error) {
+    return unavailable(error);
+  }
+}
@@ -1,4 +1,4 @@
-import { Place, Article } from "./types";
+import { Place, Article, MetricsResponse } from "./types";
 
 export async function getPlaces(): Promise<Place[]> {
   const res = await fetch("/api/places", { cache: "no-store" });
@@ -33,3 +33,16 @@ export async function getAllArticlesForPlace(
   return { adult_full, adult_short, child_short };
 }
 
+export async function computeMetrics(
+  text: string,
+  metrics?: string[]
+): Promise<MetricsResponse | null> {
+  const res = await fetch("/api/metrics", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ text, metrics }),
+    cache: "no-store",
+  });
+  if (!res.ok) return null;
+  return res.json();
+}
@@ -48,3 +48,15 @@ export interface CompareRating {
 
 
 
+export interface MetricResult {
+  value: unknown;
+  extra: Record<string, unknown> | null;
+  cached: boolean;
+}
+
+export interface MetricsResponse {
+  hash: string;
+  results: Record<string, MetricResult>;
+  errors: Record<string, string>;
+  timings_ms: { total: number };
+}